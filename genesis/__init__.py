@@ -5,15 +5,39 @@ Code Genesis - Adaptive Synthesis Engine for Context-Aware Code Generation
 __version__ = "1.0.0"
 __author__ = "Mehmet T. AKALIN"
 
-from genesis.engine import CodeGenesisEngine
-from genesis.cli import main
-from genesis.analysis import CodeAnalyzer
-from genesis.search import CodeSearcher
-from genesis.refactor import RefactoringTool
-from genesis.documentation import DocumentationGenerator
-from genesis.security import SecurityScanner
-from genesis.batch import BatchProcessor, InteractiveMode
-from genesis.git_tools import GitIntegration, CodeReviewGenerator
+# Public names are imported on first access (PEP 562) so that importing the
+# package, or running the CLI, doesn't load every heavy submodule up front.
+_LAZY_ATTRS = {
+    "CodeGenesisEngine": "genesis.engine",
+    "main": "genesis.cli",
+    "CodeAnalyzer": "genesis.analysis",
+    "CodeSearcher": "genesis.search",
+    "RefactoringTool": "genesis.refactor",
+    "DocumentationGenerator": "genesis.documentation",
+    "SecurityScanner": "genesis.security",
+    "BatchProcessor": "genesis.batch",
+    "InteractiveMode": "genesis.batch",
+    "GitIntegration": "genesis.git_tools",
+    "CodeReviewGenerator": "genesis.git_tools",
+}
+
+
+def __getattr__(name):
+    """Import a public name from its submodule on first access."""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include lazily imported names in dir()."""
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 __all__ = [
     "CodeGenesisEngine",
@@ -1,132 +1,437 @@
 """Code analysis tools for complexity, metrics, and dependency analysis."""
 
 import ast
+import hashlib
+import heapq
+import io
+import os
+import re
+import tokenize
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, List, Set, Tuple
-from collections import defaultdict, Counter
+from sys import intern
+from typing import Dict, Any, FrozenSet, List, Optional, Set, Tuple, Iterator
+from collections import OrderedDict
 import json
 
 
+# Number of parsed files each CodeAnalyzer keeps in memory.
+_PARSE_CACHE_SIZE = 256
+
+# Column-0 ``import x`` / ``from x import y`` statements, and every ``import``
+# keyword; see _scan_imports for when the regex result is trusted.
+_IMPORT_LINE_RE = re.compile(
+    rb"^(?:from[ \t]+(\.*[\w.]*)[ \t]+import\b|import[ \t]+([^\n#;]*))", re.M
+)
+_IMPORT_WORD_RE = re.compile(rb"\bimport\b")
+
+# Tokens that never make a line count as code.
+_NON_CODE_TOKENS = frozenset({
+    tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.ENCODING,
+    tokenize.ENDMARKER, tokenize.INDENT, tokenize.DEDENT,
+})
+
+# AST node types that add a decision point to cyclomatic complexity.
+# Boolean operators are counted separately: ``a and b and c`` is a single
+# ``ast.BoolOp`` that contributes one decision per extra operand.
+# Concrete AST node classes are never subclassed, so these are matched with
+# ``type(node) in ...`` (a set lookup) rather than ``isinstance``.
+_DECISION_NODES = frozenset({
+    ast.If, ast.While, ast.For, ast.AsyncFor,
+    ast.ExceptHandler, ast.With, ast.AsyncWith,
+})
+
+# Node kinds that are, or hold, statements; see _iter_statements.
+_STATEMENT_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+# AST node types that open a new nesting level.
+_NESTING_NODES = frozenset({
+    ast.If, ast.For, ast.While, ast.With, ast.Try, ast.FunctionDef, ast.ClassDef,
+})
+
+
+def _analyze_file(
+    file_path: Path, known: FrozenSet[bytes] = frozenset()
+) -> Tuple[Optional[bytes], Optional[Dict[str, Any]]]:
+    """Analyze a single file; module-level so worker processes can run it.
+    
+    Returns the file's content key with its analysis, or with None when the
+    key is in known and the caller already holds the result.
+    """
+    return CodeAnalyzer()._analyze_keyed(file_path, known)
+
+
+def _file_imports(file_path: Path) -> Optional[Set[str]]:
+    """Collect a file's imports; module-level so worker processes can run it."""
+    return CodeAnalyzer().file_imports(file_path)
+
+
+def _content_key(content: bytes) -> bytes:
+    """Return a short hash identifying a file's content."""
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+def _scan_imports(content: bytes) -> Optional[Set[str]]:
+    """Extract imports with a regex, or return None if the source needs a real parse.
+    
+    The scan is only trusted when every ``import`` keyword sits in a
+    column-0 import statement and there are no triple-quoted strings
+    that could hide one; anything else falls back to the AST.
+    """
+    if b'"""' in content or b"'''" in content:
+        return None
+    
+    matches = _IMPORT_LINE_RE.findall(content)
+    if len(matches) != len(_IMPORT_WORD_RE.findall(content)):
+        return None
+    
+    deps = set()
+    for from_module, names in matches:
+        if from_module:
+            module = from_module.lstrip(b".").split(b".", 1)[0]
+            if module:
+                deps.add(intern(module.decode("utf-8", "replace")))
+            continue
+        if names.rstrip().endswith(b"\\") or b"(" in names:
+            return None
+        for name in names.split(b","):
+            parts = name.split()
+            if parts:
+                deps.add(intern(parts[0].split(b".", 1)[0].decode("utf-8", "replace")))
+    
+    return deps
+
+
+def _iter_statements(tree: ast.AST) -> Iterator[ast.AST]:
+    """Yield every statement in a tree without descending into expressions.
+    
+    Imports are statements, so finding them only needs the statement bodies
+    of modules, classes, functions and compound statements.
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _STATEMENT_CONTAINERS):
+                stack.append(child)
+                yield child
+
+
+def _group_by_directory(files: List[Path]) -> List[Path]:
+    """Order files so that siblings are processed together."""
+    return sorted(files, key=lambda f: str(f.parent))
+
+
+class AnalysisCache:
+    """Persistent per-file analysis results keyed on path, mtime and size."""
+
+    def __init__(self, cache_file: Path):
+        """Initialize cache, loading any existing entries from disk."""
+        self.cache_file = Path(cache_file)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load cache entries from disk."""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except Exception:
+                self._entries = {}
+
+    def save(self) -> None:
+        """Write cache entries to disk if anything changed."""
+        if not self._dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        self._dirty = False
+
+    @staticmethod
+    def signature(file_path: Path) -> Optional[Tuple[int, int]]:
+        """Return the (mtime_ns, size) signature of a file, or None if it can't be stat'ed."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, file_path: Path, signature: Optional[Tuple[int, int]]) -> Optional[Dict[str, Any]]:
+        """Return the cached analysis if the file is unchanged."""
+        if signature is None:
+            return None
+        entry = self._entries.get(str(file_path))
+        if entry and (entry["mtime_ns"], entry["size"]) == signature:
+            return entry["analysis"]
+        return None
+
+    def put(self, file_path: Path, signature: Optional[Tuple[int, int]], analysis: Dict[str, Any]) -> None:
+        """Store an analysis for a file."""
+        if signature is None:
+            return
+        self._entries[str(file_path)] = {
+            "mtime_ns": signature[0],
+            "size": signature[1],
+            "analysis": analysis,
+        }
+        self._dirty = True
+
+
 class CodeAnalyzer:
     """Analyzes code complexity, metrics, and dependencies."""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[AnalysisCache] = None):
         """Initialize code analyzer."""
-        self.complexity_cache: Dict[str, int] = {}
+        # Analyses keyed by a hash of the file's content, so identical files
+        # (vendored copies, generated code) are only measured once.
+        self.complexity_cache: Dict[bytes, Dict[str, Any]] = {}
+        self.cache = cache
+        self._parse_cache: "OrderedDict[str, Tuple[int, bytes, ast.AST]]" = OrderedDict()
+
+    def _parse(self, file_path: Path, content: Optional[bytes] = None) -> Tuple[bytes, ast.AST]:
+        """Read and parse a file, reusing the tree while the file is unchanged."""
+        key = str(file_path)
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        
+        cached = self._parse_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            self._parse_cache.move_to_end(key)
+            return cached[1], cached[2]
+        
+        # ast.parse decodes bytes itself (honouring coding cookies), which
+        # saves a Python-level decode and a copy of every source file.
+        if content is None:
+            content = Path(file_path).read_bytes()
+        tree = ast.parse(content, filename=str(file_path))
+        self._parse_cache[key] = (mtime_ns, content, tree)
+        if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+        
+        return content, tree
+
+    def invalidate(self, file_path: Optional[Path] = None) -> None:
+        """Drop the parsed tree for a file, or for every file if none is given."""
+        if file_path is None:
+            self._parse_cache.clear()
+        else:
+            self._parse_cache.pop(str(file_path), None)
 
     def analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze a single Python file."""
+        if self.cache is None:
+            return self._analyze_uncached(file_path)
+        
+        signature = self.cache.signature(file_path)
+        analysis = self.cache.get(file_path, signature)
+        if analysis is None:
+            analysis = self._analyze_uncached(file_path)
+            if "error" not in analysis:
+                self.cache.put(file_path, signature, analysis)
+        return analysis
+
+    def _analyze_uncached(self, file_path: Path) -> Dict[str, Any]:
+        """Read, parse and measure a single Python file."""
+        return self._analyze_keyed(file_path)[1]
+
+    def _analyze_keyed(
+        self, file_path: Path, known: FrozenSet[bytes] = frozenset()
+    ) -> Tuple[Optional[bytes], Optional[Dict[str, Any]]]:
+        """Analyze a file and return its content key alongside the analysis; see _analyze_file."""
+        key = None
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = Path(file_path).read_bytes()
+            key = _content_key(content)
+            if key in known:
+                return key, None
+            known_analysis = self.complexity_cache.get(key)
+            if known_analysis is not None:
+                return key, dict(known_analysis, file_path=str(file_path))
             
-            tree = ast.parse(content)
+            content, tree = self._parse(file_path, content)
+            collected = self._collect_all(tree)
+            func_nodes = collected["func_nodes"]
             
-            return {
+            analysis = {
                 "file_path": str(file_path),
-                "lines_of_code": len(content.split("\n")),
+                "lines_of_code": content.count(b"\n") + 1,
                 "lines_of_code_excluding_comments": self._count_code_lines(content),
-                "cyclomatic_complexity": self._calculate_cyclomatic_complexity(tree),
-                "function_count": len([n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]),
-                "class_count": len([n for n in ast.walk(tree) if isinstance(n, ast.ClassDef)]),
-                "import_count": len([n for n in ast.walk(tree) if isinstance(n, (ast.Import, ast.ImportFrom))]),
-                "average_function_length": self._average_function_length(tree),
-                "max_nesting_depth": self._max_nesting_depth(tree),
-                "dependencies": self._extract_dependencies(tree),
+                "cyclomatic_complexity": collected["complexity"],
+                "function_count": len(func_nodes),
+                "class_count": collected["class_count"],
+                "import_count": collected["import_count"],
+                "average_function_length": self._average_function_length(func_nodes),
+                "max_nesting_depth": collected["max_depth"],
+                "dependencies": sorted(collected["deps"]),
             }
+            self.complexity_cache[key] = analysis
+            return key, dict(analysis)
         except Exception as e:
-            return {
+            return key, {
                 "file_path": str(file_path),
                 "error": str(e),
             }
 
     def analyze_repository(self, repo_path: Path, ignore_patterns: List[str] = None) -> Dict[str, Any]:
         """Analyze entire repository."""
-        from genesis.utils import is_python_file, should_ignore_file
+        from genesis.utils import iter_python_files, parallel_map
         
         if ignore_patterns is None:
             ignore_patterns = []
         
-        python_files = [f for f in repo_path.rglob("*.py") 
-                       if is_python_file(f) and not should_ignore_file(f, ignore_patterns)]
+        python_files = _group_by_directory(list(iter_python_files(repo_path, ignore_patterns)))
+        
+        # Serve unchanged files from the cache; only the rest go to workers.
+        analyses: Dict[Path, Dict[str, Any]] = {}
+        signatures: Dict[Path, Optional[Tuple[int, int]]] = {}
+        misses = []
+        for file_path in python_files:
+            if self.cache is not None:
+                signatures[file_path] = self.cache.signature(file_path)
+                cached = self.cache.get(file_path, signatures[file_path])
+                if cached is not None:
+                    analyses[file_path] = cached
+                    continue
+            misses.append(file_path)
+        
+        # Workers hash the content they read and return the key with the
+        # analysis; content this analyzer has already measured is copied.
+        analyze = partial(_analyze_file, known=frozenset(self.complexity_cache))
+        for file_path, (key, analysis) in zip(misses, parallel_map(analyze, misses)):
+            if analysis is None:
+                analysis = dict(self.complexity_cache[key], file_path=str(file_path))
+            elif key is not None and "error" not in analysis:
+                self.complexity_cache.setdefault(key, analysis)
+            analyses[file_path] = analysis
+            if self.cache is not None and "error" not in analysis:
+                self.cache.put(file_path, signatures[file_path], analysis)
+        
+        if self.cache is not None:
+            self.cache.save()
+        
+        file_analyses = [
+            analyses[file_path] for file_path in python_files
+            if "error" not in analyses[file_path]
+        ]
         
-        file_analyses = []
-        total_loc = 0
-        total_complexity = 0
+        # Pull the aggregated metrics into flat columns once, so totals and the
+        # top-10 selection run over plain lists instead of re-reading dicts.
+        loc = [analysis.get("lines_of_code", 0) for analysis in file_analyses]
+        complexity = [analysis.get("cyclomatic_complexity", 0) for analysis in file_analyses]
         all_dependencies = set()
+        for analysis in file_analyses:
+            all_dependencies.update(analysis.get("dependencies", []))
         
-        for file_path in python_files:
-            analysis = self.analyze_file(file_path)
-            if "error" not in analysis:
-                file_analyses.append(analysis)
-                total_loc += analysis.get("lines_of_code", 0)
-                total_complexity += analysis.get("cyclomatic_complexity", 0)
-                all_dependencies.update(analysis.get("dependencies", []))
+        total_complexity = sum(complexity)
+        top = heapq.nlargest(10, range(len(complexity)), key=complexity.__getitem__)
         
         return {
             "total_files": len(file_analyses),
-            "total_lines_of_code": total_loc,
+            "total_lines_of_code": sum(loc),
             "average_complexity": total_complexity / len(file_analyses) if file_analyses else 0,
             "total_complexity": total_complexity,
-            "dependencies": sorted(list(all_dependencies)),
+            "dependencies": sorted(all_dependencies),
             "files": file_analyses,
-            "most_complex_files": sorted(
-                file_analyses,
-                key=lambda x: x.get("cyclomatic_complexity", 0),
-                reverse=True
-            )[:10],
+            "most_complex_files": [file_analyses[i] for i in top],
         }
 
-    def _count_code_lines(self, content: str) -> int:
-        """Count lines of code excluding comments and blank lines."""
-        lines = content.split("\n")
-        code_lines = 0
-        in_multiline_string = False
-        quote_char = None
+    def _count_code_lines(self, content: bytes) -> int:
+        """Count lines of code excluding comments, blank lines and docstrings."""
+        code_lines = set()
+        statement_lines = []
+        only_strings = True
         
-        for line in lines:
-            stripped = line.strip()
-            
-            # Skip blank lines
-            if not stripped:
-                continue
-            
-            # Handle multiline strings
-            if '"""' in stripped or "'''" in stripped:
-                in_multiline_string = not in_multiline_string
-            
-            if in_multiline_string:
-                continue
-            
-            # Skip comment-only lines
-            if stripped.startswith("#"):
-                continue
-            
-            code_lines += 1
+        try:
+            for tok in tokenize.tokenize(io.BytesIO(content).readline):
+                if tok.type == tokenize.NEWLINE:
+                    # A statement made only of string literals is a docstring.
+                    if not only_strings:
+                        code_lines.update(statement_lines)
+                    statement_lines = []
+                    only_strings = True
+                elif tok.type not in _NON_CODE_TOKENS:
+                    statement_lines.append(tok.start[0])
+                    if tok.type != tokenize.STRING:
+                        only_strings = False
+        except (tokenize.TokenError, SyntaxError):
+            pass
         
-        return code_lines
+        return len(code_lines)
 
-    def _calculate_cyclomatic_complexity(self, tree: ast.AST) -> int:
-        """Calculate cyclomatic complexity of code."""
+    def _collect_all(self, tree: ast.AST) -> Dict[str, Any]:
+        """Collect per-file metrics in a single pass over the AST.
+        
+        Alongside the file totals this records each function's own
+        cyclomatic complexity: every decision point is credited to all
+        enclosing functions, matching a separate walk of each function body.
+        """
+        func_nodes = []
+        func_complexity = []
+        class_count = 0
+        import_count = 0
         complexity = 1  # Base complexity
+        deps = set()
+        max_depth = 0
+        stack = [(tree, 0, ())]
         
-        for node in ast.walk(tree):
-            # Decision points increase complexity
-            if isinstance(node, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(node, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(node, ast.With, ast.AsyncWith):
-                complexity += 1
-            elif isinstance(node, (ast.And, ast.Or)):
+        # This loop visits every node in the file, so globals and attribute
+        # lookups are bound to locals once up front.
+        pop = stack.pop
+        push = stack.append
+        iter_child_nodes = ast.iter_child_nodes
+        nesting_nodes = _NESTING_NODES
+        decision_nodes = _DECISION_NODES
+        BoolOp, FunctionDef, ClassDef = ast.BoolOp, ast.FunctionDef, ast.ClassDef
+        Import, ImportFrom = ast.Import, ast.ImportFrom
+        
+        while stack:
+            node, depth, enclosing = pop()
+            if depth > max_depth:
+                max_depth = depth
+            
+            node_type = type(node)
+            
+            if node_type in decision_nodes:
                 complexity += 1
+                for index in enclosing:
+                    func_complexity[index] += 1
+            elif node_type is BoolOp:
+                extra = len(node.values) - 1
+                complexity += extra
+                for index in enclosing:
+                    func_complexity[index] += extra
+            elif node_type is FunctionDef:
+                enclosing = enclosing + (len(func_nodes),)
+                func_nodes.append(node)
+                func_complexity.append(1)
+            elif node_type is ClassDef:
+                class_count += 1
+            elif node_type is Import:
+                import_count += 1
+                for alias in node.names:
+                    deps.add(intern(alias.name.split(".", 1)[0]))
+            elif node_type is ImportFrom:
+                import_count += 1
+                if node.module:
+                    deps.add(intern(node.module.split(".", 1)[0]))
+            
+            for child in iter_child_nodes(node):
+                push((child, depth + 1 if type(child) in nesting_nodes else depth, enclosing))
         
-        return complexity
+        return {
+            "func_nodes": func_nodes,
+            "func_complexity": func_complexity,
+            "class_count": class_count,
+            "import_count": import_count,
+            "complexity": complexity,
+            "deps": deps,
+            "max_depth": max_depth,
+        }
 
-    def _average_function_length(self, tree: ast.AST) -> float:
+    def _average_function_length(self, functions: List[ast.AST]) -> float:
         """Calculate average function length in lines."""
-        functions = [n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]
-        
         if not functions:
             return 0.0
         
@@ -136,78 +441,70 @@ class CodeAnalyzer:
             if hasattr(n, "end_lineno") and hasattr(n, "lineno")
         )
         
-        return total_lines / len(functions) if functions else 0.0
-
-    def _max_nesting_depth(self, tree: ast.AST, node: ast.AST = None, depth: int = 0) -> int:
-        """Calculate maximum nesting depth."""
-        if node is None:
-            node = tree
-        
-        max_depth = depth
-        
-        for child in ast.iter_child_nodes(node):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.With, ast.Try, ast.FunctionDef, ast.ClassDef)):
-                max_depth = max(max_depth, self._max_nesting_depth(tree, child, depth + 1))
-            else:
-                max_depth = max(max_depth, self._max_nesting_depth(tree, child, depth))
-        
-        return max_depth
-
-    def _extract_dependencies(self, tree: ast.AST) -> Set[str]:
-        """Extract all import dependencies."""
-        dependencies = set()
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    dependencies.add(alias.name.split(".")[0])
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    dependencies.add(node.module.split(".")[0])
-        
-        return dependencies
+        return total_lines / len(functions)
 
     def build_dependency_graph(self, repo_path: Path, ignore_patterns: List[str] = None) -> Dict[str, Any]:
         """Build dependency graph of the codebase."""
-        from genesis.utils import is_python_file, should_ignore_file
+        from genesis.utils import iter_python_files, parallel_map
         
         if ignore_patterns is None:
             ignore_patterns = []
         
-        python_files = [f for f in repo_path.rglob("*.py") 
-                       if is_python_file(f) and not should_ignore_file(f, ignore_patterns)]
+        python_files = _group_by_directory(list(iter_python_files(repo_path, ignore_patterns)))
         
-        graph = defaultdict(set)
-        file_modules = {}
+        # Module names are unique per file, so each file contributes its own
+        # edges and graph entry directly; no per-module sets need merging.
+        nodes = set()
+        edges = []
+        graph = {}
         
-        for file_path in python_files:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
-                module_name = self._get_module_name(file_path, repo_path)
-                file_modules[str(file_path)] = module_name
-                
-                # Extract imports
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            dep = alias.name.split(".")[0]
-                            graph[module_name].add(dep)
-                    elif isinstance(node, ast.ImportFrom):
-                        if node.module:
-                            dep = node.module.split(".")[0]
-                            graph[module_name].add(dep)
-            except Exception:
+        for file_path, deps in zip(python_files, parallel_map(_file_imports, python_files)):
+            if not deps:
                 continue
+            module_name = self._get_module_name(file_path, repo_path)
+            targets = list(deps)
+            graph[module_name] = targets
+            nodes.add(module_name)
+            nodes.update(targets)
+            edges.extend((module_name, dep) for dep in targets)
         
         return {
-            "nodes": list(set(list(graph.keys()) + [dep for deps in graph.values() for dep in deps])),
-            "edges": [(src, dst) for src, deps in graph.items() for dst in deps],
-            "graph": {k: list(v) for k, v in graph.items()},
+            "nodes": list(nodes),
+            "edges": edges,
+            "graph": graph,
         }
 
+    def file_imports(self, file_path: Path) -> Optional[Set[str]]:
+        """Return the top-level modules imported by a file, or None if it can't be parsed."""
+        try:
+            content = Path(file_path).read_bytes()
+        except OSError:
+            return None
+        
+        if b"import" not in content:
+            return set()
+        
+        deps = _scan_imports(content)
+        if deps is not None:
+            return deps
+        
+        try:
+            _, tree = self._parse(file_path)
+        except Exception:
+            return None
+        
+        deps = set()
+        for node in _iter_statements(tree):
+            node_type = type(node)
+            if node_type is ast.Import:
+                for alias in node.names:
+                    deps.add(intern(alias.name.split(".", 1)[0]))
+            elif node_type is ast.ImportFrom:
+                if node.module:
+                    deps.add(intern(node.module.split(".", 1)[0]))
+        
+        return deps
+
     def _get_module_name(self, file_path: Path, repo_path: Path) -> str:
         """Get module name from file path."""
         rel_path = file_path.relative_to(repo_path)
@@ -219,36 +516,35 @@ class CodeAnalyzer:
         smells = []
         
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
+            _, tree = self._parse(file_path)
+            collected = self._collect_all(tree)
+            functions = sorted(
+                zip(collected["func_nodes"], collected["func_complexity"]),
+                key=lambda item: (item[0].lineno, item[0].col_offset),
+            )
             
-            # Check for long functions
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    if hasattr(node, "end_lineno") and hasattr(node, "lineno"):
-                        length = (node.end_lineno or 0) - (node.lineno or 0) + 1
-                        if length > 50:
-                            smells.append({
-                                "type": "long_function",
-                                "severity": "medium",
-                                "location": f"{file_path}:{node.lineno}",
-                                "message": f"Function '{node.name}' is {length} lines long (consider breaking it down)",
-                            })
-                    
-                    # Check complexity
-                    complexity = self._calculate_cyclomatic_complexity(node)
-                    if complexity > 10:
-                        smells.append({
-                            "type": "high_complexity",
-                            "severity": "high",
-                            "location": f"{file_path}:{node.lineno}",
-                            "message": f"Function '{node.name}' has complexity {complexity} (consider refactoring)",
-                        })
+            for node, complexity in functions:
+                # Check for long functions
+                length = (node.end_lineno or 0) - (node.lineno or 0) + 1
+                if length > 50:
+                    smells.append({
+                        "type": "long_function",
+                        "severity": "medium",
+                        "location": f"{file_path}:{node.lineno}",
+                        "message": f"Function '{node.name}' is {length} lines long (consider breaking it down)",
+                    })
+                
+                # Check complexity
+                if complexity > 10:
+                    smells.append({
+                        "type": "high_complexity",
+                        "severity": "high",
+                        "location": f"{file_path}:{node.lineno}",
+                        "message": f"Function '{node.name}' has complexity {complexity} (consider refactoring)",
+                    })
             
             # Check for deep nesting
-            max_depth = self._max_nesting_depth(tree)
+            max_depth = collected["max_depth"]
             if max_depth > 4:
                 smells.append({
                     "type": "deep_nesting",
@@ -1,52 +1,91 @@
 """Batch processing and interactive mode tools."""
 
 import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 from tqdm import tqdm
 
-from genesis.engine import CodeGenesisEngine
+from genesis.engine import get_engine
 from genesis.config import Config
 
 
+# Seconds an interactive ``status`` result is reused before re-reading disk.
+_STATUS_TTL = 2.0
+
+# A ``{{name}}`` placeholder in a template file.
+_TEMPLATE_VAR_RE = re.compile(r"\{\{([^{}]*)\}\}")
+
+
+@lru_cache(maxsize=64)
+def _compile_template(template_file: str, mtime_ns: int) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Split a template into (literal, placeholder name) segments.
+    
+    Cached per file and modification time, so repeated renders of the same
+    template skip both the read and the placeholder scan.
+    """
+    with open(template_file, "r", encoding="utf-8") as f:
+        pieces = _TEMPLATE_VAR_RE.split(f.read())
+    
+    names = pieces[1::2] + [None]
+    return tuple(zip(pieces[0::2], names))
+
+
+def _iter_line_requests(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield a request for each non-blank line of a plain-text batch file."""
+    for line in lines:
+        prompt = line.strip()
+        if prompt:
+            yield {"prompt": prompt}
+
+
 class BatchProcessor:
     """Handle batch code generation from files."""
 
     def __init__(self, config: Config):
         """Initialize batch processor."""
         self.config = config
-        self.engine = CodeGenesisEngine()
+        self.engine = get_engine()
 
-    def process_batch_file(self, batch_file: Path, output_dir: Optional[Path] = None) -> Dict[str, Any]:
-        """Process a batch file with multiple generation requests."""
+    def process_batch_file(
+        self,
+        batch_file: Path,
+        output_dir: Optional[Path] = None,
+        workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Process a batch file with multiple generation requests.
+        
+        ``workers`` caps concurrent generations; it defaults to the
+        ``batch.max_inflight`` config value.
+        """
         try:
             with open(batch_file, "r", encoding="utf-8") as f:
                 if batch_file.suffix == ".json":
                     batch_data = json.load(f)
+                    requests = [r for r in batch_data.get("requests", []) if r.get("prompt", "")]
+                    total = len(requests)
                 else:
-                    # Assume one request per line
-                    batch_data = {"requests": [{"prompt": line.strip()} for line in f if line.strip()]}
-            
-            results = []
-            
-            for i, request in enumerate(tqdm(batch_data.get("requests", []), desc="Processing batch")):
-                prompt = request.get("prompt", "")
-                if not prompt:
-                    continue
+                    # Assume one request per line; stream them rather than
+                    # loading the whole file before work starts.
+                    requests = _iter_line_requests(f)
+                    total = None
                 
-                try:
-                    result = self.engine.generate(prompt, output_dir)
-                    results.append({
-                        "request": request,
-                        "status": "success",
-                        "result": result,
-                    })
-                except Exception as e:
-                    results.append({
-                        "request": request,
-                        "status": "error",
-                        "error": str(e),
-                    })
+                requests = iter(requests)
+                first = next(requests, None)
+                if first is None:
+                    results = []
+                else:
+                    results = list(tqdm(
+                        self._generate_all(chain([first], requests), output_dir, workers),
+                        total=total,
+                        desc="Processing batch",
+                    ))
             
             return {
                 "total": len(results),
@@ -57,15 +96,61 @@ class BatchProcessor:
         except Exception as e:
             return {"error": str(e)}
 
+    def _generate_all(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        output_dir: Optional[Path],
+        workers: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Run generations on a thread pool, yielding results in request order."""
+        if workers is None:
+            workers = self.config.get("batch.max_inflight", 4)
+        max_inflight = max(1, int(workers))
+        
+        # Set up the engine's shared state before the workers start, so
+        # concurrent generations don't each build it. A failure here is left
+        # for each generation to hit again and report against its request.
+        try:
+            self.engine.prepare_generation()
+        except Exception:
+            pass
+        
+        with ThreadPoolExecutor(max_workers=max_inflight) as executor:
+            pending = deque()
+            for request in requests:
+                pending.append((request, executor.submit(self.engine.generate, request["prompt"], output_dir)))
+                if len(pending) >= max_inflight:
+                    yield self._collect_result(*pending.popleft())
+            while pending:
+                yield self._collect_result(*pending.popleft())
+
+    def _collect_result(self, request: Dict[str, Any], future: Future) -> Dict[str, Any]:
+        """Wait for one generation and wrap its outcome."""
+        try:
+            return {
+                "request": request,
+                "status": "success",
+                "result": future.result(),
+            }
+        except Exception as e:
+            return {
+                "request": request,
+                "status": "error",
+                "error": str(e),
+            }
+
     def process_template(self, template_file: Path, variables: Dict[str, Any], output_dir: Optional[Path] = None) -> Dict[str, Any]:
         """Process a template file with variable substitution."""
         try:
-            with open(template_file, "r", encoding="utf-8") as f:
-                template = f.read()
+            segments = _compile_template(str(template_file), os.stat(template_file).st_mtime_ns)
             
-            # Simple variable substitution
-            for key, value in variables.items():
-                template = template.replace(f"{{{{{key}}}}}", str(value))
+            # Simple variable substitution; unknown placeholders are kept as-is
+            parts = []
+            for literal, name in segments:
+                parts.append(literal)
+                if name is not None:
+                    parts.append(str(variables[name]) if name in variables else f"{{{{{name}}}}}")
+            template = "".join(parts)
             
             # Generate code from template
             result = self.engine.generate(template, output_dir)
@@ -80,8 +165,9 @@ class InteractiveMode:
     def __init__(self, config: Config):
         """Initialize interactive mode."""
         self.config = config
-        self.engine = CodeGenesisEngine()
+        self.engine = get_engine()
         self.history: List[Dict[str, Any]] = []
+        self._status_cache: Optional[Tuple[float, Optional[Dict[str, Any]]]] = None
 
     def start(self):
         """Start interactive mode."""
@@ -149,6 +235,7 @@ class InteractiveMode:
         try:
             result = self.engine.generate(prompt)
             self.history.append({"prompt": prompt, "result": result})
+            self._status_cache = None
             
             console.print("[bold green]✓ Code generated successfully![/bold green]")
             files = result.get("generated_files", {}).get("files", [])
@@ -157,18 +244,32 @@ class InteractiveMode:
         except Exception as e:
             console.print(f"[bold red]Error:[/bold red] {e}")
 
-    def _handle_status(self, console):
-        """Handle status command."""
-        system_map = self.engine._load_system_map()
+    def _get_status(self) -> Optional[Dict[str, Any]]:
+        """Return files analyzed and vector count, cached briefly between status calls."""
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache[0] < _STATUS_TTL:
+            return self._status_cache[1]
         
+        status = None
+        system_map = self.engine._load_system_map()
         if system_map:
             fingerprint = system_map.get("fingerprint", {})
-            files_analyzed = fingerprint.get("files_analyzed", 0)
-            vector_count = self.engine.vector_db.collection.count()
-            
+            status = {
+                "files_analyzed": fingerprint.get("files_analyzed", 0),
+                "vector_count": self.engine.vector_db.collection.count(),
+            }
+        
+        self._status_cache = (now, status)
+        return status
+
+    def _handle_status(self, console):
+        """Handle status command."""
+        status = self._get_status()
+        
+        if status:
             console.print(f"[green]✓ System map loaded[/green]")
-            console.print(f"  • Files analyzed: {files_analyzed}")
-            console.print(f"  • Vector chunks: {vector_count}")
+            console.print(f"  • Files analyzed: {status['files_analyzed']}")
+            console.print(f"  • Vector chunks: {status['vector_count']}")
         else:
             console.print("[yellow]⚠ System map not found[/yellow]")
             console.print("  Run 'genesis assimilate' first")
@@ -186,5 +287,6 @@ class InteractiveMode:
     def _handle_clear(self, console):
         """Handle clear command."""
         self.engine.clear_index()
+        self._status_cache = None
         console.print("[green]✓ Index cleared[/green]")
 
@@ -1,10 +1,11 @@
 """Code formatting and validation module."""
 
 import ast
+import re
+import shutil
 import subprocess
-import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import sys
 
 try:
@@ -12,8 +13,15 @@ try:
 except ImportError:
     black = None
 
+# Distinct code strings whose syntax check each formatter remembers.
+_SYNTAX_CACHE_SIZE = 64
+
+# Leading whitespace of a line that has other content on it.
+_LEADING_WHITESPACE_RE = re.compile(r"^[^\S\n]+(?=\S)", re.MULTILINE)
+
 # Ruff is a command-line tool, not a Python module
-# We'll use subprocess to call it
+# We'll use subprocess to call it, located once at import
+_RUFF_PATH = shutil.which("ruff")
 
 
 class CodeFormatter:
@@ -22,6 +30,16 @@ class CodeFormatter:
     def __init__(self, style_fingerprint: Dict[str, Any]):
         """Initialize code formatter with style fingerprint."""
         self.style_fingerprint = style_fingerprint
+        indent_info = style_fingerprint.get("indentation", {})
+        self._use_tabs = indent_info.get("uses_tabs", False)
+        self._indent_size = indent_info.get("indent_size", 4)
+        self._black_mode = None
+        if black:
+            self._black_mode = black.Mode(
+                line_length=style_fingerprint.get("line_length", 88),  # Black default
+                target_versions={black.TargetVersion.PY311},
+            )
+        self._syntax_cache: Dict[str, Tuple[bool, Optional[str]]] = {}
 
     def format_code(self, code: str, file_path: Optional[Path] = None) -> str:
         """Format code according to style fingerprint."""
@@ -33,16 +51,7 @@ class CodeFormatter:
         # Try to use black if available
         if black:
             try:
-                indent_info = self.style_fingerprint.get("indentation", {})
-                indent_size = indent_info.get("indent_size", 4)
-                line_length = 88  # Black default
-                
-                mode = black.Mode(
-                    line_length=line_length,
-                    target_versions={black.TargetVersion.PY311},
-                )
-                
-                formatted = black.format_str(formatted, mode=mode)
+                formatted = black.format_str(formatted, mode=self._black_mode)
             except Exception as e:
                 print(f"Warning: Black formatting failed: {e}")
         
@@ -50,35 +59,34 @@ class CodeFormatter:
 
     def _apply_indentation(self, code: str) -> str:
         """Apply indentation style from fingerprint."""
-        indent_info = self.style_fingerprint.get("indentation", {})
-        indent_size = indent_info.get("indent_size", 4)
-        use_tabs = indent_info.get("uses_tabs", False)
+        if not self._use_tabs:
+            return code
         
-        if use_tabs:
-            # Convert spaces to tabs (simplified)
-            lines = code.split("\n")
-            formatted_lines = []
-            for line in lines:
-                if line.strip():
-                    leading_spaces = len(line) - len(line.lstrip())
-                    if leading_spaces > 0:
-                        tab_count = leading_spaces // indent_size
-                        formatted_lines.append("\t" * tab_count + line.lstrip())
-                    else:
-                        formatted_lines.append(line)
-                else:
-                    formatted_lines.append(line)
-            return "\n".join(formatted_lines)
-        
-        return code
+        # Convert spaces to tabs (simplified), all lines in one pass
+        indent_size = self._indent_size
+        return _LEADING_WHITESPACE_RE.sub(
+            lambda m: "\t" * (len(m.group(0)) // indent_size),
+            code,
+        )
 
     def validate_syntax(self, code: str) -> Tuple[bool, Optional[str]]:
         """Validate Python syntax."""
+        # auto_fix and lint_code check the same text repeatedly; str caches
+        # its own hash, so the lookup is cheap compared with re-parsing.
+        cached = self._syntax_cache.get(code)
+        if cached is not None:
+            return cached
+        
         try:
             ast.parse(code)
-            return True, None
+            result = (True, None)
         except SyntaxError as e:
-            return False, str(e)
+            result = (False, str(e))
+        
+        if len(self._syntax_cache) >= _SYNTAX_CACHE_SIZE:
+            self._syntax_cache.clear()
+        self._syntax_cache[code] = result
+        return result
 
     def lint_code(self, code: str, file_path: Optional[Path] = None) -> Tuple[bool, List[str]]:
         """Lint code and return errors."""
@@ -91,29 +99,22 @@ class CodeFormatter:
             return False, errors
         
         # Try ruff if available (command-line tool)
-        if file_path:
+        if file_path and _RUFF_PATH:
             try:
-                # Check if ruff is available
-                subprocess.run(["ruff", "--version"], capture_output=True, check=True)
-                
-                with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-                    f.write(code)
-                    temp_path = Path(f.name)
+                # Pipe the code in rather than writing a temporary file; the
+                # stdin filename lets ruff apply per-file settings and report it.
+                result = subprocess.run(
+                    [_RUFF_PATH, "check", "--stdin-filename", str(file_path), "-"],
+                    input=code,
+                    capture_output=True,
+                    text=True,
+                    timeout=10,
+                )
                 
-                try:
-                    result = subprocess.run(
-                        ["ruff", "check", str(temp_path)],
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
-                    )
-                    
-                    if result.returncode != 0:
-                        errors.extend(result.stdout.split("\n"))
-                finally:
-                    temp_path.unlink()
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                # Ruff not available, skip
+                if result.returncode != 0:
+                    errors.extend(result.stdout.split("\n"))
+            except FileNotFoundError:
+                # Ruff removed since startup, skip
                 pass
             except Exception as e:
                 print(f"Warning: Ruff linting failed: {e}")
@@ -152,3 +153,23 @@ class CodeFormatter:
         
         return fixed
 
+
+def format_and_fix(
+    code: str,
+    formatter: CodeFormatter,
+    auto_format: bool,
+    auto_lint: bool,
+    max_iterations: int,
+) -> Tuple[str, bool]:
+    """Format and auto-fix generated code.
+    
+    Lives in this lightweight module so worker processes started from a fresh
+    interpreter can run it without importing the generation phases.
+    """
+    if auto_format:
+        code = formatter.format_code(code)
+    
+    is_valid = True
+    if auto_lint:
+        code, is_valid = formatter.auto_fix(code, max_iterations=max_iterations)
+    return code, is_valid
@@ -0,0 +1,25 @@
+"""CLI subcommands for Code Genesis, one module per command.
+
+Modules here are imported by ``genesis.cli.LazyGroup`` only when their
+command is invoked or listed in help.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _get_console():
+    """Create the shared Rich console on first use."""
+    from rich.console import Console
+    
+    return Console()
+
+
+class _LazyConsole:
+    """Stand-in for the Rich console that defers importing Rich until output is printed."""
+
+    def __getattr__(self, name):
+        return getattr(_get_console(), name)
+
+
+console = _LazyConsole()
@@ -0,0 +1,78 @@
+"""The `genesis analyze` CLI command."""
+
+import sys
+import traceback
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.option(
+    "--repo-path",
+    "-r",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Path to repository to analyze",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Output file for analysis results (JSON)",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+@click.option(
+    "--verbose/--no-verbose",
+    default=False,
+    help="Show the full traceback when a command fails",
+)
+def analyze(repo_path: Path, output: Path, config: Path, verbose: bool):
+    """Analyze codebase complexity, metrics, and dependencies."""
+    try:
+        from rich.panel import Panel
+        from genesis.analysis import CodeAnalyzer, AnalysisCache
+        from genesis.config import Config
+        
+        config_path = str(config) if config else None
+        cfg = Config(config_path)
+        
+        if repo_path is None:
+            repo_path = cfg.get_repo_path()
+        
+        console.print(Panel.fit(
+            "[bold cyan]Code Analysis[/bold cyan]",
+            border_style="cyan"
+        ))
+        
+        cache_dir = Path(cfg.get("vector_db.persist_directory", "./.genesis_index"))
+        analyzer = CodeAnalyzer(cache=AnalysisCache(cache_dir / "analysis_cache.json"))
+        ignore_patterns = cfg.get_ignore_spec()
+        
+        console.print(f"[dim]Analyzing {repo_path}...[/dim]\n")
+        results = analyzer.analyze_repository(repo_path, ignore_patterns)
+        
+        console.print(f"[green]✓ Analysis complete[/green]")
+        console.print(f"  • Total files: {results.get('total_files', 0)}")
+        console.print(f"  • Lines of code: {results.get('total_lines_of_code', 0):,}")
+        console.print(f"  • Average complexity: {results.get('average_complexity', 0):.2f}")
+        console.print(f"  • Dependencies: {len(results.get('dependencies', []))}")
+        
+        if output:
+            from genesis.utils import write_json
+            write_json(output, results)
+            console.print(f"\n[dim]Results saved to: {output}[/dim]")
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        if verbose:
+            console.print(f"[dim]{traceback.format_exc()}[/dim]")
+        sys.exit(1)
@@ -0,0 +1,51 @@
+"""The `genesis assimilate` CLI command."""
+
+import sys
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.option(
+    "--repo-path",
+    "-r",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Path to repository to analyze (default: current directory)",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+def assimilate(repo_path: Path, config: Path):
+    """Phase 1: Assimilate repository - Build style fingerprint and architectural map."""
+    try:
+        from rich.panel import Panel
+        from genesis.engine import get_engine
+        
+        config_path = str(config) if config else None
+        engine = get_engine(config_path)
+        
+        if repo_path is None:
+            repo_path = engine.config.get_repo_path()
+        
+        console.print(Panel.fit(
+            "[bold cyan]Code Genesis - Assimilation Phase[/bold cyan]",
+            border_style="cyan"
+        ))
+        
+        system_map = engine.assimilate(repo_path)
+        
+        console.print(
+            "\n[bold green]✓ Assimilation completed successfully![/bold green]\n"
+            f"[dim]System map saved to: {engine.system_map_path}[/dim]"
+        )
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
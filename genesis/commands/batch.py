@@ -0,0 +1,54 @@
+"""The `genesis batch` CLI command."""
+
+import sys
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.argument("batch_file", type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Output directory for generated code",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Generations to run concurrently (default: batch.max_inflight from config)",
+)
+def batch(batch_file: Path, output_dir: Path, config: Path, workers: int):
+    """Process batch file with multiple generation requests."""
+    try:
+        from genesis.batch import BatchProcessor
+        from genesis.config import Config
+        
+        config_path = str(config) if config else None
+        cfg = Config(config_path)
+        
+        processor = BatchProcessor(cfg)
+        
+        console.print(f"[dim]Processing batch file: {batch_file}[/dim]\n")
+        results = processor.process_batch_file(batch_file, output_dir, workers)
+        
+        console.print(f"[green]✓ Batch processing complete[/green]")
+        console.print(f"  • Total: {results.get('total', 0)}")
+        console.print(f"  • Successful: {results.get('successful', 0)}")
+        console.print(f"  • Failed: {results.get('failed', 0)}")
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
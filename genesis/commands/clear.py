@@ -0,0 +1,32 @@
+"""The `genesis clear` CLI command."""
+
+import sys
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+def clear(config: Path):
+    """Clear the vector database index and system map."""
+    try:
+        from genesis.engine import get_engine
+        
+        config_path = str(config) if config else None
+        engine = get_engine(config_path)
+        
+        console.print("[yellow]Clearing index...[/yellow]")
+        engine.clear_index()
+        console.print("[bold green]✓ Index cleared successfully![/bold green]")
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
@@ -0,0 +1,66 @@
+"""The `genesis docs` CLI command."""
+
+import sys
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.option(
+    "--repo-path",
+    "-r",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Path to repository",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Output directory for documentation",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+@click.option(
+    "--fill-docstrings",
+    is_flag=True,
+    default=False,
+    help="Generate missing docstrings with the LLM (one batched request set)",
+)
+def docs(repo_path: Path, output_dir: Path, config: Path, fill_docstrings: bool):
+    """Generate documentation for the codebase."""
+    try:
+        from genesis.documentation import DocumentationGenerator
+        from genesis.config import Config
+        
+        config_path = str(config) if config else None
+        cfg = Config(config_path)
+        
+        if repo_path is None:
+            repo_path = cfg.get_repo_path()
+        
+        if output_dir is None:
+            output_dir = Path.cwd() / "docs"
+        
+        generator = DocumentationGenerator(cfg)
+        
+        console.print(f"[dim]Generating API documentation...[/dim]\n")
+        results = generator.generate_api_docs(repo_path, output_dir, fill_docstrings)
+        
+        console.print(
+            "[green]✓ Documentation generated[/green]\n"
+            f"  • Files documented: {results.get('files_documented', 0)}\n"
+            f"  • Output: {results.get('output_file', 'N/A')}"
+        )
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
@@ -0,0 +1,66 @@
+"""The `genesis generate` CLI command."""
+
+import sys
+import traceback
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.argument("prompt", required=True)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Output directory for generated code (default: ./generated_code)",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+@click.option(
+    "--verbose/--no-verbose",
+    default=False,
+    help="Show the full traceback when a command fails",
+)
+def generate(prompt: str, output_dir: Path, config: Path, verbose: bool):
+    """Phase 2 & 3: Generate code based on natural language prompt."""
+    try:
+        from rich.panel import Panel
+        from genesis.engine import get_engine
+        
+        config_path = str(config) if config else None
+        engine = get_engine(config_path)
+        
+        console.print(Panel.fit(
+            "[bold cyan]Code Genesis - Code Generation[/bold cyan]",
+            border_style="cyan"
+        ))
+        console.print(f"[dim]Request: {prompt}[/dim]\n")
+        
+        result = engine.generate(prompt, output_dir)
+        
+        lines = [
+            "\n[bold green]✓ Code generation completed successfully![/bold green]",
+            f"[dim]Output directory: {result['generated_files'].get('output_dir', 'N/A')}[/dim]",
+        ]
+        
+        # Show generated files
+        files = result['generated_files'].get('files', [])
+        if files:
+            lines.append("\n[bold]Generated files:[/bold]")
+            lines.extend(f"  • {file_info.get('path', 'unknown')}" for file_info in files)
+        
+        console.print("\n".join(lines))
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        if verbose:
+            console.print(f"[dim]{traceback.format_exc()}[/dim]")
+        sys.exit(1)
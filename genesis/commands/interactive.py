@@ -0,0 +1,32 @@
+"""The `genesis interactive` CLI command."""
+
+import sys
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+def interactive(config: Path):
+    """Start interactive mode."""
+    try:
+        from genesis.batch import InteractiveMode
+        from genesis.config import Config
+        
+        config_path = str(config) if config else None
+        cfg = Config(config_path)
+        
+        interactive_mode = InteractiveMode(cfg)
+        interactive_mode.start()
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
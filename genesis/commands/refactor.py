@@ -0,0 +1,55 @@
+"""The `genesis refactor` CLI command."""
+
+import sys
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.argument("file_path", type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Output file for refactored code",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+def refactor(file_path: Path, output: Path, config: Path):
+    """Suggest and apply refactorings to a file."""
+    try:
+        from genesis.refactor import RefactoringTool
+        from genesis.config import Config
+        
+        config_path = str(config) if config else None
+        cfg = Config(config_path)
+        
+        tool = RefactoringTool(cfg)
+        suggestions = tool.suggest_refactorings(file_path)
+        
+        console.print(f"[bold]Refactoring suggestions for {file_path}:[/bold]\n")
+        
+        for i, suggestion in enumerate(suggestions, 1):
+            console.print(f"{i}. [{suggestion['priority']}] {suggestion['type']}")
+            console.print(f"   {suggestion['description']}")
+            console.print(f"   Location: {suggestion['location']}\n")
+        
+        if output and suggestions:
+            # Apply first suggestion as example
+            first = suggestions[0]
+            refactored = tool.refactor_code(file_path, first["type"], first["description"])
+            with open(output, "w") as f:
+                f.write(refactored)
+            console.print(f"[green]✓ Refactored code saved to: {output}[/green]")
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
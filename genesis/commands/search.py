@@ -0,0 +1,86 @@
+"""The `genesis search` CLI command."""
+
+import sys
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.argument("query")
+@click.option(
+    "--repo-path",
+    "-r",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Path to repository",
+)
+@click.option(
+    "--type",
+    "-t",
+    type=click.Choice(["semantic", "grep", "function", "class", "import"]),
+    default="semantic",
+    help="Search type",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+def search(query: str, repo_path: Path, type: str, config: Path):
+    """Search codebase using various methods."""
+    try:
+        from rich.markup import escape
+        from rich.table import Table
+        from genesis.search import CodeSearcher
+        from genesis.config import Config
+        from genesis.vector_db import VectorDatabase
+        
+        config_path = str(config) if config else None
+        cfg = Config(config_path)
+        
+        if repo_path is None:
+            repo_path = cfg.get_repo_path()
+        
+        vector_db = VectorDatabase(cfg)
+        searcher = CodeSearcher(vector_db, cfg)
+        
+        console.print(f"[dim]Searching for: {query}[/dim]\n")
+        
+        if type == "semantic":
+            results = searcher.semantic_search(query)
+        elif type == "grep":
+            results = searcher.grep_search(query, repo_path)
+        elif type == "function":
+            results = searcher.find_function(query, repo_path)
+        elif type == "class":
+            results = searcher.find_class(query, repo_path)
+        elif type == "import":
+            results = searcher.find_imports(query, repo_path)
+        else:
+            results = []
+        
+        console.print(f"[green]✓ Found {len(results)} results[/green]\n")
+        
+        table = Table(show_header=True, header_style="bold")
+        table.add_column("#", justify="right")
+        table.add_column("Location")
+        table.add_column("Snippet")
+        for i, result in enumerate(results[:10], 1):  # Show first 10
+            if "file" in result:
+                snippet = f"{result['content'][:80]}..." if "content" in result else ""
+                # Code is full of [brackets]; keep Rich from reading them as markup
+                table.add_row(
+                    str(i),
+                    escape(f"{result.get('file', 'unknown')}:{result.get('line', '?')}"),
+                    escape(snippet),
+                )
+        if table.row_count:
+            console.print(table)
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
@@ -0,0 +1,103 @@
+"""The `genesis security-scan` CLI command."""
+
+import sys
+import traceback
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.option(
+    "--repo-path",
+    "-r",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Path to repository to scan",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Output file for scan results (JSON)",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+@click.option(
+    "--verbose/--no-verbose",
+    default=False,
+    help="Show the full traceback when a command fails",
+)
+def security_scan(repo_path: Path, output: Path, config: Path, verbose: bool):
+    """Scan codebase for security vulnerabilities."""
+    try:
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.table import Table
+        from genesis.security import SecurityScanner
+        from genesis.config import Config
+        
+        config_path = str(config) if config else None
+        cfg = Config(config_path)
+        
+        if repo_path is None:
+            repo_path = cfg.get_repo_path()
+        
+        console.print(Panel.fit(
+            "[bold cyan]Security Scan[/bold cyan]",
+            border_style="cyan"
+        ))
+        
+        scanner = SecurityScanner()
+        ignore_patterns = cfg.get_ignore_spec()
+        
+        console.print(f"[dim]Scanning {repo_path}...[/dim]\n")
+        # The per-finding list is only needed for the JSON output
+        results = scanner.scan_repository(repo_path, ignore_patterns, collect_details=output is not None)
+        
+        # Build the whole report first and print it once; each console.print
+        # re-parses markup and flushes, which adds up on large scans.
+        report = [
+            "[green]✓ Scan complete[/green]\n"
+            f"  • Files scanned: {results.get('files_scanned', 0)}\n"
+            f"  • Total vulnerabilities: {results.get('total_vulnerabilities', 0)}"
+        ]
+        
+        by_severity = results.get('by_severity', {})
+        if by_severity:
+            table = Table(title="By Severity", title_justify="left", title_style="bold")
+            table.add_column("Severity")
+            table.add_column("Count", justify="right")
+            for severity, count in by_severity.items():
+                color = "red" if severity == "high" else "yellow" if severity == "medium" else "dim"
+                table.add_row(f"[{color}]{severity}[/{color}]", f"[{color}]{count}[/{color}]")
+            report.extend(["", table])
+        
+        by_type = results.get('by_type', {})
+        if by_type:
+            table = Table(title="By Type", title_justify="left", title_style="bold")
+            table.add_column("Type")
+            table.add_column("Count", justify="right")
+            for vuln_type, count in by_type.items():
+                table.add_row(vuln_type, str(count))
+            report.extend(["", table])
+        
+        console.print(Group(*report))
+        
+        if output:
+            from genesis.utils import write_json
+            write_json(output, results)
+            console.print(f"\n[dim]Results saved to: {output}[/dim]")
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        if verbose:
+            console.print(f"[dim]{traceback.format_exc()}[/dim]")
+        sys.exit(1)
@@ -0,0 +1,67 @@
+"""The `genesis status` CLI command."""
+
+import sys
+from pathlib import Path
+import click
+
+from genesis.commands import console
+
+
+@click.command()
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to configuration file",
+)
+def status(config: Path):
+    """Show current status of Code Genesis."""
+    try:
+        from rich.console import Group
+        from rich.panel import Panel
+        from genesis.engine import get_engine
+        
+        config_path = str(config) if config else None
+        engine = get_engine(config_path)
+        
+        system_map = engine._load_system_map()
+        
+        report = [Panel.fit(
+            "[bold cyan]Code Genesis Status[/bold cyan]",
+            border_style="cyan"
+        )]
+        
+        if system_map:
+            fingerprint = system_map.get("fingerprint", {})
+            files_analyzed = fingerprint.get("files_analyzed", 0)
+            vector_count = engine.vector_db.collection.count()
+            
+            report.append(
+                f"[green]✓ System map loaded[/green]\n"
+                f"  • Files analyzed: {files_analyzed}\n"
+                f"  • Vector chunks: {vector_count}\n"
+                f"  • Repository: {system_map.get('repo_path', 'N/A')}"
+            )
+        else:
+            report.append(
+                "[yellow]⚠ System map not found[/yellow]\n"
+                "  Run 'genesis assimilate' to build the system map"
+            )
+        
+        # Check API key
+        api_key = engine.config.get_llm_api_key()
+        if api_key:
+            report.append("\n[green]✓ LLM API key configured[/green]")
+        else:
+            report.append(
+                "\n[yellow]⚠ LLM API key not found[/yellow]\n"
+                "  Set GENESIS_LLM_API_KEY environment variable"
+            )
+        
+        # One print renders the whole report in a single pass
+        console.print(Group(*report))
+        
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
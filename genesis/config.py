@@ -1,12 +1,33 @@
 """Configuration management for Code Genesis."""
 
+import copy
 import os
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+from typing import Dict, Any, Optional, Tuple
 
-load_dotenv()
+_dotenv_loaded = False
+
+
+def _load_dotenv_once() -> None:
+    """Load variables from a .env file the first time they are needed."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        
+        load_dotenv()
+        _dotenv_loaded = True
+
+
+# Marks a key that Config.get couldn't resolve, so the caller's default applies.
+_MISSING = object()
+
+# libyaml's C loader when PyYAML was built with it; same safe subset of YAML.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed YAML keyed by (resolved path, mtime_ns), shared by every Config in
+# the process so repeated construction doesn't re-read and re-parse the file.
+_CONFIG_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
 
 
 class Config:
@@ -19,15 +40,27 @@ class Config:
         
         self.config_path = Path(config_path)
         self.config: Dict[str, Any] = {}
+        self._get_cache: Dict[str, Any] = {}
+        self._ignore_spec = None
         self.load_config()
 
     def load_config(self) -> None:
         """Load configuration from YAML file."""
-        if self.config_path.exists():
-            with open(self.config_path, "r") as f:
-                self.config = yaml.safe_load(f) or {}
-        else:
+        self._get_cache = {}
+        self._ignore_spec = None
+        try:
+            key = (str(self.config_path.resolve()), self.config_path.stat().st_mtime_ns)
+        except OSError:
             self.config = self._default_config()
+            return
+        
+        # Each Config gets its own copy, so callers may mutate it freely.
+        cached = _CONFIG_CACHE.get(key)
+        if cached is None:
+            with open(self.config_path, "r") as f:
+                cached = yaml.load(f, Loader=_YAML_LOADER) or {}
+            _CONFIG_CACHE[key] = cached
+        self.config = copy.deepcopy(cached)
 
     def _default_config(self) -> Dict[str, Any]:
         """Return default configuration."""
@@ -46,30 +79,70 @@ class Config:
                 "model": "gpt-4-turbo-preview",
                 "temperature": 0.7,
                 "max_tokens": 4000,
+                "max_concurrency": 4,
+                "docstrings_per_request": 8,
+                "prompt_caching": True,
+                "semantic_cache": False,
+                "semantic_cache_distance": 0.05,
+                "context_max_tokens": 2000,
+                "context_doc_tokens": 400,
             },
             "vector_db": {
                 "persist_directory": "./.genesis_index",
                 "collection_name": "codebase_embeddings",
                 "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
+                "hnsw_m": 24,
+                "hnsw_construction_ef": 128,
+                "hnsw_search_ef": 100,
+                "backend": "torch",
+                "onnx_quantization": None,
+                "precision": "fp32",
+                "encode_batch_size": 64,
+                "max_embed_chars": 2000,
+                "add_batch_size": 256,
+                "query_batch_size": 100,
+                "search_backend": "chroma",
+            },
+            "batch": {
+                "max_inflight": 4,
             },
         }
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by dot-separated key."""
-        keys = key.split(".")
+        try:
+            value = self._get_cache[key]
+        except KeyError:
+            value = self._get_cache[key] = self._resolve(key)
+        return default if value is _MISSING else value
+
+    def _resolve(self, key: str) -> Any:
+        """Walk the config for a dot-separated key, returning _MISSING if absent."""
         value = self.config
-        for k in keys:
+        for k in key.split("."):
             if isinstance(value, dict):
                 value = value.get(k)
             else:
-                return default
+                return _MISSING
             if value is None:
-                return default
+                return _MISSING
         return value
 
+    def get_ignore_spec(self):
+        """Return repository.ignore_patterns compiled into a PathSpec, built once per load."""
+        if self._ignore_spec is None:
+            from genesis.utils import compile_ignore_spec
+            
+            self._ignore_spec = compile_ignore_spec(self.get("repository.ignore_patterns", []))
+        return self._ignore_spec
+
     def get_llm_api_key(self) -> Optional[str]:
-        """Get LLM API key from environment."""
-        return os.getenv("GENESIS_LLM_API_KEY") or os.getenv("OPENAI_API_KEY")
+        """Get LLM API key from environment, falling back to a .env file."""
+        api_key = os.getenv("GENESIS_LLM_API_KEY") or os.getenv("OPENAI_API_KEY")
+        if api_key is None:
+            _load_dotenv_once()
+            api_key = os.getenv("GENESIS_LLM_API_KEY") or os.getenv("OPENAI_API_KEY")
+        return api_key
 
     def get_repo_path(self) -> Path:
         """Get repository path."""
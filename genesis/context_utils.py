@@ -0,0 +1,68 @@
+"""Prompt context assembly for retrieved code."""
+
+import io
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+MAX_CTX_TOKENS = 2000
+MAX_PER_DOC_TOKENS = 400
+
+# Rough characters-per-token ratio used when tiktoken is not installed
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: Optional[str]):
+    """Return the tiktoken encoding for a model, or None without tiktoken."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model or "")
+    except KeyError:
+        # Non-OpenAI models: any BPE gives a usable size estimate
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> Tuple[str, int]:
+    """Cut text to at most max_tokens tokens; return (text, token count)."""
+    encoding = _encoding(model)
+    if encoding is None:
+        text = text[:max_tokens * _CHARS_PER_TOKEN]
+        return text, -(-len(text) // _CHARS_PER_TOKEN)
+    
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text, len(tokens)
+    return encoding.decode(tokens[:max_tokens]), max_tokens
+
+
+def format_context(
+    relevant_code: List[Dict[str, Any]],
+    max_tokens: int = MAX_CTX_TOKENS,
+    per_doc_tokens: int = MAX_PER_DOC_TOKENS,
+    model: Optional[str] = None,
+) -> str:
+    """Format retrieved code for a prompt, keeping the code within a token budget."""
+    out = io.StringIO()
+    remaining = max_tokens
+    
+    for i, item in enumerate(relevant_code):
+        if remaining <= 0:
+            break
+        doc = item.get("document", "")
+        metadata = item.get("metadata", {})
+        file_path = metadata.get("file_path", "unknown")
+        
+        doc, used = truncate_to_tokens(doc, min(per_doc_tokens, remaining), model)
+        remaining -= used
+        
+        if i:
+            out.write("\n")
+        out.write(f"--- File: {file_path} ---\n{doc}\n")
+    
+    return out.getvalue()
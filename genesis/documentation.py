@@ -1,12 +1,131 @@
 """Documentation generation tools."""
 
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import ast
+import inspect
+import json
 
 from genesis.llm_client import create_llm_client
 from genesis.config import Config
 from genesis.style_fingerprint import StyleFingerprint
+from genesis.utils import walk_statements
+
+
+# Prompt text is fixed; only the per-symbol fields are substituted per call.
+_FUNCTION_SYSTEM_PROMPT_TEMPLATE = (
+    "Generate a comprehensive docstring in {style} style following Google/NumPy docstring format."
+)
+_FUNCTION_PROMPT_TEMPLATE = """Generate a docstring for this function:
+
+Function: {name}
+Arguments: {args}
+Returns: {returns}
+
+Analyze the function body and create a detailed docstring."""
+
+_FILL_FUNCTION_SYSTEM_PROMPT = "Generate a concise docstring following Google docstring format."
+_FILL_FUNCTION_PROMPT_TEMPLATE = """Generate a docstring for this function:
+
+Function: {name}
+Arguments: {args}
+
+Return only the docstring text, without quotes."""
+
+_FILL_CLASS_SYSTEM_PROMPT = "Generate a concise class docstring following Google docstring format."
+_FILL_CLASS_PROMPT_TEMPLATE = """Generate a docstring for this class:
+
+Class: {name}
+Methods: {methods}
+
+Return only the docstring text, without quotes."""
+
+# Several symbols per request, answered as JSON lines keyed by item number.
+_PACKED_SYSTEM_PROMPT = (
+    "Generate a concise docstring following Google docstring format for each item. "
+    'Reply with exactly one JSON object per line, {"id": <item number>, "docstring": "<text>"}, '
+    "and nothing else."
+)
+
+
+def _parse_packed_docstrings(response: str) -> Dict[int, str]:
+    """Parse ``{"id": n, "docstring": ...}`` lines from a packed response."""
+    docstrings = {}
+    for line in response.splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            item = json.loads(line)
+            docstrings[int(item["id"])] = str(item["docstring"])
+        except (ValueError, KeyError, TypeError):
+            continue
+    return docstrings
+
+
+def _raw_docstring(node: ast.AST) -> Optional[str]:
+    """Return a node's docstring as written; cleaning is left to rendering."""
+    body = node.body
+    if body and isinstance(body[0], ast.Expr):
+        value = body[0].value
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return value.value
+    return None
+
+
+def _clean_docstring(docstring: Optional[str]) -> str:
+    """Dedent a raw docstring the way ast.get_docstring does; "" if there is none."""
+    return inspect.cleandoc(docstring) if docstring else ""
+
+
+def _extract_module_doc(file_path: Path) -> Dict[str, Any]:
+    """Parse a file and summarize its functions and classes for the API docs."""
+    # ast.parse takes bytes directly, so the source is never decoded to str
+    tree = ast.parse(Path(file_path).read_bytes(), filename=str(file_path))
+    
+    module_doc = {
+        "file": str(file_path),
+        "functions": [],
+        "classes": [],
+    }
+    
+    for node in walk_statements(tree):
+        if isinstance(node, ast.FunctionDef):
+            module_doc["functions"].append({
+                "name": node.name,
+                "args": [arg.arg for arg in node.args.args],
+                "docstring": _raw_docstring(node),
+                "line": node.lineno,
+            })
+        elif isinstance(node, ast.ClassDef):
+            methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
+            module_doc["classes"].append({
+                "name": node.name,
+                "methods": methods,
+                "docstring": _raw_docstring(node),
+                "line": node.lineno,
+            })
+    
+    return module_doc
+
+
+def _summarize_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    """Process-pool entry point: summarize one file, or None if it can't be parsed."""
+    try:
+        return _extract_module_doc(file_path)
+    except Exception:
+        return None
+
+
+def _load_previous_docs(json_file: Path) -> Dict[str, Any]:
+    """Load the per-file docs written by an earlier run, or {} if unavailable."""
+    if not json_file.exists():
+        return {}
+    try:
+        with open(json_file, "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except Exception:
+        return {}
 
 
 class DocumentationGenerator:
@@ -16,6 +135,16 @@ class DocumentationGenerator:
         """Initialize documentation generator."""
         self.config = config
         self.llm_client = create_llm_client(config)
+        
+        # Docstring style is fixed for the generator's lifetime; resolve it once,
+        # and only fingerprint the code when the config doesn't set it.
+        self._style_fp = None
+        self._docstring_style = self.config.get("style.docstring_style")
+        if not self._docstring_style:
+            self._style_fp = StyleFingerprint(self.config)
+            self._docstring_style = self._style_fp.fingerprint.get("comments", {}).get("docstring_style", "triple_double")
+        self._quote = '"""' if self._docstring_style == "triple_double" else "'''"
+        self._function_system_prompt = _FUNCTION_SYSTEM_PROMPT_TEMPLATE.format(style=self._docstring_style)
 
     def generate_docstring(self, file_path: Path, function_name: Optional[str] = None) -> str:
         """Generate docstring for a function or file."""
@@ -27,7 +156,7 @@ class DocumentationGenerator:
             
             if function_name:
                 # Find specific function
-                for node in ast.walk(tree):
+                for node in walk_statements(tree):
                     if isinstance(node, ast.FunctionDef) and node.name == function_name:
                         return self._generate_function_docstring(node, content)
             else:
@@ -39,41 +168,26 @@ class DocumentationGenerator:
 
     def _generate_function_docstring(self, node: ast.FunctionDef, content: str) -> str:
         """Generate docstring for a function."""
-        style_fp = StyleFingerprint(self.config)
-        fingerprint = style_fp.fingerprint
-        docstring_style = fingerprint.get("comments", {}).get("docstring_style", "triple_double")
-        
-        quote = '"""' if docstring_style == "triple_double" else "'''"
-        
         # Extract function signature
         args = [arg.arg for arg in node.args.args]
         returns = "Any"  # Could be enhanced with type hints
         
-        system_prompt = f"""Generate a comprehensive docstring in {docstring_style} style following Google/NumPy docstring format."""
+        user_prompt = _FUNCTION_PROMPT_TEMPLATE.format(name=node.name, args=", ".join(args), returns=returns)
         
-        user_prompt = f"""Generate a docstring for this function:
-
-Function: {node.name}
-Arguments: {', '.join(args)}
-Returns: {returns}
-
-Analyze the function body and create a detailed docstring."""
-        
-        docstring = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
+        docstring = self.llm_client.generate(user_prompt, system_prompt=self._function_system_prompt)
         
-        return f"{quote}\n{docstring}\n{quote}"
+        return f"{self._quote}\n{docstring}\n{self._quote}"
 
     def _generate_module_docstring(self, tree: ast.AST, content: str) -> str:
         """Generate module-level docstring."""
-        style_fp = StyleFingerprint(self.config)
-        fingerprint = style_fp.fingerprint
-        docstring_style = fingerprint.get("comments", {}).get("docstring_style", "triple_double")
-        
-        quote = '"""' if docstring_style == "triple_double" else "'''"
-        
         # Analyze module
-        functions = [n.name for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]
-        classes = [n.name for n in ast.walk(tree) if isinstance(n, ast.ClassDef)]
+        functions = []
+        classes = []
+        for n in walk_statements(tree):
+            if isinstance(n, ast.FunctionDef):
+                functions.append(n.name)
+            elif isinstance(n, ast.ClassDef):
+                classes.append(n.name)
         
         system_prompt = "Generate a comprehensive module docstring."
         
@@ -86,7 +200,7 @@ Create a module-level docstring describing the purpose and main components."""
         
         docstring = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
         
-        return f"{quote}\n{docstring}\n{quote}"
+        return f"{self._quote}\n{docstring}\n{self._quote}"
 
     def generate_readme(self, repo_path: Path) -> str:
         """Generate README.md for the repository."""
@@ -113,57 +227,78 @@ Create a professional README with:
         readme = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
         return readme
 
-    def generate_api_docs(self, repo_path: Path, output_dir: Path) -> Dict[str, Any]:
-        """Generate API documentation for all modules."""
-        from genesis.utils import is_python_file, should_ignore_file
+    def generate_api_docs(self, repo_path: Path, output_dir: Path, fill_docstrings: bool = False) -> Dict[str, Any]:
+        """Generate API documentation for all modules.
         
-        ignore_patterns = self.config.get("repository.ignore_patterns", [])
-        python_files = [f for f in repo_path.rglob("*.py") 
-                       if is_python_file(f) and not should_ignore_file(f, ignore_patterns)]
+        With ``fill_docstrings``, functions and classes that lack a docstring
+        get one generated by the LLM, requested together in a single batch.
+        Docstrings generated by an earlier run are kept for files that have
+        not changed since, so only new or edited files go back to the LLM.
+        """
+        from genesis.analysis import AnalysisCache
+        from genesis.utils import iter_python_files, parallel_map, write_json
         
-        api_docs = {}
+        ignore_patterns = self.config.get_ignore_spec()
+        python_files = list(iter_python_files(repo_path, ignore_patterns))
+        
+        cache_dir = Path(self.config.get("vector_db.persist_directory", "./.genesis_index"))
+        # Summaries store raw docstrings; they are cleaned when rendered
+        cache = AnalysisCache(cache_dir / "docs_raw_cache.json")
+        
+        # Unchanged files reuse their summary; the rest are parsed in parallel
+        summaries: Dict[Path, Optional[Dict[str, Any]]] = {}
+        signatures = {}
+        misses = []
+        for file_path in python_files:
+            signature = AnalysisCache.signature(file_path)
+            signatures[file_path] = signature
+            module_doc = cache.get(file_path, signature)
+            if module_doc is None:
+                misses.append(file_path)
+            else:
+                summaries[file_path] = module_doc
         
+        for file_path, module_doc in zip(misses, parallel_map(_summarize_file, misses)):
+            summaries[file_path] = module_doc
+            if module_doc is not None:
+                cache.put(file_path, signatures[file_path], module_doc)
+        
+        api_docs = {}
         for file_path in python_files:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
-                
-                module_doc = {
-                    "file": str(file_path),
-                    "functions": [],
-                    "classes": [],
-                }
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        module_doc["functions"].append({
-                            "name": node.name,
-                            "args": [arg.arg for arg in node.args.args],
-                            "docstring": ast.get_docstring(node),
-                            "line": node.lineno,
-                        })
-                    elif isinstance(node, ast.ClassDef):
-                        methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                        module_doc["classes"].append({
-                            "name": node.name,
-                            "methods": methods,
-                            "docstring": ast.get_docstring(node),
-                            "line": node.lineno,
-                        })
-                
+            module_doc = summaries[file_path]
+            if module_doc is not None:
                 api_docs[str(file_path)] = module_doc
-            except Exception:
-                continue
         
-        # Generate markdown documentation
-        markdown = self._generate_markdown_docs(api_docs)
+        # Persist before any docstrings are filled in, so the cache only ever
+        # holds what the source files actually contain.
+        cache.save()
+        
+        json_file = output_dir / "API.json"
+        if fill_docstrings:
+            # Unchanged files keep the docs (and generated docstrings) of the
+            # previous run; anything still undocumented is filled below.
+            previous = _load_previous_docs(json_file)
+            for file_path in python_files:
+                key = str(file_path)
+                entry = previous.get(key)
+                if key in api_docs and entry and tuple(entry["signature"]) == signatures[file_path]:
+                    api_docs[key] = entry["doc"]
+            
+            self._fill_missing_docstrings(api_docs)
         
+        # Generate markdown documentation straight into the output file
         output_file = output_dir / "API.md"
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(markdown)
+        with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+            self._write_markdown_docs(api_docs, f)
+        
+        write_json(json_file, {
+            "files": {
+                str(file_path): {"signature": signatures[file_path], "doc": api_docs[str(file_path)]}
+                for file_path in python_files
+                if str(file_path) in api_docs and signatures[file_path] is not None
+            },
+        })
         
         return {
             "files_documented": len(api_docs),
@@ -171,31 +306,91 @@ Create a professional README with:
             "api_docs": api_docs,
         }
 
-    def _generate_markdown_docs(self, api_docs: Dict[str, Any]) -> str:
-        """Generate markdown from API docs."""
-        lines = ["# API Documentation\n"]
+    def _fill_missing_docstrings(self, api_docs: Dict[str, Any]) -> None:
+        """Generate docstrings for every undocumented function and class in one batch."""
+        targets = []
+        prompts = []
+        for doc in api_docs.values():
+            for func in doc["functions"]:
+                if not _clean_docstring(func.get("docstring")):
+                    targets.append(func)
+                    prompts.append((
+                        _FILL_FUNCTION_PROMPT_TEMPLATE.format(name=func["name"], args=", ".join(func["args"])),
+                        _FILL_FUNCTION_SYSTEM_PROMPT,
+                    ))
+            for cls in doc["classes"]:
+                if not _clean_docstring(cls.get("docstring")):
+                    targets.append(cls)
+                    prompts.append((
+                        _FILL_CLASS_PROMPT_TEMPLATE.format(name=cls["name"], methods=", ".join(cls["methods"][:10])),
+                        _FILL_CLASS_SYSTEM_PROMPT,
+                    ))
+        
+        if not prompts:
+            return
+        
+        # Identical prompts (e.g. ``__init__(self, config)`` in many modules)
+        # are sent once and the answer is shared by every site.
+        answers = self._generate_docstrings(list(dict.fromkeys(prompts)))
+        for target, prompt in zip(targets, prompts):
+            target["docstring"] = answers[prompt].strip()
+            target["docstring_generated"] = True
+
+    def _generate_docstrings(self, prompts: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """Answer docstring prompts, packing several symbols into each request.
+        
+        Each packed request asks for one JSON line per symbol; any symbol whose
+        line is missing or malformed is retried on its own.
+        """
+        max_concurrency = self.config.get("llm.max_concurrency", 4)
+        per_request = self.config.get("llm.docstrings_per_request", 8)
+        answers: Dict[Tuple[str, str], str] = {}
+        
+        if per_request > 1 and len(prompts) > 1:
+            groups = [prompts[i:i + per_request] for i in range(0, len(prompts), per_request)]
+            packed = [
+                (
+                    "\n\n".join(f"Item {i}:\n{prompt}" for i, (prompt, _) in enumerate(group)),
+                    _PACKED_SYSTEM_PROMPT,
+                )
+                for group in groups
+            ]
+            for group, response in zip(groups, self.llm_client.generate_batch(packed, max_concurrency=max_concurrency)):
+                for i, docstring in _parse_packed_docstrings(response).items():
+                    if 0 <= i < len(group):
+                        answers[group[i]] = docstring
+        
+        missing = [prompt for prompt in prompts if prompt not in answers]
+        answers.update(zip(missing, self.llm_client.generate_batch(missing, max_concurrency=max_concurrency)))
+        return answers
+
+    def _write_markdown_docs(self, api_docs: Dict[str, Any], fh) -> None:
+        """Write markdown from API docs to an open text file."""
+        # Every entry after the title is written with its leading separator,
+        # so the output matches joining the entries with newlines.
+        write = fh.write
+        write("# API Documentation\n")
         
         for file_path, doc in api_docs.items():
-            lines.append(f"## {file_path}\n")
+            write(f"\n## {file_path}\n")
             
             if doc.get("classes"):
-                lines.append("### Classes\n")
+                write("\n### Classes\n")
                 for cls in doc["classes"]:
-                    lines.append(f"#### {cls['name']}\n")
-                    if cls.get("docstring"):
-                        lines.append(f"{cls['docstring']}\n")
+                    write(f"\n#### {cls['name']}\n")
+                    docstring = _clean_docstring(cls.get("docstring"))
+                    if docstring:
+                        write(f"\n{docstring}\n")
                     if cls.get("methods"):
-                        lines.append(f"**Methods:** {', '.join(cls['methods'])}\n")
-                    lines.append("")
+                        write(f"\n**Methods:** {', '.join(cls['methods'])}\n")
+                    write("\n")
             
             if doc.get("functions"):
-                lines.append("### Functions\n")
+                write("\n### Functions\n")
                 for func in doc["functions"]:
-                    lines.append(f"#### {func['name']}\n")
-                    lines.append(f"**Arguments:** {', '.join(func.get('args', []))}\n")
-                    if func.get("docstring"):
-                        lines.append(f"{func['docstring']}\n")
-                    lines.append("")
-        
-        return "\n".join(lines)
-
+                    write(f"\n#### {func['name']}\n")
+                    write(f"\n**Arguments:** {', '.join(func.get('args', []))}\n")
+                    docstring = _clean_docstring(func.get("docstring"))
+                    if docstring:
+                        write(f"\n{docstring}\n")
+                    write("\n")
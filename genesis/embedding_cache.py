@@ -0,0 +1,85 @@
+"""Persistent cache of text embeddings."""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Keys per SELECT ... IN (...); below SQLite's default limit of 999 parameters
+_MAX_KEYS_PER_QUERY = 900
+
+
+class EmbeddingCache:
+    """SQLite-backed map from (model, text) to its embedding vector."""
+
+    def __init__(self, db_path: Path, model_name: str):
+        """Open (or create) the cache database."""
+        self.db_path = Path(db_path)
+        self.model_name = model_name
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Searches can come from batch worker threads; one connection behind a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> str:
+        """Return the cache key for a text under this model."""
+        return hashlib.blake2b(f"{self.model_name}\x1f{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return cached embeddings for whichever of the texts are present."""
+        keys = {self._key(text): text for text in texts}
+        found: Dict[str, np.ndarray] = {}
+        if not keys:
+            return found
+        
+        # Bounded IN lists; SQLite caps the number of bound parameters
+        key_list = list(keys)
+        rows = []
+        with self._lock:
+            for start in range(0, len(key_list), _MAX_KEYS_PER_QUERY):
+                batch = key_list[start:start + _MAX_KEYS_PER_QUERY]
+                placeholders = ",".join("?" * len(batch))
+                rows.extend(self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall())
+        for key, blob in rows:
+            found[keys[key]] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray]) -> None:
+        """Store embeddings for texts."""
+        rows = [
+            (self._key(text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+            self._conn.commit()
+
+    def encode(
+        self,
+        model,
+        texts: List[str],
+        encode_missing: Optional[Callable[[List[str]], Sequence[np.ndarray]]] = None,
+    ) -> List[np.ndarray]:
+        """Embed texts, running the model only for those not already cached.
+        
+        encode_missing, if given, embeds the uncached texts instead of
+        model.encode.
+        """
+        cached = self.get_many(texts)
+        missing = list(dict.fromkeys(text for text in texts if text not in cached))
+        if missing:
+            vectors = encode_missing(missing) if encode_missing is not None else model.encode(missing)
+            self.put_many(missing, vectors)
+            cached.update(zip(missing, (np.asarray(v, dtype=np.float32) for v in vectors)))
+        return [cached[text] for text in texts]
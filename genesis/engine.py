@@ -1,13 +1,16 @@
 """Main Code Genesis engine that orchestrates all phases."""
 
-import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 from genesis.config import Config
 from genesis.style_fingerprint import StyleFingerprint
 from genesis.vector_db import VectorDatabase
+from genesis.llm_client import create_llm_client, LLMClient
+from genesis.llm_cache import with_semantic_cache
 from genesis.phases import Phase1Assimilation, Phase2ArchitecturalPlanning, Phase3AdaptiveWeaving
+from genesis.utils import read_json, write_json
 
 
 class CodeGenesisEngine:
@@ -18,6 +21,9 @@ class CodeGenesisEngine:
         self.config = Config(config_path)
         self.vector_db = VectorDatabase(self.config)
         self.style_fingerprint_data: Optional[Dict[str, Any]] = None
+        # Built on first generate() and shared by every later phase
+        self._llm_client: Optional[LLMClient] = None
+        self._style_guide: Optional[str] = None
         self.system_map_path = Path(self.config.get("vector_db.persist_directory", "./.genesis_index")) / "system_map.json"
 
     def assimilate(self, repo_path: Optional[Path] = None) -> Dict[str, Any]:
@@ -46,11 +52,16 @@ class CodeGenesisEngine:
         
         self.style_fingerprint_data = system_map.get("fingerprint", {})
         
+        llm_client = self._get_llm_client()
+        style_guide = self._get_style_guide()
+        
         # Phase 2: Architectural Planning
         phase2 = Phase2ArchitecturalPlanning(
             self.config,
             self.vector_db,
             self.style_fingerprint_data,
+            llm_client=llm_client,
+            style_guide=style_guide,
         )
         blueprint = phase2.run(user_request)
         
@@ -60,6 +71,8 @@ class CodeGenesisEngine:
             self.vector_db,
             self.style_fingerprint_data,
             blueprint,
+            llm_client=llm_client,
+            style_guide=style_guide,
         )
         result = phase3.run(output_dir)
         
@@ -68,18 +81,40 @@ class CodeGenesisEngine:
             "generated_files": result,
         }
 
+    def prepare_generation(self) -> None:
+        """Set up what every generate() call shares: the system map, LLM client and style guide.
+        
+        generate() does this lazily; call this first when running several
+        generations at once, so they don't each assimilate or build a client.
+        """
+        if not self._load_system_map():
+            print("⚠ Warning: System map not found. Running assimilation first...")
+            self.assimilate()
+        self._get_llm_client()
+        self._get_style_guide()
+
+    def _get_llm_client(self) -> LLMClient:
+        """Return the engine's LLM client, creating it on first use."""
+        if self._llm_client is None:
+            self._llm_client = with_semantic_cache(create_llm_client(self.config), self.vector_db, self.config)
+        return self._llm_client
+
+    def _get_style_guide(self) -> str:
+        """Return the repository style guide, building it on first use."""
+        if self._style_guide is None:
+            self._style_guide = StyleFingerprint(self.config).get_style_guide()
+        return self._style_guide
+
     def _save_system_map(self, system_map: Dict[str, Any]) -> None:
         """Save system map to disk."""
         self.system_map_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.system_map_path, "w", encoding="utf-8") as f:
-            json.dump(system_map, f, indent=2)
+        write_json(self.system_map_path, system_map)
 
     def _load_system_map(self) -> Optional[Dict[str, Any]]:
         """Load system map from disk."""
         if self.system_map_path.exists():
             try:
-                with open(self.system_map_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return read_json(self.system_map_path)
             except Exception as e:
                 print(f"Warning: Could not load system map: {e}")
         return None
@@ -91,3 +126,15 @@ class CodeGenesisEngine:
             self.system_map_path.unlink()
         print("✓ Index cleared successfully")
 
+
+def get_engine(config_path: Optional[str] = None) -> CodeGenesisEngine:
+    """Return the process-wide engine for a config file, building it on first use."""
+    if config_path is None:
+        config_path = Path(__file__).parent.parent / "config.yaml"
+    return _get_engine(str(Path(config_path).resolve()))
+
+
+@lru_cache(maxsize=4)
+def _get_engine(resolved_config_path: str) -> CodeGenesisEngine:
+    """Build one engine per resolved config path and keep it for reuse."""
+    return CodeGenesisEngine(resolved_config_path)
@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 try:
@@ -12,6 +13,13 @@ try:
 except ImportError:
     GIT_AVAILABLE = False
 
+# Optional libgit2 bindings: diffs are computed in-process instead of
+# spawning a git subprocess per call.
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 
 class GitIntegration:
     """Git integration for Code Genesis."""
@@ -28,6 +36,13 @@ class GitIntegration:
             self.repo = Repo(repo_path)
         except Exception:
             raise ValueError(f"Not a git repository: {repo_path}")
+        
+        self._pg = None
+        if pygit2 is not None and self.repo.working_tree_dir:
+            try:
+                self._pg = pygit2.Repository(self.repo.working_tree_dir)
+            except Exception:
+                self._pg = None
 
     def create_feature_branch(self, branch_name: str) -> bool:
         """Create a new feature branch for generated code."""
@@ -46,10 +61,10 @@ class GitIntegration:
     def commit_generated_code(self, files: List[Path], message: str, author: Optional[str] = None) -> bool:
         """Commit generated code files."""
         try:
-            # Stage files
-            for file_path in files:
-                if file_path.exists():
-                    self.repo.index.add([str(file_path)])
+            # Stage files in a single index update
+            paths = [str(file_path) for file_path in files if file_path.exists()]
+            if paths:
+                self.repo.index.add(paths)
             
             # Commit
             commit = self.repo.index.commit(
@@ -75,6 +90,9 @@ class GitIntegration:
     def get_diff(self, file_path: Optional[Path] = None) -> str:
         """Get git diff for file or all changes."""
         try:
+            # Glob and magic pathspecs are left to git itself
+            if self._pg is not None and not (file_path and any(c in str(file_path) for c in "*?[:")):
+                return self._pygit2_diff(file_path)
             if file_path:
                 return self.repo.git.diff(str(file_path))
             else:
@@ -82,6 +100,27 @@ class GitIntegration:
         except Exception as e:
             return f"Error getting diff: {e}"
 
+    def _pygit2_diff(self, file_path: Optional[Path] = None) -> str:
+        """Diff the working tree against the index in-process, like ``git diff``."""
+        diff = self._pg.diff()
+        if file_path is None:
+            text = diff.patch or ""
+        else:
+            # git resolves relative paths against the repository root
+            workdir = Path(self.repo.working_tree_dir).resolve()
+            target = (workdir / file_path).resolve().relative_to(workdir).as_posix()
+            # Like a git pathspec, a directory matches everything below it
+            prefix = "" if target == "." else target.rstrip("/") + "/"
+            text = "".join(
+                patch.text for patch in diff
+                if any(
+                    path == target or path.startswith(prefix)
+                    for path in (patch.delta.new_file.path, patch.delta.old_file.path)
+                )
+            )
+        # GitPython strips the trailing newline from command output
+        return text.rstrip("\n")
+
     def get_file_history(self, file_path: Path, limit: int = 10) -> List[Dict[str, Any]]:
         """Get commit history for a file."""
         try:
@@ -119,6 +158,28 @@ class GitIntegration:
             return False
 
 
+_REVIEW_FILE_SYSTEM_PROMPT = """You are an expert code reviewer. Review the code and provide:
+1. Overall assessment
+2. Potential bugs or issues
+3. Performance concerns
+4. Security issues
+5. Code quality suggestions
+6. Best practices recommendations
+
+Be constructive and specific."""
+
+_REVIEW_DIFF_SYSTEM_PROMPT = """You are an expert code reviewer. Review the git diff and provide:
+1. Overall assessment of changes
+2. Potential issues introduced
+3. Suggestions for improvement
+4. Missing tests or documentation"""
+
+_SUMMARY_SYSTEM_PROMPT = "Summarize code reviews into a concise report."
+
+# Reviews per partial summary when a review set is too large for one prompt.
+_SUMMARY_CHUNK_SIZE = 8
+
+
 class CodeReviewGenerator:
     """Generate code reviews using LLM."""
 
@@ -127,22 +188,16 @@ class CodeReviewGenerator:
         from genesis.llm_client import create_llm_client
         self.config = config
         self.llm_client = create_llm_client(config)
+        # Cap on source bytes sent per review; roughly what fits in max_tokens
+        self._max_bytes = self.config.get("llm.max_tokens", 4000) * 3
 
     def review_file(self, file_path: Path) -> Dict[str, Any]:
         """Generate code review for a file."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            system_prompt = """You are an expert code reviewer. Review the code and provide:
-1. Overall assessment
-2. Potential bugs or issues
-3. Performance concerns
-4. Security issues
-5. Code quality suggestions
-6. Best practices recommendations
-
-Be constructive and specific."""
+            raw = Path(file_path).read_bytes()
+            if len(raw) > self._max_bytes:
+                raw = raw[:self._max_bytes] + b"\n... [truncated] ..."
+            content = raw.decode("utf-8", errors="replace")
             
             user_prompt = f"""Review this code file:
 
@@ -150,7 +205,7 @@ Be constructive and specific."""
 
 Provide a comprehensive code review."""
             
-            review = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
+            review = self.llm_client.generate(user_prompt, system_prompt=_REVIEW_FILE_SYSTEM_PROMPT)
             
             return {
                 "file": str(file_path),
@@ -160,21 +215,29 @@ Provide a comprehensive code review."""
         except Exception as e:
             return {"error": str(e)}
 
+    def review_files(self, file_paths: List[Path], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Review several files with their LLM calls in flight concurrently.
+        
+        Results are in input order; ``max_concurrency`` defaults to the
+        ``llm.max_concurrency`` config value.
+        """
+        if max_concurrency is None:
+            max_concurrency = self.config.get("llm.max_concurrency", 4)
+        if not file_paths:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(int(max_concurrency), len(file_paths)))) as executor:
+            return list(executor.map(self.review_file, file_paths))
+
     def review_diff(self, diff: str) -> Dict[str, Any]:
         """Review a git diff."""
-        system_prompt = """You are an expert code reviewer. Review the git diff and provide:
-1. Overall assessment of changes
-2. Potential issues introduced
-3. Suggestions for improvement
-4. Missing tests or documentation"""
-        
         user_prompt = f"""Review this git diff:
 
 {diff}
 
 Provide a comprehensive review of the changes."""
         
-        review = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
+        review = self.llm_client.generate(user_prompt, system_prompt=_REVIEW_DIFF_SYSTEM_PROMPT)
         
         return {
             "review": review,
@@ -182,17 +245,41 @@ Provide a comprehensive review of the changes."""
         }
 
     def generate_review_summary(self, reviews: List[Dict[str, Any]]) -> str:
-        """Generate summary of multiple reviews."""
-        system_prompt = "Summarize code reviews into a concise report."
+        """Generate summary of multiple reviews.
         
-        reviews_text = "\n\n".join([f"File: {r.get('file', 'unknown')}\n{r.get('review', '')}" for r in reviews])
+        Large review sets are summarized in chunks concurrently, then the
+        partial summaries are merged, so no single prompt has to carry every
+        review.
+        """
+        if len(reviews) <= _SUMMARY_CHUNK_SIZE:
+            return self._summarize_reviews(reviews)
         
-        user_prompt = f"""Summarize these code reviews:
+        chunks = [reviews[i:i + _SUMMARY_CHUNK_SIZE] for i in range(0, len(reviews), _SUMMARY_CHUNK_SIZE)]
+        partial = self.llm_client.generate_batch(
+            [(self._summary_prompt(chunk), _SUMMARY_SYSTEM_PROMPT) for chunk in chunks],
+            max_concurrency=self.config.get("llm.max_concurrency", 4),
+        )
+        
+        partial_text = "\n\n".join(f"Partial summary {i}:\n{summary}" for i, summary in enumerate(partial, 1))
+        user_prompt = f"""Combine these partial summaries into one report:
 
-{reviews_text}
+{partial_text}
 
 Create a concise summary report."""
         
-        summary = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
-        return summary
+        return self.llm_client.generate(user_prompt, system_prompt=_SUMMARY_SYSTEM_PROMPT)
+
+    def _summarize_reviews(self, reviews: List[Dict[str, Any]]) -> str:
+        """Summarize a set of reviews with one LLM call."""
+        return self.llm_client.generate(self._summary_prompt(reviews), system_prompt=_SUMMARY_SYSTEM_PROMPT)
+
+    @staticmethod
+    def _summary_prompt(reviews: List[Dict[str, Any]]) -> str:
+        """Build the summary prompt for a set of reviews."""
+        reviews_text = "\n\n".join([f"File: {r.get('file', 'unknown')}\n{r.get('review', '')}" for r in reviews])
+        
+        return f"""Summarize these code reviews:
 
+{reviews_text}
+
+Create a concise summary report."""
@@ -0,0 +1,134 @@
+"""Persistent prompt/response cache for LLM calls."""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from genesis.llm_client import LLMClient
+
+
+class SemanticLLMCache:
+    """LLM responses stored in a Chroma collection beside the code index.
+    
+    Lookups try an exact match on the request first, then fall back to the
+    nearest stored prompt within a small cosine distance. That query is
+    filtered on the model, the system prompt and a hash of the full prompt:
+    the embedding model only sees the first ~256 tokens, so long prompts that
+    share a prefix would otherwise return each other's responses.
+    """
+
+    def __init__(self, vector_db: Any, collection_name: str = "llm_cache", max_distance: float = 0.05):
+        """Initialize cache on the vector database's client and embedding model."""
+        self.vector_db = vector_db
+        self.max_distance = max_distance
+        self.collection = vector_db.client.get_or_create_collection(
+            name=collection_name,
+            metadata={"hnsw:space": "cosine", "description": "LLM response cache for Code Genesis"},
+        )
+        # Exact-match keys already stored, so a miss skips the collection lookup;
+        # entries added by other processes are still found by the vector query
+        self._keys = set(self.collection.get(include=[])["ids"])
+
+    @staticmethod
+    def key(model: str, system_prompt: Optional[str], prompt: str) -> str:
+        """Return the exact-match key for a request."""
+        return hashlib.blake2b(f"{model}\x1f{system_prompt}\x1f{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _system_key(system_prompt: Optional[str]) -> str:
+        """Return a short hash of the system prompt for metadata filtering."""
+        return hashlib.blake2b(str(system_prompt).encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _prompt_key(prompt: str) -> str:
+        """Return a hash of the full prompt for metadata filtering."""
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, system_prompt: Optional[str], prompt: str) -> Tuple[Optional[str], Optional[List[float]]]:
+        """Return (cached response or None, prompt embedding if one was computed)."""
+        key = self.key(model, system_prompt, prompt)
+        if key in self._keys:
+            hit = self.collection.get(ids=[key])
+            if hit["documents"]:
+                return hit["documents"][0], None
+        
+        if not self._keys and self.collection.count() == 0:
+            return None, None
+        
+        embedding = self.vector_db.embedding_model.encode([prompt])[0].tolist()
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=1,
+            where={"$and": [
+                {"model": model},
+                {"system": self._system_key(system_prompt)},
+                {"prompt": self._prompt_key(prompt)},
+            ]},
+        )
+        if results["documents"] and results["documents"][0]:
+            distance = results["distances"][0][0] if results["distances"] else None
+            if distance is not None and distance <= self.max_distance:
+                return results["documents"][0][0], embedding
+        return None, embedding
+
+    def put(
+        self,
+        model: str,
+        system_prompt: Optional[str],
+        prompt: str,
+        response: str,
+        embedding: Optional[List[float]] = None,
+    ) -> None:
+        """Store a response for a request."""
+        if embedding is None:
+            embedding = self.vector_db.embedding_model.encode([prompt])[0].tolist()
+        key = self.key(model, system_prompt, prompt)
+        self.collection.upsert(
+            ids=[key],
+            embeddings=[embedding],
+            documents=[response],
+            metadatas=[{
+                "model": model,
+                "system": self._system_key(system_prompt),
+                "prompt": self._prompt_key(prompt),
+            }],
+        )
+        self._keys.add(key)
+
+
+class CachedLLMClient(LLMClient):
+    """LLM client wrapper that serves repeated requests from a SemanticLLMCache."""
+
+    def __init__(self, client: LLMClient, cache: SemanticLLMCache):
+        """Initialize wrapper around an existing client."""
+        self.client = client
+        self.cache = cache
+
+    def _model_key(self, kwargs: Dict[str, Any]) -> str:
+        """Identify the model and sampling settings a request would use."""
+        model = kwargs.get("model", getattr(self.client, "model_name", None) or getattr(self.client, "model", None))
+        temperature = kwargs.get("temperature", getattr(self.client, "temperature", None))
+        max_tokens = kwargs.get("max_tokens", getattr(self.client, "max_tokens", None))
+        return f"{type(self.client).__name__}|{model}|{temperature}|{max_tokens}"
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+        """Generate text, reusing a cached response for the same or a near-identical request."""
+        model = self._model_key(kwargs)
+        embedding = None
+        if not kwargs.get("force_refresh", False):
+            cached, embedding = self.cache.get(model, system_prompt, prompt)
+            if cached is not None:
+                return cached
+        
+        response = self.client.generate(prompt, system_prompt=system_prompt, **kwargs)
+        if response:
+            self.cache.put(model, system_prompt, prompt, response, embedding)
+        return response
+
+
+def with_semantic_cache(client: LLMClient, vector_db: Any, config: Any) -> LLMClient:
+    """Wrap a client with the persistent cache when ``llm.semantic_cache`` is enabled."""
+    if not config.get("llm.semantic_cache", False):
+        return client
+    
+    cache = SemanticLLMCache(vector_db, max_distance=config.get("llm.semantic_cache_distance", 0.05))
+    return CachedLLMClient(client, cache)
@@ -1,7 +1,12 @@
 """LLM client for code generation."""
 
 import os
-from typing import List, Dict, Any, Optional
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple
 from abc import ABC, abstractmethod
 
 try:
@@ -22,6 +27,51 @@ except ImportError:
 from genesis.config import Config
 
 
+# Completions kept for repeated prompts. Only near-deterministic requests are
+# cached; at higher temperatures callers expect a fresh sample each time.
+_RESULT_CACHE_SIZE = 256
+_CACHEABLE_TEMPERATURE = 0.3
+_result_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _cached_generation(generate: Callable[..., str]) -> Callable[..., str]:
+    """Serve repeated low-temperature prompts from an in-memory LRU cache.
+    
+    Pass ``force_refresh=True`` to skip the lookup and call the provider.
+    """
+    @functools.wraps(generate)
+    def wrapper(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+        force_refresh = kwargs.pop("force_refresh", False)
+        temperature = kwargs.get("temperature", self.temperature)
+        if temperature is None or temperature >= _CACHEABLE_TEMPERATURE:
+            return generate(self, prompt, system_prompt=system_prompt, **kwargs)
+        
+        model = kwargs.get("model", getattr(self, "model_name", None) or self.model)
+        max_tokens = kwargs.get("max_tokens", getattr(self, "max_tokens", None))
+        key = hashlib.sha256(
+            f"{type(self).__name__}|{model}|{temperature}|{max_tokens}|{system_prompt}|{prompt}".encode("utf-8")
+        ).digest()
+        
+        if not force_refresh:
+            with _result_cache_lock:
+                cached = _result_cache.get(key)
+                if cached is not None:
+                    _result_cache.move_to_end(key)
+                    return cached
+        
+        result = generate(self, prompt, system_prompt=system_prompt, **kwargs)
+        if result is not None:
+            with _result_cache_lock:
+                _result_cache[key] = result
+                _result_cache.move_to_end(key)
+                if len(_result_cache) > _RESULT_CACHE_SIZE:
+                    _result_cache.popitem(last=False)
+        return result
+    
+    return wrapper
+
+
 class LLMClient(ABC):
     """Abstract base class for LLM clients."""
 
@@ -30,6 +80,58 @@ class LLMClient(ABC):
         """Generate text from prompt."""
         pass
 
+    def generate_batch(
+        self,
+        prompts: List[Tuple[str, Optional[str]]],
+        max_concurrency: int = 4,
+        **kwargs,
+    ) -> List[str]:
+        """Generate text for many (prompt, system_prompt) pairs, in order.
+        
+        Requests are network-bound, so up to ``max_concurrency`` of them are
+        kept in flight at once instead of waiting on each round-trip in turn.
+        Identical pairs are sent once and share the response.
+        """
+        responses: List[Optional[str]] = [None] * len(prompts)
+        for index, response in self.generate_as_completed(prompts, max_concurrency, **kwargs):
+            responses[index] = response
+        return responses
+
+    def generate_as_completed(
+        self,
+        prompts: List[Tuple[str, Optional[str]]],
+        max_concurrency: int = 4,
+        **kwargs,
+    ) -> Iterator[Tuple[int, str]]:
+        """Yield (index, response) for each prompt pair as its response arrives.
+        
+        Same request handling as ``generate_batch``, but callers can start
+        on early responses while later ones are still in flight.
+        """
+        if not prompts:
+            return
+        # dict keeps first-seen order; each distinct pair maps to its indices
+        groups: Dict[Tuple[str, Optional[str]], List[int]] = {}
+        for index, pair in enumerate(prompts):
+            groups.setdefault(tuple(pair), []).append(index)
+        
+        if max_concurrency <= 1 or len(groups) == 1:
+            for (prompt, system_prompt), indices in groups.items():
+                response = self.generate(prompt, system_prompt=system_prompt, **kwargs)
+                for index in indices:
+                    yield index, response
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(groups))) as executor:
+            futures = {
+                executor.submit(self.generate, prompt, system_prompt=system_prompt, **kwargs): indices
+                for (prompt, system_prompt), indices in groups.items()
+            }
+            for future in as_completed(futures):
+                response = future.result()
+                for index in futures[future]:
+                    yield index, response
+
 
 class OpenAIClient(LLMClient):
     """OpenAI API client."""
@@ -48,6 +150,7 @@ class OpenAIClient(LLMClient):
         self.temperature = config.get("llm.temperature", 0.7)
         self.max_tokens = config.get("llm.max_tokens", 4000)
 
+    @_cached_generation
     def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
         """Generate text using OpenAI API."""
         messages = []
@@ -83,16 +186,24 @@ class AnthropicClient(LLMClient):
         self.model = config.get("llm.model", "claude-3-opus-20240229")
         self.temperature = config.get("llm.temperature", 0.7)
         self.max_tokens = config.get("llm.max_tokens", 4000)
+        self.prompt_caching = config.get("llm.prompt_caching", True)
 
+    @_cached_generation
     def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
         """Generate text using Anthropic API."""
         messages = [{"role": "user", "content": prompt}]
         
+        system = system_prompt or ""
+        if system_prompt and self.prompt_caching:
+            # The system prompt (style guide, instructions) is the same for every
+            # file in a run; mark it so repeat calls read it from the prompt cache.
+            system = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        
         response = self.client.messages.create(
             model=kwargs.get("model", self.model),
             max_tokens=kwargs.get("max_tokens", self.max_tokens),
             temperature=kwargs.get("temperature", self.temperature),
-            system=system_prompt or "",
+            system=system,
             messages=messages,
         )
         
@@ -116,6 +227,7 @@ class GoogleClient(LLMClient):
         self.model = genai.GenerativeModel(self.model_name)
         self.temperature = config.get("llm.temperature", 0.7)
 
+    @_cached_generation
     def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
         """Generate text using Google Gemini API."""
         full_prompt = prompt
@@ -135,16 +247,35 @@ class GoogleClient(LLMClient):
         return response.text
 
 
+# Clients keyed by the settings they are built from, shared by every caller in
+# the process so they reuse one SDK client and its HTTP connection pool.
+_CLIENT_CACHE: Dict[Tuple[Any, ...], LLMClient] = {}
+
+
 def create_llm_client(config: Config) -> LLMClient:
     """Factory function to create appropriate LLM client."""
     provider = config.get("llm.provider", "openai").lower()
+    key = (
+        provider,
+        config.get("llm.model"),
+        config.get("llm.temperature"),
+        config.get("llm.max_tokens"),
+        config.get("llm.prompt_caching"),
+        config.get_llm_api_key(),
+    )
+    client = _CLIENT_CACHE.get(key)
+    if client is not None:
+        return client
     
     if provider == "openai":
-        return OpenAIClient(config)
+        client = OpenAIClient(config)
     elif provider == "anthropic":
-        return AnthropicClient(config)
+        client = AnthropicClient(config)
     elif provider == "google":
-        return GoogleClient(config)
+        client = GoogleClient(config)
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
+    
+    _CLIENT_CACHE[key] = client
+    return client
 
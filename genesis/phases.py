@@ -1,6 +1,9 @@
 """Implementation of the three phases: Assimilation, Planning, and Weaving."""
 
 import json
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 
@@ -8,7 +11,10 @@ from genesis.config import Config
 from genesis.style_fingerprint import StyleFingerprint
 from genesis.vector_db import VectorDatabase
 from genesis.llm_client import create_llm_client, LLMClient
-from genesis.code_formatter import CodeFormatter
+from genesis.llm_cache import with_semantic_cache
+from genesis.code_formatter import CodeFormatter, format_and_fix
+from genesis.context_utils import MAX_CTX_TOKENS, MAX_PER_DOC_TOKENS, format_context
+from genesis.utils import PARALLEL_MIN_ITEMS, extract_json_object, loads_json, strip_code_fence
 
 
 class Phase1Assimilation:
@@ -52,12 +58,25 @@ class Phase1Assimilation:
 class Phase2ArchitecturalPlanning:
     """Phase 2: Architectural Planning - Creates Code Blueprint."""
 
-    def __init__(self, config: Config, vector_db: VectorDatabase, style_fingerprint: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Config,
+        vector_db: VectorDatabase,
+        style_fingerprint: Dict[str, Any],
+        llm_client: Optional[LLMClient] = None,
+        style_guide: Optional[str] = None,
+    ):
         """Initialize planning phase."""
         self.config = config
         self.vector_db = vector_db
         self.style_fingerprint = style_fingerprint
-        self.llm_client = create_llm_client(config)
+        if llm_client is None:
+            llm_client = with_semantic_cache(create_llm_client(config), vector_db, config)
+        self.llm_client = llm_client
+        # Same for every prompt this phase builds
+        if style_guide is None:
+            style_guide = StyleFingerprint(config).get_style_guide()
+        self._style_guide = style_guide
 
     def run(self, user_request: str) -> Dict[str, Any]:
         """Run architectural planning phase."""
@@ -86,20 +105,16 @@ class Phase2ArchitecturalPlanning:
 
     def _format_context(self, relevant_code: List[Dict[str, Any]]) -> str:
         """Format relevant code context for LLM."""
-        context_parts = []
-        
-        for item in relevant_code:
-            doc = item.get("document", "")
-            metadata = item.get("metadata", {})
-            file_path = metadata.get("file_path", "unknown")
-            
-            context_parts.append(f"--- File: {file_path} ---\n{doc}\n")
-        
-        return "\n".join(context_parts)
+        return format_context(
+            relevant_code,
+            max_tokens=self.config.get("llm.context_max_tokens", MAX_CTX_TOKENS),
+            per_doc_tokens=self.config.get("llm.context_doc_tokens", MAX_PER_DOC_TOKENS),
+            model=self.config.get("llm.model"),
+        )
 
     def _generate_blueprint(self, user_request: str, context: str) -> Dict[str, Any]:
         """Generate code blueprint using LLM."""
-        style_guide = StyleFingerprint(self.config).get_style_guide()
+        style_guide = self._style_guide
         
         system_prompt = f"""You are an expert software architect. Your task is to create a detailed code blueprint based on user requirements.
 
@@ -137,17 +152,11 @@ Create a detailed code blueprint following the existing codebase patterns and st
         
         # Parse JSON response
         try:
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in response:
-                json_start = response.find("```json") + 7
-                json_end = response.find("```", json_start)
-                response = response[json_start:json_end].strip()
-            elif "```" in response:
-                json_start = response.find("```") + 3
-                json_end = response.find("```", json_start)
-                response = response[json_start:json_end].strip()
+            # Extract JSON from response (handle markdown code blocks and
+            # any prose around the object)
+            response = strip_code_fence(response)
             
-            blueprint = json.loads(response)
+            blueprint = loads_json(extract_json_object(response))
             return blueprint
         except json.JSONDecodeError:
             # Fallback: create a simple blueprint
@@ -194,13 +203,21 @@ class Phase3AdaptiveWeaving:
         vector_db: VectorDatabase,
         style_fingerprint: Dict[str, Any],
         blueprint: Dict[str, Any],
+        llm_client: Optional[LLMClient] = None,
+        style_guide: Optional[str] = None,
     ):
         """Initialize weaving phase."""
         self.config = config
         self.vector_db = vector_db
         self.style_fingerprint = style_fingerprint
         self.blueprint = blueprint
-        self.llm_client = create_llm_client(config)
+        if llm_client is None:
+            llm_client = with_semantic_cache(create_llm_client(config), vector_db, config)
+        self.llm_client = llm_client
+        # Same for every prompt this phase builds
+        if style_guide is None:
+            style_guide = StyleFingerprint(config).get_style_guide()
+        self._style_guide = style_guide
         self.formatter = CodeFormatter(style_fingerprint)
 
     def run(self, output_dir: Optional[Path] = None) -> Dict[str, Any]:
@@ -216,36 +233,60 @@ class Phase3AdaptiveWeaving:
         
         generated_files = []
         
-        for file_info in self.blueprint.get("files", []):
-            print(f"\n[Generating] {file_info.get('path', 'unknown')}...")
-            
-            # Generate code
-            code = self._generate_code(file_info)
-            
-            # Format code
-            if self.config.get("generation.auto_format", True):
-                code = self.formatter.format_code(code)
-            
-            # Validate and fix
-            if self.config.get("generation.auto_lint", True):
-                code, is_valid = self._validate_and_fix(code, file_info)
-                if not is_valid:
-                    print(f"  ⚠ Warning: Code may have issues")
-            
-            # Write file
-            file_path = output_dir / file_info["path"]
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(code)
-            
-            generated_files.append({
-                "path": str(file_path),
-                "action": file_info.get("action", "create"),
-                "code": code,
-            })
-            
-            print(f"  ✓ Generated: {file_path}")
+        # Pipeline: LLM calls run concurrently; each response is formatted and
+        # auto-fixed as it arrives and then written on a thread pool, so disk
+        # and CPU work overlap the requests still in flight.
+        file_infos = self.blueprint.get("files", [])
+        if file_infos:
+            print(f"\n[Generating] {len(file_infos)} file(s)...")
+        prompts = self._code_prompt_pairs(file_infos)
+        fix = partial(
+            format_and_fix,
+            formatter=self.formatter,
+            auto_format=self.config.get("generation.auto_format", True),
+            auto_lint=self.config.get("generation.auto_lint", True),
+            max_iterations=self.config.get("correction.max_iterations", 3),
+        )
+        
+        fix_futures: Dict[int, Future] = {}
+        write_futures: Dict[int, Future] = {}
+        
+        def write_when_fixed(index: int, future: Future) -> None:
+            if future.exception() is None:
+                code, _ = future.result()
+                write_futures[index] = writer.submit(self._write_generated_file, file_infos[index], code, output_dir)
+        
+        # Formatting is CPU-bound: worker processes for large blueprints,
+        # otherwise one thread (it still overlaps the network waits). The LLM
+        # threads are already running here, so workers are started from a
+        # clean server process rather than forked from this one.
+        if len(file_infos) >= PARALLEL_MIN_ITEMS:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            fix_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context(start_method))
+        else:
+            fix_pool = ThreadPoolExecutor(max_workers=1)
+        
+        # Leaving fix_pool first runs its callbacks, which submit to writer
+        with ThreadPoolExecutor(max_workers=self._write_workers(len(file_infos))) as writer:
+            with fix_pool:
+                for index, code in self.llm_client.generate_as_completed(
+                    prompts,
+                    max_concurrency=self.config.get("llm.max_concurrency", 4),
+                ):
+                    future = fix_pool.submit(fix, strip_code_fence(code))
+                    future.add_done_callback(partial(write_when_fixed, index))
+                    fix_futures[index] = future
+        
+        # Progress is reported in blueprint order
+        fixed = [fix_futures[index].result() for index in range(len(file_infos))]
+        records = [write_futures[index].result() for index in range(len(file_infos))]
+        
+        for file_info, record, (_, is_valid) in zip(file_infos, records, fixed):
+            print(f"\n[Writing] {file_info.get('path', 'unknown')}...")
+            if not is_valid:
+                print(f"  ⚠ Warning: Code may have issues")
+            generated_files.append(record)
+            print(f"  ✓ Generated: {record['path']}")
         
         # Generate tests if enabled
         if self.config.get("generation.auto_test", True):
@@ -262,13 +303,45 @@ class Phase3AdaptiveWeaving:
             "output_dir": str(output_dir),
         }
 
-    def _generate_code(self, file_info: Dict[str, Any]) -> str:
-        """Generate code for a file."""
-        style_guide = StyleFingerprint(self.config).get_style_guide()
+    def _write_workers(self, n_files: int) -> int:
+        """Return the thread count for writing n_files."""
+        return max(1, min(self.config.get("generation.write_workers", 8), n_files))
+
+    def _write_generated_file(self, file_info: Dict[str, Any], code: str, output_dir: Path) -> Dict[str, Any]:
+        """Write one generated file and return its record."""
+        file_path = output_dir / file_info["path"]
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        file_path.write_text(code, encoding="utf-8")
+        
+        return {
+            "path": str(file_path),
+            "action": file_info.get("action", "create"),
+            "code": code,
+        }
+
+    def _code_prompt_pairs(self, file_infos: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Build prompts for several files, looking up their context in one search."""
+        queries = [self._context_query(file_info) for file_info in file_infos]
+        contexts = self.vector_db.search_batch(queries, n_results=3)
+        return [
+            self._code_prompts(file_info, relevant_code)
+            for file_info, relevant_code in zip(file_infos, contexts)
+        ]
+
+    def _context_query(self, file_info: Dict[str, Any]) -> str:
+        """Build the vector search query for one blueprint file."""
+        return f"{file_info.get('description', '')} {file_info.get('pseudocode', '')}"
+
+    def _code_prompts(
+        self, file_info: Dict[str, Any], relevant_code: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[str, str]:
+        """Build the (user prompt, system prompt) pair for one blueprint file."""
+        style_guide = self._style_guide
         
         # Get relevant context
-        query = f"{file_info.get('description', '')} {file_info.get('pseudocode', '')}"
-        relevant_code = self.vector_db.search(query, n_results=3)
+        if relevant_code is None:
+            relevant_code = self.vector_db.search(self._context_query(file_info), n_results=3)
         context = self._format_context(relevant_code)
         
         system_prompt = f"""You are an expert Python developer. Generate production-ready code that perfectly matches the existing codebase style.
@@ -298,52 +371,28 @@ Relevant Existing Code:
 
 Generate the complete, production-ready Python code that integrates seamlessly with the existing codebase."""
         
-        code = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
-        
-        # Clean up code (remove markdown code blocks if present)
-        if "```python" in code:
-            code_start = code.find("```python") + 9
-            code_end = code.find("```", code_start)
-            code = code[code_start:code_end].strip()
-        elif "```" in code:
-            code_start = code.find("```") + 3
-            code_end = code.find("```", code_start)
-            code = code[code_start:code_end].strip()
-        
-        return code
+        return user_prompt, system_prompt
 
     def _format_context(self, relevant_code: List[Dict[str, Any]]) -> str:
         """Format relevant code context."""
-        context_parts = []
-        
-        for item in relevant_code:
-            doc = item.get("document", "")
-            metadata = item.get("metadata", {})
-            file_path = metadata.get("file_path", "unknown")
-            
-            context_parts.append(f"--- File: {file_path} ---\n{doc}\n")
-        
-        return "\n".join(context_parts)
-
-    def _validate_and_fix(self, code: str, file_info: Dict[str, Any]) -> Tuple[str, bool]:
-        """Validate and attempt to fix code."""
-        max_iterations = self.config.get("correction.max_iterations", 3)
-        code, is_valid = self.formatter.auto_fix(code, max_iterations=max_iterations)
-        return code, is_valid
+        return format_context(
+            relevant_code,
+            max_tokens=self.config.get("llm.context_max_tokens", MAX_CTX_TOKENS),
+            per_doc_tokens=self.config.get("llm.context_doc_tokens", MAX_PER_DOC_TOKENS),
+            model=self.config.get("llm.model"),
+        )
 
     def _generate_tests(self, generated_files: List[Dict[str, Any]], output_dir: Path) -> List[Dict[str, Any]]:
         """Generate test files for generated code."""
         test_framework = self.config.get("generation.test_framework", "pytest")
         test_files = []
         
-        for file_info in generated_files:
-            if file_info.get("action") == "create":
-                # Generate test file
-                test_path = f"test_{Path(file_info['path']).name}"
-                
-                system_prompt = f"""Generate {test_framework} test cases for the provided code. Ensure tests are comprehensive and follow best practices."""
-                
-                user_prompt = f"""Generate {test_framework} test cases for:
+        system_prompt = f"""Generate {test_framework} test cases for the provided code. Ensure tests are comprehensive and follow best practices."""
+        
+        sources = [file_info for file_info in generated_files if file_info.get("action") == "create"]
+        prompts = []
+        for file_info in sources:
+            user_prompt = f"""Generate {test_framework} test cases for:
 
 {file_info.get('code', '')}
 
@@ -352,30 +401,34 @@ Create comprehensive test cases covering:
 - Edge cases
 - Error handling
 - Integration with existing code"""
-                
-                test_code = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
-                
-                # Clean up test code
-                if "```python" in test_code:
-                    test_start = test_code.find("```python") + 9
-                    test_end = test_code.find("```", test_start)
-                    test_code = test_code[test_start:test_end].strip()
-                elif "```" in test_code:
-                    test_start = test_code.find("```") + 3
-                    test_end = test_code.find("```", test_start)
-                    test_code = test_code[test_start:test_end].strip()
-                
-                test_file_path = output_dir / "tests" / test_path
-                test_file_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(test_file_path, "w", encoding="utf-8") as f:
-                    f.write(test_code)
-                
-                test_files.append({
-                    "path": str(test_file_path),
-                    "action": "create",
-                    "code": test_code,
-                })
+            prompts.append((user_prompt, system_prompt))
+        
+        # All test files are requested together, then written in order
+        test_codes = self.llm_client.generate_batch(
+            prompts,
+            max_concurrency=self.config.get("llm.max_concurrency", 4),
+        )
+        
+        def write_test(item: Tuple[Dict[str, Any], str]) -> Dict[str, Any]:
+            file_info, test_code = item
+            test_path = f"test_{Path(file_info['path']).name}"
+            
+            # Clean up test code
+            test_code = strip_code_fence(test_code)
+            
+            test_file_path = output_dir / "tests" / test_path
+            test_file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            test_file_path.write_text(test_code, encoding="utf-8")
+            
+            return {
+                "path": str(test_file_path),
+                "action": "create",
+                "code": test_code,
+            }
+        
+        with ThreadPoolExecutor(max_workers=self._write_workers(len(sources))) as executor:
+            test_files.extend(executor.map(write_test, zip(sources, test_codes)))
         
         return test_files
 
@@ -1,30 +1,558 @@
 """Code refactoring and migration tools."""
 
 import ast
+import builtins
+import io
+import textwrap
+import tokenize
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
 import re
 
-from genesis.llm_client import create_llm_client
+from genesis.llm_client import create_llm_client, LLMClient
 from genesis.config import Config
 from genesis.style_fingerprint import StyleFingerprint
+from genesis.utils import parallel_map, strip_code_fence
+
+_BUILTIN_NAMES = frozenset(dir(builtins))
+
+# A string literal inside an f-string replacement field, which can't contain
+# backslashes or the f-string's own quote before Python 3.12
+_QUOTED_RE = re.compile(r"[A-Za-z]*(?:'[^']*'|\"[^\"]*\")")
+
+# Suggestion types produced by suggest_refactorings, each tied to one code smell
+_SMELL_REFACTORINGS = frozenset({"extract_method", "simplify_conditionals", "reduce_nesting"})
+
+
+@lru_cache(maxsize=256)
+def _word_re(name: str) -> "re.Pattern[str]":
+    """Compile a whole-word pattern for a symbol name."""
+    return re.compile(r'\b' + re.escape(name) + r'\b')
+
+
+def _sub_outside_strings(pattern: "re.Pattern[str]", replacement: str, text: str) -> str:
+    """Apply pattern.sub to text, skipping the string literals in it."""
+    pieces = []
+    last = 0
+    for match in _QUOTED_RE.finditer(text):
+        pieces.append(pattern.sub(replacement, text[last:match.start()]))
+        pieces.append(match.group())
+        last = match.end()
+    pieces.append(pattern.sub(replacement, text[last:]))
+    return "".join(pieces)
+
+
+def _rename_in_fstring(token: str, old_name: str, new_name: str) -> str:
+    """Rename whole words inside the replacement fields of an f-string token.
+    
+    Before Python 3.12 an f-string is one STRING token, so the names in its
+    {...} fields never appear as NAME tokens.
+    """
+    prefix = re.match(r"[A-Za-z]*", token).group(0)
+    if "f" not in prefix.lower():
+        return token
+    
+    pattern = _word_re(old_name)
+    pieces = []
+    start = 0
+    depth = 0
+    i = len(prefix)
+    while i < len(token):
+        char = token[i]
+        if char == "{":
+            if depth == 0 and token.startswith("{{", i):
+                i += 2
+                continue
+            if depth == 0:
+                pieces.append(token[start:i + 1])
+                start = i + 1
+            depth += 1
+        elif char in "'\"" and depth > 0:
+            # Skip string literals nested in a field, so braces in them don't count
+            close = token.find(char, i + 1)
+            if close == -1:
+                break
+            i = close + 1
+            continue
+        elif char == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                pieces.append(_sub_outside_strings(pattern, new_name, token[start:i]))
+                start = i
+        i += 1
+    pieces.append(token[start:])
+    return "".join(pieces)
+
+
+def _rename_name_tokens(content: str, old_name: str, new_name: str) -> str:
+    """Rename identifier tokens only, leaving strings, comments and layout untouched."""
+    # Split exactly as tokenize's readline does (on "\n" only), so token
+    # rows and columns index these lines; splitlines() also breaks on form
+    # feeds and other separators.
+    lines = io.StringIO(content).readlines()
+    line_starts = [0]
+    for line in lines:
+        line_starts.append(line_starts[-1] + len(line))
+    
+    edits = []
+    for tok in tokenize.generate_tokens(io.StringIO(content).readline):
+        if tok.type == tokenize.NAME and tok.string == old_name:
+            edits.append((tok.start, tok.end, new_name))
+        elif tok.type == tokenize.STRING and old_name in tok.string:
+            renamed = _rename_in_fstring(tok.string, old_name, new_name)
+            if renamed != tok.string:
+                edits.append((tok.start, tok.end, renamed))
+    
+    # Replace from the end so earlier offsets stay valid
+    for (start_row, start_col), (end_row, end_col), text in reversed(edits):
+        start = line_starts[start_row - 1] + start_col
+        end = line_starts[end_row - 1] + end_col
+        content = content[:start] + text + content[end:]
+    return content
+
+
+def _line_offset(content: str, line_count: int) -> int:
+    """Return the offset just past the first line_count lines of content."""
+    offset = 0
+    for _ in range(line_count):
+        newline = content.find("\n", offset)
+        if newline == -1:
+            return len(content)
+        offset = newline + 1
+    return offset
+
+
+# Nodes that act on the enclosing function, so a block containing them can't move into a new one
+_SCOPE_EXITS = (ast.Return, ast.Yield, ast.YieldFrom, ast.Await, ast.AsyncFor, ast.AsyncWith, ast.Global, ast.Nonlocal)
+_NESTED_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+_LOOPS = (ast.For, ast.While)
+
+
+def _escapes_block(node: ast.AST, in_loop: bool = False) -> bool:
+    """Return True if node returns, yields or jumps out of the statements around it."""
+    if isinstance(node, _SCOPE_EXITS):
+        return True
+    if isinstance(node, (ast.Break, ast.Continue)):
+        return not in_loop
+    if isinstance(node, _NESTED_SCOPES):
+        return False
+    for field, value in ast.iter_fields(node):
+        # break/continue in a loop's else clause still target the outer loop
+        child_in_loop = in_loop or (isinstance(node, _LOOPS) and field == "body")
+        children = value if isinstance(value, list) else [value]
+        if any(isinstance(child, ast.AST) and _escapes_block(child, child_in_loop) for child in children):
+            return True
+    return False
+
+
+class _BlockNames(ast.NodeVisitor):
+    """Walk a block in evaluation order, tracking the names it has definitely bound.
+    
+    A read of a name that isn't definitely bound at that point needs its value
+    from outside the block, so it is recorded as free.
+    """
+
+    def __init__(self, bound: Iterable[str] = ()):
+        self.definite: Set[str] = set(bound)
+        self.free: Dict[str, None] = {}
+        self.stored: Dict[str, None] = {}
+
+    def _load(self, name: str) -> None:
+        if name not in self.definite:
+            self.free[name] = None
+
+    def _store(self, name: str) -> None:
+        self.definite.add(name)
+        self.stored[name] = None
+
+    def _branch(self, nodes: List[ast.AST], definite: Set[str]) -> Set[str]:
+        """Visit nodes that may not run, starting from definite; return what they leave bound."""
+        saved = self.definite
+        self.definite = set(definite)
+        for node in nodes:
+            self.visit(node)
+        result, self.definite = self.definite, saved
+        return result
+
+    def _visit_scope(self, nodes: List[ast.AST], bound: Iterable[str] = ()) -> None:
+        """Visit a nested scope; its free names are read from this one."""
+        inner = _BlockNames(bound)
+        for node in nodes:
+            inner.visit(node)
+        for name in inner.free:
+            self._load(name)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Store):
+            self._store(node.id)
+        else:
+            self._load(node.id)
+            if isinstance(node.ctx, ast.Del):
+                self.definite.discard(node.id)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self.visit(node.value)
+        for target in node.targets:
+            self.visit(target)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        self.visit(node.value)
+        if isinstance(node.target, ast.Name):
+            self._load(node.target.id)
+        self.visit(node.target)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self.visit(node.annotation)
+        if node.value is not None:
+            self.visit(node.value)
+            self.visit(node.target)
+
+    def visit_NamedExpr(self, node: ast.NamedExpr) -> None:
+        self.visit(node.value)
+        self.visit(node.target)
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> None:
+        self.visit(node.values[0])
+        self._branch(node.values[1:], self.definite)
+
+    def visit_IfExp(self, node: ast.IfExp) -> None:
+        self.visit(node.test)
+        self.definite = self._branch([node.body], self.definite) & self._branch([node.orelse], self.definite)
+
+    def visit_If(self, node: ast.If) -> None:
+        self.visit(node.test)
+        self.definite = self._branch(node.body, self.definite) & self._branch(node.orelse, self.definite)
+
+    def visit_For(self, node: ast.For) -> None:
+        self.visit(node.iter)
+        # The body may run zero times, and its later reads may see an earlier iteration
+        self._branch([node.target] + node.body, self.definite)
+        self._branch(node.orelse, self.definite)
+
+    def visit_While(self, node: ast.While) -> None:
+        self.visit(node.test)
+        self._branch(node.body, self.definite)
+        self._branch(node.orelse, self.definite)
+
+    def visit_Try(self, node: ast.Try) -> None:
+        before = self.definite
+        after = self._branch(node.body + node.orelse, before)
+        for handler in node.handlers:
+            after &= self._branch([handler], before)
+        # finally also runs when the body stopped part way through
+        self.definite = self._branch(node.finalbody, before) | after
+
+    visit_TryStar = visit_Try
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.type is not None:
+            self.visit(node.type)
+        if node.name:
+            self._store(node.name)
+        for statement in node.body:
+            self.visit(statement)
+        if node.name:
+            self.definite.discard(node.name)
+
+    def visit_Match(self, node: ast.AST) -> None:
+        self.visit(node.subject)
+        for case in node.cases:
+            self._branch([case], self.definite)
+
+    def visit_MatchAs(self, node: ast.AST) -> None:
+        self.generic_visit(node)
+        if node.name:
+            self._store(node.name)
+
+    def visit_MatchStar(self, node: ast.AST) -> None:
+        if node.name:
+            self._store(node.name)
+
+    def visit_MatchMapping(self, node: ast.AST) -> None:
+        self.generic_visit(node)
+        if node.rest:
+            self._store(node.rest)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._store((alias.asname or alias.name).split(".", 1)[0])
+
+    visit_ImportFrom = visit_Import
+
+    def _visit_function(self, node: ast.AST, body: List[ast.AST]) -> None:
+        args = node.args
+        for default in args.defaults + [d for d in args.kw_defaults if d is not None]:
+            self.visit(default)
+        arg_names = [
+            arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]
+            if arg is not None
+        ]
+        # Free names are treated as read where the function is defined
+        self._visit_scope(body, arg_names)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self._visit_function(node, node.body)
+        self._store(node.name)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self._visit_function(node, [node.body])
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        for child in node.decorator_list + node.bases + node.keywords:
+            self.visit(child)
+        self._visit_scope(node.body)
+        self._store(node.name)
+
+    def _visit_comprehension(self, node: ast.AST, *parts: ast.AST) -> None:
+        # Only the first iterable is evaluated in the enclosing scope
+        self.visit(node.generators[0].iter)
+        nodes: List[ast.AST] = []
+        for index, generator in enumerate(node.generators):
+            if index:
+                nodes.append(generator.iter)
+            nodes.append(generator.target)
+            nodes.extend(generator.ifs)
+        self._visit_scope(nodes + list(parts))
+
+    def visit_ListComp(self, node: ast.ListComp) -> None:
+        self._visit_comprehension(node, node.elt)
+
+    visit_SetComp = visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node: ast.DictComp) -> None:
+        self._visit_comprehension(node, node.key, node.value)
+
+
+def _definite_bindings(statements: List[ast.AST]) -> Set[str]:
+    """Return the names a statement sequence always binds when it completes."""
+    names = _BlockNames()
+    for statement in statements:
+        names.visit(statement)
+    return names.definite
+
+
+def _first_line(statement: ast.AST) -> int:
+    """Return a statement's first line, counting its decorators."""
+    return min([statement.lineno] + [d.lineno for d in getattr(statement, "decorator_list", [])])
+
+
+def _locate_block(
+    node: ast.AST, start_line: int, end_line: int
+) -> Optional[Tuple[List[Tuple[ast.AST, str, int]], List[ast.AST]]]:
+    """Find the statements spanning exactly start_line..end_line under node.
+    
+    Returns the path of (node, field, index) steps leading to the statement
+    list that holds them, with the index of the block's first statement in
+    the last step, or None if the lines don't cover whole statements.
+    """
+    for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+        children = getattr(node, field, None)
+        if not isinstance(children, list) or not children or not hasattr(children[0], "end_lineno"):
+            continue
+        overlapping = [
+            index for index, child in enumerate(children)
+            if _first_line(child) <= end_line and child.end_lineno >= start_line
+        ]
+        if not overlapping:
+            continue
+        first, last = overlapping[0], overlapping[-1]
+        if field not in ("handlers", "cases") and all(
+            _first_line(children[index]) >= start_line and children[index].end_lineno <= end_line
+            for index in overlapping
+        ):
+            return [(node, field, first)], children[first:last + 1]
+        if len(overlapping) == 1:
+            found = _locate_block(children[first], start_line, end_line)
+            if found is not None:
+                path, statements = found
+                return [(node, field, first)] + path, statements
+        return None
+    return None
+
+
+def _block_context(
+    tree: ast.Module, path: List[Tuple[ast.AST, str, int]], statements: List[ast.AST]
+) -> Tuple[Set[str], Set[str]]:
+    """Return the names definitely bound before a block and the names read after it.
+    
+    Reads anywhere in a loop around the block count as after it, since the
+    next iteration sees the block's bindings.
+    """
+    scope_depth = max(
+        index for index, (node, _, _) in enumerate(path)
+        if isinstance(node, (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    )
+    scope = path[scope_depth][0]
+    
+    bound_before: Set[str] = set()
+    if isinstance(scope, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        args = scope.args
+        bound_before.update(
+            arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]
+            if arg is not None
+        )
+    loops = []
+    for node, field, index in path[scope_depth:]:
+        if field in ("body", "orelse", "finalbody"):
+            bound_before |= _definite_bindings(getattr(node, field)[:index])
+        if isinstance(node, ast.For) and field == "body":
+            bound_before |= _definite_bindings([node.target])
+        elif isinstance(node, ast.With) and field == "body":
+            for item in node.items:
+                if item.optional_vars is not None:
+                    bound_before |= _definite_bindings([item.optional_vars])
+        elif isinstance(node, ast.Try) and field == "orelse":
+            bound_before |= _definite_bindings(node.body)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            bound_before.add(node.name)
+        if isinstance(node, (ast.For, ast.While)) and field == "body":
+            loops.append(node)
+    
+    block_end = (statements[-1].end_lineno, statements[-1].end_col_offset)
+    read_after = {
+        node.id for node in ast.walk(scope)
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Store)
+        and (node.lineno, node.col_offset) >= block_end
+    }
+    for loop in loops:
+        read_after.update(
+            node.id for node in ast.walk(loop)
+            if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Store)
+        )
+    return bound_before, read_after
+
+
+def _function_from_block(
+    content: str, block: str, start_line: int, end_line: int, function_name: str
+) -> Optional[Tuple[str, List[str], List[str]]]:
+    """Wrap the statements on start_line..end_line of content in a function.
+    
+    Returns the definition, its parameters and the names it must return, or
+    None when the lines aren't whole statements, the block returns, yields or
+    jumps out of its surroundings, or a name it may leave unbound can't be
+    shown to be bound before it.
+    """
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        return None
+    located = _locate_block(tree, start_line, end_line)
+    if located is None:
+        return None
+    path, statements = located
+    if any(_escapes_block(statement) for statement in statements):
+        return None
+    
+    names = _BlockNames()
+    for statement in statements:
+        names.visit(statement)
+    bound_before, read_after = _block_context(tree, path, statements)
+    
+    outputs = sorted(name for name in names.stored if name in read_after)
+    # Names read before the block binds them, and outputs it may leave
+    # unbound, keep their value from before the block
+    params = {name for name in names.free if name not in _BUILTIN_NAMES or name in names.stored}
+    params.update(name for name in outputs if name not in names.definite)
+    if any(name in names.stored and name not in bound_before for name in params):
+        return None
+    params = sorted(params)
+    
+    body = textwrap.dedent(block)
+    if not body.strip():
+        body = "pass\n"
+    if outputs:
+        body = body.rstrip("\n") + f"\nreturn {', '.join(outputs)}\n"
+    function_def = f"def {function_name}({', '.join(params)}):\n" + textwrap.indent(body, "    ")
+    return function_def, params, outputs
+
+
+def _extract_locally(content: str, start_line: int, end_line: int, function_name: str) -> Optional[Dict[str, Any]]:
+    """Extract lines start_line..end_line into a function without the LLM, or return None."""
+    block_start = _line_offset(content, start_line - 1)
+    block_end = _line_offset(content, end_line)
+    extracted_code = content[block_start:block_end]
+    
+    local = _function_from_block(content, extracted_code, start_line, end_line, function_name)
+    if local is None:
+        return None
+    function_def, params, outputs = local
+    indent = extracted_code[:len(extracted_code) - len(extracted_code.lstrip(" \t"))]
+    function_call = f"{function_name}({', '.join(params)})"
+    if outputs:
+        function_call = f"{', '.join(outputs)} = {function_call}"
+    return {
+        "original_file": content,
+        "refactored_file": content[:block_start] + indent + function_call + "\n" + content[block_end:],
+        "extracted_function": function_def,
+    }
+
+
+def _is_code_literal(pattern: str) -> bool:
+    """Return True if a migration pattern is Python source rather than a prose description."""
+    try:
+        ast.parse(pattern.strip())
+    except SyntaxError:
+        return False
+    return bool(pattern.strip())
+
+
+def _smells_for(file_path: Path) -> List[Dict[str, Any]]:
+    """Detect code smells in one file; module-level so worker processes can run it."""
+    from genesis.analysis import CodeAnalyzer
+    
+    return CodeAnalyzer().find_code_smells(file_path)
 
 
 class RefactoringTool:
     """Tools for code refactoring and migration."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, llm_client: Optional[LLMClient] = None):
         """Initialize refactoring tool."""
         self.config = config
-        self.llm_client = create_llm_client(config)
+        self.llm_client = llm_client if llm_client is not None else create_llm_client(config)
+        self._style_guide = StyleFingerprint(config).get_style_guide()
+        self._smell_cache: Dict[Any, List[Dict[str, Any]]] = {}
 
     def suggest_refactorings(self, file_path: Path) -> List[Dict[str, Any]]:
         """Suggest refactoring opportunities for a file."""
-        from genesis.analysis import CodeAnalyzer
+        return self.suggest_refactorings_batch([file_path])[Path(file_path)]
+
+    def suggest_refactorings_batch(self, paths: List[Path]) -> Dict[Path, List[Dict[str, Any]]]:
+        """Suggest refactoring opportunities for several files.
+        
+        Files are analyzed in worker processes; results for files whose
+        mtime and size are unchanged since the last call are reused.
+        """
+        paths = [Path(p) for p in paths]
+        smells_by_path: Dict[Path, List[Dict[str, Any]]] = {}
+        keys = {}
+        for file_path in dict.fromkeys(paths):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            keys[file_path] = (str(file_path), stat.st_mtime_ns, stat.st_size)
+            if keys[file_path] in self._smell_cache:
+                smells_by_path[file_path] = self._smell_cache[keys[file_path]]
         
-        analyzer = CodeAnalyzer()
-        smells = analyzer.find_code_smells(file_path)
+        to_run = [p for p in dict.fromkeys(paths) if p not in smells_by_path]
+        for file_path, smells in zip(to_run, parallel_map(_smells_for, to_run)):
+            smells_by_path[file_path] = smells
+            if file_path in keys:
+                self._smell_cache[keys[file_path]] = smells
         
+        return {
+            file_path: self._suggestions_from_smells(file_path, smells_by_path[file_path])
+            for file_path in paths
+        }
+
+    def _suggestions_from_smells(self, file_path: Path, smells: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Map detected code smells to refactoring suggestions."""
         suggestions = []
         for smell in smells:
             if smell["type"] == "long_function":
@@ -57,11 +585,15 @@ class RefactoringTool:
     def refactor_code(self, file_path: Path, refactoring_type: str, description: str) -> str:
         """Refactor code using LLM."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = Path(file_path).read_text(encoding="utf-8")
+            
+            # Nothing to do when the smell this refactoring targets isn't present
+            if refactoring_type in _SMELL_REFACTORINGS and not any(
+                suggestion["type"] == refactoring_type for suggestion in self.suggest_refactorings(file_path)
+            ):
+                return content
             
-            style_fp = StyleFingerprint(self.config)
-            style_guide = style_fp.get_style_guide()
+            style_guide = self._style_guide
             
             system_prompt = f"""You are an expert code refactoring assistant. Refactor the provided code according to the request while maintaining:
 - Exact same functionality
@@ -84,10 +616,7 @@ Provide the complete refactored code."""
             refactored = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
             
             # Clean up code
-            if "```python" in refactored:
-                refactored = refactored.split("```python")[1].split("```")[0].strip()
-            elif "```" in refactored:
-                refactored = refactored.split("```")[1].split("```")[0].strip()
+            refactored = strip_code_fence(refactored)
             
             return refactored
         except Exception as e:
@@ -96,26 +625,32 @@ Provide the complete refactored code."""
     def rename_symbol(self, file_path: Path, old_name: str, new_name: str) -> str:
         """Rename a symbol throughout a file."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = Path(file_path).read_text(encoding="utf-8")
             
-            # Simple find and replace (could be enhanced with AST)
-            # Replace whole word matches only
-            pattern = r'\b' + re.escape(old_name) + r'\b'
-            refactored = re.sub(pattern, new_name, content)
-            
-            return refactored
+            # Rename identifier tokens in one tokenizer pass; sources that
+            # don't tokenize fall back to whole-word replacement.
+            try:
+                return _rename_name_tokens(content, old_name, new_name)
+            except (tokenize.TokenError, SyntaxError):
+                return _word_re(old_name).sub(new_name, content)
         except Exception as e:
             return f"Error renaming: {e}"
 
     def extract_function(self, file_path: Path, start_line: int, end_line: int, function_name: str) -> Dict[str, Any]:
         """Extract code block into a new function."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            content = Path(file_path).read_text(encoding="utf-8")
             
             # Extract the code block
-            extracted_code = "".join(lines[start_line - 1:end_line])
+            block_start = _line_offset(content, start_line - 1)
+            block_end = _line_offset(content, end_line)
+            extracted_code = content[block_start:block_end]
+            
+            # Derive the signature from the block's free variables; the LLM is
+            # only needed when that can't be done safely.
+            local = _extract_locally(content, start_line, end_line, function_name)
+            if local is not None:
+                return local
             
             # Generate function signature
             system_prompt = """Analyze the code block and create an appropriate function signature with parameters."""
@@ -131,11 +666,11 @@ Return the function definition with proper parameters."""
             
             # Replace code block with function call
             function_call = f"{function_name}()"
-            new_lines = lines[:start_line - 1] + [function_call + "\n"] + lines[end_line:]
+            refactored = content[:block_start] + function_call + "\n" + content[block_end:]
             
             return {
-                "original_file": "".join(lines),
-                "refactored_file": "".join(new_lines),
+                "original_file": content,
+                "refactored_file": refactored,
                 "extracted_function": function_def,
             }
         except Exception as e:
@@ -144,8 +679,11 @@ Return the function definition with proper parameters."""
     def migrate_pattern(self, file_path: Path, old_pattern: str, new_pattern: str) -> str:
         """Migrate code from one pattern to another."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = Path(file_path).read_text(encoding="utf-8")
+            
+            # A code-literal pattern that doesn't occur leaves the file unchanged
+            if _is_code_literal(old_pattern) and old_pattern not in content:
+                return content
             
             system_prompt = f"""Migrate code from the old pattern to the new pattern while maintaining functionality.
 
@@ -160,10 +698,7 @@ Apply the migration pattern transformation."""
             
             migrated = self.llm_client.generate(user_prompt, system_prompt=system_prompt)
             
-            if "```python" in migrated:
-                migrated = migrated.split("```python")[1].split("```")[0].strip()
-            elif "```" in migrated:
-                migrated = migrated.split("```")[1].split("```")[0].strip()
+            migrated = strip_code_fence(migrated)
             
             return migrated
         except Exception as e:
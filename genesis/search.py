@@ -1,12 +1,199 @@
 """Code search and exploration tools."""
 
+import ast
+import os
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterator, List, Dict, Any, Optional, Set, Tuple
 from collections import defaultdict
+from functools import lru_cache, partial
 
 from genesis.vector_db import VectorDatabase
 from genesis.config import Config
+from genesis.utils import line_offsets, read_json, write_json
+
+
+# Anchors, lookarounds and possessive/atomic matching behave differently at a
+# line's trailing newline than mid-file; a whole-file pre-check could miss line
+# matches that depend on them
+_LINE_SENSITIVE = ("$", "\\A", "\\Z", "\\B", "(?<", "(?!", "(?>", "*+", "++", "?+", "}+")
+
+
+@lru_cache(maxsize=1024)
+def _compile(pattern: str, flags: int) -> "re.Pattern[str]":
+    """Compile a search pattern once per process."""
+    return re.compile(pattern, flags)
+
+
+def _candidate_lines(
+    content: str, file_pattern: "re.Pattern[str]"
+) -> Iterator[Tuple[int, str, Optional["re.Match[str]"]]]:
+    """Yield (line number, line, match) for each line a whole-file search lands on.
+    
+    Each search resumes at the start of the next line, so lines before the
+    next hit are skipped in C instead of being visited one by one. The match
+    is also the line's own first match when it ends before the line's
+    newline (it never looked past the line); otherwise it is None and the
+    line must be searched on its own.
+    """
+    pos = 0
+    line_num = 1
+    end_of_text = len(content)
+    while pos < end_of_text:
+        match = file_pattern.search(content, pos)
+        if match is None:
+            return
+        start = content.rfind("\n", pos, match.start()) + 1
+        if start:
+            # Skip over the lines between the previous hit and this one
+            line_num += content.count("\n", pos, start)
+        else:
+            start = pos
+        end = content.find("\n", match.start()) + 1 or end_of_text
+        if match.end() < end or end == end_of_text:
+            yield line_num, content[start:end], match
+        else:
+            yield line_num, content[start:end], None
+        pos = end
+        line_num += 1
+
+
+def _grep_file(pattern: str, file_path: Path) -> List[Dict[str, Any]]:
+    """Return a file's lines matching pattern; module-level so worker processes can run it."""
+    compiled_pattern = _compile(pattern, re.IGNORECASE)
+    matches = []
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            lines = ((line_num, line, None) for line_num, line in enumerate(f, 1))
+            if not any(token in pattern for token in _LINE_SENSITIVE):
+                # Let a whole-text search find the lines worth checking; most
+                # files are rejected without any Python-level loop over lines
+                try:
+                    content = f.read()
+                except UnicodeDecodeError:
+                    f.seek(0)
+                else:
+                    lines = _candidate_lines(content, _compile(pattern, re.IGNORECASE | re.MULTILINE))
+            
+            for line_num, line, match in lines:
+                if match is None:
+                    match = compiled_pattern.search(line)
+                if match:
+                    matches.append({
+                        "file": str(file_path),
+                        "line": line_num,
+                        "content": line.strip(),
+                        "match": match.group(),
+                    })
+    except Exception:
+        # Unreadable files are skipped, but matches found before the error are kept
+        pass
+    return matches
+
+
+def _context_at(content: str, offsets: List[int], line_num: int, context_lines: int = 3) -> str:
+    """Slice the lines around a 1-based line out of content using its line offsets."""
+    start = max(0, line_num - context_lines - 1)
+    end = min(len(offsets) - 1, line_num + context_lines)
+    if start >= end:
+        return ""
+    return content[offsets[start]:offsets[end] - 1]
+
+
+def _index_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    """Parse a file once and index its functions, classes, imports and names."""
+    try:
+        content = file_path.read_text(encoding="utf-8")
+        tree = ast.parse(content)
+    except Exception:
+        return None
+    
+    functions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    classes: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    imports: List[Dict[str, Any]] = []
+    names: Dict[str, List[int]] = defaultdict(list)
+    
+    # Records are kept in ast.walk order, the order the per-query walks used
+    for node in ast.walk(tree):
+        node_type = node.__class__
+        if node_type is ast.Name:
+            names[node.id].append(node.lineno)
+        elif node_type is ast.FunctionDef:
+            functions[node.name].append({
+                "line": node.lineno,
+                "name": node.name,
+                "args": [arg.arg for arg in node.args.args],
+                "docstring": ast.get_docstring(node),
+            })
+        elif node_type is ast.ClassDef:
+            classes[node.name].append({
+                "line": node.lineno,
+                "name": node.name,
+                "bases": [ast.unparse(b) for b in node.bases],
+                "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
+                "docstring": ast.get_docstring(node),
+            })
+        elif node_type is ast.Import:
+            for alias in node.names:
+                imports.append({"line": node.lineno, "import": alias.name, "type": "import"})
+        elif node_type is ast.ImportFrom:
+            if node.module:
+                imports.append({"line": node.lineno, "import": node.module, "type": "from_import"})
+    
+    return {
+        "content": content,
+        "line_offsets": line_offsets(content.split("\n")),
+        "functions": dict(functions),
+        "classes": dict(classes),
+        "imports": imports,
+        "names": dict(names),
+    }
+
+
+# Per-file index sections that the inverted symbol index covers
+_INDEXED_KINDS = ("functions", "classes", "imports", "names")
+
+
+def _indexed_names(index: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the names a file's symbol index holds for each indexed kind."""
+    return {
+        "functions": index["functions"].keys(),
+        "classes": index["classes"].keys(),
+        "imports": {record["import"] for record in index["imports"]},
+        "names": index["names"].keys(),
+    }
+
+
+def _directory_mtimes(directories: List[str]) -> List[Optional[int]]:
+    """Return each directory's mtime_ns, or None where it can't be read."""
+    mtimes = []
+    for directory in directories:
+        try:
+            mtimes.append(os.stat(directory).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return mtimes
+
+
+def _valid_cache_entry(entry: Any) -> bool:
+    """Check that a cached [key, index] entry has the shape _index_file produces."""
+    if not (isinstance(entry, list) and len(entry) == 2):
+        return False
+    key, index = entry
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(part, int) for part in key)):
+        return False
+    if index is None:
+        return True
+    return (
+        isinstance(index, dict)
+        and isinstance(index.get("content"), str)
+        and isinstance(index.get("line_offsets"), list)
+        and isinstance(index.get("functions"), dict)
+        and isinstance(index.get("classes"), dict)
+        and isinstance(index.get("imports"), list)
+        and all(isinstance(record, dict) and isinstance(record.get("import"), str) for record in index["imports"])
+        and isinstance(index.get("names"), dict)
+    )
 
 
 class CodeSearcher:
@@ -16,6 +203,16 @@ class CodeSearcher:
         """Initialize code searcher."""
         self.vector_db = vector_db
         self.config = config
+        # file -> ((mtime_ns, size), symbol index or None if unparseable),
+        # loaded from disk on first use so later runs skip unchanged files
+        self._ast_cache: Dict[Path, Tuple[Tuple[int, int], Optional[Dict[str, Any]]]] = {}
+        self._ast_cache_loaded = False
+        # Inverted index over _ast_cache: kind -> name -> files defining,
+        # importing or using it, so a lookup only visits files that hit
+        self._symbol_files: Dict[str, Dict[str, Set[Path]]] = {kind: {} for kind in _INDEXED_KINDS}
+        # repo root -> (ignore spec, directories walked, their mtime_ns, Python files)
+        self._file_lists: Dict[Path, Tuple[Any, List[str], List[Optional[int]], List[Path]]] = {}
+        self.index_cache_file = Path(config.get("vector_db.persist_directory", "./.genesis_index")) / "search_index.json"
 
     def semantic_search(self, query: str, n_results: int = 10) -> List[Dict[str, Any]]:
         """Perform semantic search using vector database."""
@@ -24,201 +221,252 @@ class CodeSearcher:
 
     def grep_search(self, pattern: str, repo_path: Path, ignore_patterns: List[str] = None) -> List[Dict[str, Any]]:
         """Search for regex pattern in codebase."""
-        from genesis.utils import is_python_file, should_ignore_file
+        from genesis.utils import parallel_map
         
-        if ignore_patterns is None:
-            ignore_patterns = self.config.get("repository.ignore_patterns", [])
+        python_files = self._list_files(repo_path, ignore_patterns)
         
+        _compile(pattern, re.IGNORECASE)  # report an invalid pattern before any worker starts
         matches = []
-        compiled_pattern = re.compile(pattern, re.IGNORECASE)
-        
-        python_files = [f for f in repo_path.rglob("*.py") 
-                       if is_python_file(f) and not should_ignore_file(f, ignore_patterns)]
-        
-        for file_path in python_files:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    for line_num, line in enumerate(f, 1):
-                        if compiled_pattern.search(line):
-                            matches.append({
-                                "file": str(file_path),
-                                "line": line_num,
-                                "content": line.strip(),
-                                "match": compiled_pattern.search(line).group(),
-                            })
-            except Exception:
-                continue
+        for file_matches in parallel_map(partial(_grep_file, pattern), python_files):
+            matches.extend(file_matches)
         
         return matches
 
     def find_function(self, function_name: str, repo_path: Path, ignore_patterns: List[str] = None) -> List[Dict[str, Any]]:
         """Find function definitions by name."""
-        import ast
-        from genesis.utils import is_python_file, should_ignore_file
-        
-        if ignore_patterns is None:
-            ignore_patterns = self.config.get("repository.ignore_patterns", [])
-        
         results = []
-        python_files = [f for f in repo_path.rglob("*.py") 
-                       if is_python_file(f) and not should_ignore_file(f, ignore_patterns)]
-        
-        for file_path in python_files:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef) and node.name == function_name:
-                        results.append({
-                            "file": str(file_path),
-                            "line": node.lineno,
-                            "name": node.name,
-                            "args": [arg.arg for arg in node.args.args],
-                            "docstring": ast.get_docstring(node),
-                        })
-            except Exception:
-                continue
+        for file_path, index in self._iter_indexes(repo_path, ignore_patterns, "functions", function_name):
+            for record in index["functions"].get(function_name, ()):
+                results.append({"file": str(file_path), **record})
         
         return results
 
     def find_class(self, class_name: str, repo_path: Path, ignore_patterns: List[str] = None) -> List[Dict[str, Any]]:
         """Find class definitions by name."""
-        import ast
-        from genesis.utils import is_python_file, should_ignore_file
-        
-        if ignore_patterns is None:
-            ignore_patterns = self.config.get("repository.ignore_patterns", [])
-        
         results = []
-        python_files = [f for f in repo_path.rglob("*.py") 
-                       if is_python_file(f) and not should_ignore_file(f, ignore_patterns)]
-        
-        for file_path in python_files:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ClassDef) and node.name == class_name:
-                        methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                        results.append({
-                            "file": str(file_path),
-                            "line": node.lineno,
-                            "name": node.name,
-                            "bases": [ast.unparse(b) if hasattr(ast, "unparse") else str(b) for b in node.bases],
-                            "methods": methods,
-                            "docstring": ast.get_docstring(node),
-                        })
-            except Exception:
-                continue
+        for file_path, index in self._iter_indexes(repo_path, ignore_patterns, "classes", class_name):
+            for record in index["classes"].get(class_name, ()):
+                results.append({"file": str(file_path), **record})
         
         return results
 
     def find_imports(self, module_name: str, repo_path: Path, ignore_patterns: List[str] = None) -> List[Dict[str, Any]]:
         """Find all files that import a specific module."""
-        import ast
-        from genesis.utils import is_python_file, should_ignore_file
-        
-        if ignore_patterns is None:
-            ignore_patterns = self.config.get("repository.ignore_patterns", [])
-        
         results = []
-        python_files = [f for f in repo_path.rglob("*.py") 
-                       if is_python_file(f) and not should_ignore_file(f, ignore_patterns)]
-        
-        for file_path in python_files:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            if alias.name.startswith(module_name):
-                                results.append({
-                                    "file": str(file_path),
-                                    "line": node.lineno,
-                                    "import": alias.name,
-                                    "type": "import",
-                                })
-                    elif isinstance(node, ast.ImportFrom):
-                        if node.module and node.module.startswith(module_name):
-                            results.append({
-                                "file": str(file_path),
-                                "line": node.lineno,
-                                "import": node.module,
-                                "type": "from_import",
-                            })
-            except Exception:
-                continue
+        # Dotted names may be spaced out (`import a . b`), so only the first
+        # component is sure to appear verbatim
+        needle = module_name.split(".", 1)[0]
+        for file_path, index in self._iter_indexes(repo_path, ignore_patterns, "imports", module_name, needle):
+            for record in index["imports"]:
+                if record["import"].startswith(module_name):
+                    results.append({"file": str(file_path), **record})
         
         return results
 
     def find_usage(self, symbol_name: str, repo_path: Path, ignore_patterns: List[str] = None) -> List[Dict[str, Any]]:
         """Find all usages of a symbol (function, class, variable)."""
-        import ast
-        from genesis.utils import is_python_file, should_ignore_file
+        results = []
+        for file_path, index in self._iter_indexes(repo_path, ignore_patterns, "names", symbol_name):
+            usages = index["names"][symbol_name]
+            content = index["content"]
+            offsets = index.get("line_offsets") or line_offsets(content.split("\n"))
+            for line in usages:
+                results.append({
+                    "file": str(file_path),
+                    "line": line,
+                    "symbol": symbol_name,
+                    "context": _context_at(content, offsets, line),
+                })
+        
+        return results
+
+    def _list_files(self, repo_path: Path, ignore_patterns: Optional[List[str]]) -> List[Path]:
+        """Return the non-ignored Python files under repo_path.
+        
+        The list is reused across searches while the ignore patterns and the
+        mtimes of every directory walked are unchanged, so files added or
+        removed anywhere in the tree are picked up by the next search.
+        """
+        from genesis.utils import compile_ignore_spec, iter_python_files
         
         if ignore_patterns is None:
-            ignore_patterns = self.config.get("repository.ignore_patterns", [])
+            ignore_patterns = self.config.get_ignore_spec()
+        spec = compile_ignore_spec(ignore_patterns)
         
-        results = []
-        python_files = [f for f in repo_path.rglob("*.py") 
-                       if is_python_file(f) and not should_ignore_file(f, ignore_patterns)]
+        cached = self._file_lists.get(repo_path)
+        if cached is not None and cached[0] is spec and _directory_mtimes(cached[1]) == cached[2]:
+            return cached[3]
         
+        walked: List[str] = []
+        python_files = list(iter_python_files(repo_path, spec, walked))
+        self._file_lists[repo_path] = (spec, walked, _directory_mtimes(walked), python_files)
+        return python_files
+
+    def _iter_indexes(
+        self,
+        repo_path: Path,
+        ignore_patterns: Optional[List[str]],
+        kind: str,
+        name: str,
+        needle: Optional[str] = None,
+    ) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        """Yield (file, symbol index) for the files whose index has name under kind.
+        
+        Imports match by prefix, other kinds exactly. Files come in walk order.
+        """
+        positions = self._refresh_indexes(repo_path, ignore_patterns, name if needle is None else needle)
+        
+        symbol_files = self._symbol_files[kind]
+        if kind == "imports":
+            hits = set()
+            for imported, files in symbol_files.items():
+                if imported.startswith(name):
+                    hits.update(files)
+        else:
+            hits = symbol_files.get(name, ())
+        
+        for file_path in sorted((f for f in hits if f in positions), key=positions.__getitem__):
+            yield file_path, self._ast_cache[file_path][1]
+
+    def _refresh_indexes(
+        self, repo_path: Path, ignore_patterns: Optional[List[str]], needle: Optional[str] = None
+    ) -> Dict[Path, int]:
+        """Index new and changed files; return the walk position of each file with a current index.
+        
+        With a needle, files that are not indexed yet and don't contain it
+        are skipped without being parsed.
+        """
+        from genesis.utils import parallel_map
+        
+        python_files = self._list_files(repo_path, ignore_patterns)
+        
+        keys = {}
         for file_path in python_files:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Name) and node.id == symbol_name:
-                        results.append({
-                            "file": str(file_path),
-                            "line": node.lineno,
-                            "symbol": symbol_name,
-                            "context": self._get_context(content, node.lineno),
-                        })
-            except Exception:
+                stat = file_path.stat()
+            except OSError:
                 continue
+            keys[file_path] = (stat.st_mtime_ns, stat.st_size)
         
-        return results
+        if not self._ast_cache_loaded:
+            self._load_index_cache()
+        
+        # Parse new and changed files in worker processes
+        stale = [f for f, key in keys.items() if self._ast_cache.get(f, (None,))[0] != key]
+        if needle:
+            encoded = needle.encode("utf-8")
+            candidates = []
+            for file_path in stale:
+                try:
+                    if encoded in file_path.read_bytes():
+                        candidates.append(file_path)
+                except OSError:
+                    continue
+            stale = candidates
+        for file_path, index in zip(stale, parallel_map(_index_file, stale)):
+            self._store_index(file_path, keys[file_path], index)
+        if stale:
+            self._save_index_cache()
+        
+        # Files skipped by the needle have no current entry
+        positions = {}
+        for position, (file_path, key) in enumerate(keys.items()):
+            cached = self._ast_cache.get(file_path)
+            if cached is not None and cached[0] == key and cached[1] is not None:
+                positions[file_path] = position
+        return positions
+
+    def _store_index(self, file_path: Path, key: Tuple[int, int], index: Optional[Dict[str, Any]]) -> None:
+        """Cache a file's symbol index, replacing its entries in the inverted index."""
+        previous = self._ast_cache.get(file_path)
+        if previous is not None and previous[1] is not None:
+            for kind, names in _indexed_names(previous[1]).items():
+                symbol_files = self._symbol_files[kind]
+                for name in names:
+                    files = symbol_files.get(name)
+                    if files is not None:
+                        files.discard(file_path)
+                        if not files:
+                            del symbol_files[name]
+        
+        self._ast_cache[file_path] = (key, index)
+        if index is not None:
+            for kind, names in _indexed_names(index).items():
+                symbol_files = self._symbol_files[kind]
+                for name in names:
+                    symbol_files.setdefault(name, set()).add(file_path)
+
+    def _load_index_cache(self) -> None:
+        """Load symbol indexes saved by an earlier run, if any.
+        
+        The cache is plain JSON and each entry is checked before use, since
+        the index directory may come from the repository being searched.
+        """
+        self._ast_cache_loaded = True
+        try:
+            cached = read_json(self.index_cache_file)
+        except Exception:
+            return
+        if not isinstance(cached, dict):
+            return
+        for file_name, entry in cached.items():
+            if not _valid_cache_entry(entry):
+                continue
+            file_path = Path(file_name)
+            if file_path not in self._ast_cache:
+                key, index = entry
+                self._store_index(file_path, tuple(key), index)
 
-    def _get_context(self, content: str, line_num: int, context_lines: int = 3) -> str:
-        """Get context around a line."""
-        lines = content.split("\n")
-        start = max(0, line_num - context_lines - 1)
-        end = min(len(lines), line_num + context_lines)
-        return "\n".join(lines[start:end])
+    def _save_index_cache(self) -> None:
+        """Write the symbol indexes to disk; a failed write only costs a re-parse next run."""
+        try:
+            self.index_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_cache_file.with_suffix(".tmp")
+            write_json(tmp_file, {
+                str(file_path): [list(key), index] for file_path, (key, index) in self._ast_cache.items()
+            })
+            tmp_file.replace(self.index_cache_file)
+        except Exception:
+            pass
 
     def find_similar_code(self, file_path: Path, repo_path: Path, threshold: float = 0.7) -> List[Dict[str, Any]]:
         """Find similar code blocks using vector similarity."""
+        return self.find_similar_code_many([file_path], repo_path, threshold)[Path(file_path)]
+
+    def find_similar_code_many(
+        self, file_paths: List[Path], repo_path: Path, threshold: float = 0.7
+    ) -> Dict[Path, List[Dict[str, Any]]]:
+        """Find code similar to each of several files, with one batched vector search."""
+        similar_by_file: Dict[Path, List[Dict[str, Any]]] = {}
+        contents: Dict[Path, str] = {}
+        for file_path in map(Path, file_paths):
+            similar_by_file[file_path] = []
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    contents[file_path] = f.read()
+            except Exception:
+                continue
+        
+        if not contents:
+            return similar_by_file
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
             # Search for similar code
-            results = self.vector_db.search(content, n_results=10)
-            
-            similar = []
-            for result in results:
-                if result.get("distance", 1.0) < (1 - threshold):
-                    similar.append({
-                        "file": result.get("metadata", {}).get("file_path", "unknown"),
-                        "similarity": 1 - result.get("distance", 1.0),
-                        "content": result.get("document", "")[:200],
-                    })
-            
-            return similar
+            batch_results = self.vector_db.search_batch(list(contents.values()), n_results=10)
         except Exception:
-            return []
-
+            return similar_by_file
+        
+        for file_path, results in zip(contents, batch_results):
+            try:
+                similar = []
+                for result in results:
+                    if result.get("distance", 1.0) < (1 - threshold):
+                        similar.append({
+                            "file": result.get("metadata", {}).get("file_path", "unknown"),
+                            "similarity": 1 - result.get("distance", 1.0),
+                            "content": result.get("document", "")[:200],
+                        })
+                similar_by_file[file_path] = similar
+            except Exception:
+                continue
+        
+        return similar_by_file
@@ -2,9 +2,87 @@
 
 import ast
 import re
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Set
-from collections import defaultdict
+from typing import List, Dict, Any, Optional, Set, Tuple
+from collections import Counter
+
+from genesis.utils import line_offsets
+
+# Optional: RE2 matches in linear time without backtracking; the patterns
+# here use only syntax it shares with `re`
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+_LEADING_WORDS_RE = re.compile(r"\(((?:\w+\|)*\w+)\)")
+_LEADING_LITERAL_RE = re.compile(r"(?:\w|\\\.)+")
+
+
+def _required_literals(pattern: str) -> Tuple[str, ...]:
+    """Return lowercase literals one of which every match of pattern starts with.
+    
+    Understands a leading word, dotted name (``os\\.system``) or group of
+    alternative words; an empty tuple means the pattern must always run.
+    """
+    words = _LEADING_WORDS_RE.match(pattern)
+    if words:
+        return tuple(word.lower() for word in words.group(1).split("|"))
+    literal = _LEADING_LITERAL_RE.match(pattern)
+    if literal:
+        return (literal.group(0).replace("\\.", ".").lower(),)
+    return ()
+
+
+@lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str):
+    """Compile a case-insensitive vulnerability pattern, with RE2 when available."""
+    if re2 is not None:
+        try:
+            return re2.compile("(?i)" + pattern)
+        except Exception:
+            # Not expressible in RE2 syntax; fall back to `re`
+            pass
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _line_at(lines: List[str], line_num: int) -> str:
+    """Return the stripped text of a 1-based line, or "" if out of range."""
+    if 0 < line_num <= len(lines):
+        return lines[line_num - 1].strip()
+    return ""
+
+
+_CODE_EXEC_BUILTINS = frozenset({"eval", "exec", "compile"})
+_COMMAND_CALLS = frozenset({
+    ("os", "system"),
+    ("subprocess", "call"),
+    ("subprocess", "Popen"),
+})
+_SECRET_KEYWORDS = ("password", "secret", "api_key", "token")
+_HARDCODED_SECRET_DESCRIPTION = "Hardcoded credentials detected - use environment variables or secure storage"
+
+
+def _is_secret(name: str, value: Optional[ast.AST]) -> bool:
+    """Return True if a secret-looking name is bound to a non-empty string literal."""
+    if type(value) is not ast.Constant or not isinstance(value.value, str) or not value.value:
+        return False
+    name = name.lower()
+    return any(keyword in name for keyword in _SECRET_KEYWORDS)
+
+
+@lru_cache(maxsize=1)
+def _default_scanner() -> "SecurityScanner":
+    """Return a per-process scanner, so patterns are compiled once per worker."""
+    return SecurityScanner()
+
+
+def _scan_file(file_path: Path) -> List[Dict[str, Any]]:
+    """Scan a single file; module-level so worker processes can run it."""
+    return _default_scanner().scan_file(file_path)
 
 
 class SecurityScanner:
@@ -18,21 +96,10 @@ class SecurityScanner:
                 r"execute\s*\(\s*f['\"]",
                 r"query\s*\(\s*['\"].*\+",
             ],
-            "command_injection": [
-                r"os\.system\s*\(",
-                r"subprocess\.call\s*\(",
-                r"subprocess\.Popen\s*\(",
-                r"eval\s*\(",
-                r"exec\s*\(",
-            ],
             "path_traversal": [
                 r"open\s*\(\s*['\"].*\.\./",
                 r"open\s*\(\s*['\"].*\.\.\\\\",
             ],
-            "hardcoded_secrets": [
-                r"(password|api_key|secret|token)\s*=\s*['\"][^'\"]+['\"]",
-                r"(password|api_key|secret|token)\s*:\s*['\"][^'\"]+['\"]",
-            ],
             "insecure_random": [
                 r"random\.random\s*\(",
                 r"random\.randint\s*\(",
@@ -42,6 +109,15 @@ class SecurityScanner:
                 r"hashlib\.sha1\s*\(",
             ],
         }
+        # Command injection, eval/exec and hardcoded secrets are found by
+        # _scan_ast, which doesn't match inside comments or strings
+        # Compiled once, each with the literal text a match must contain; a
+        # pattern only runs on files where one of its literals occurs
+        self._compiled_patterns = [
+            (vuln_type, _compile_pattern(pattern), _required_literals(pattern))
+            for vuln_type, patterns in self.vulnerability_patterns.items()
+            for pattern in patterns
+        ]
 
     def scan_file(self, file_path: Path) -> List[Dict[str, Any]]:
         """Scan a file for security vulnerabilities."""
@@ -51,25 +127,32 @@ class SecurityScanner:
             with open(file_path, "r", encoding="utf-8") as f:
                 content = f.read()
             
+            # Split once; line numbers come from a bisect over line offsets
+            lines = content.split("\n")
+            offsets = None
+            
             # Pattern-based scanning
-            for vuln_type, patterns in self.vulnerability_patterns.items():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        line_num = content[:match.start()].count("\n") + 1
-                        vulnerabilities.append({
-                            "type": vuln_type,
-                            "severity": self._get_severity(vuln_type),
-                            "file": str(file_path),
-                            "line": line_num,
-                            "code": self._get_line(content, line_num),
-                            "description": self._get_description(vuln_type),
-                        })
+            folded = content.casefold()
+            for vuln_type, pattern, literals in self._compiled_patterns:
+                if literals and not any(literal in folded for literal in literals):
+                    continue
+                for match in pattern.finditer(content):
+                    if offsets is None:
+                        offsets = line_offsets(lines)
+                    line_num = bisect_right(offsets, match.start())
+                    vulnerabilities.append({
+                        "type": vuln_type,
+                        "severity": self._get_severity(vuln_type),
+                        "file": str(file_path),
+                        "line": line_num,
+                        "code": _line_at(lines, line_num),
+                        "description": self._get_description(vuln_type),
+                    })
             
             # AST-based scanning
             try:
                 tree = ast.parse(content)
-                ast_vulns = self._scan_ast(tree, file_path, content)
+                ast_vulns = self._scan_ast(tree, file_path, content, lines)
                 vulnerabilities.extend(ast_vulns)
             except SyntaxError:
                 pass
@@ -84,69 +167,95 @@ class SecurityScanner:
         
         return vulnerabilities
 
-    def _scan_ast(self, tree: ast.AST, file_path: Path, content: str) -> List[Dict[str, Any]]:
+    def _scan_ast(
+        self, tree: ast.AST, file_path: Path, content: str, lines: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """Scan AST for security issues."""
+        if lines is None:
+            lines = content.split("\n")
         vulnerabilities = []
         
+        def report(vuln_type: str, node: ast.AST, description: str) -> None:
+            line_num = getattr(node, "lineno", 0)
+            vulnerabilities.append({
+                "type": vuln_type,
+                "severity": "high",
+                "file": str(file_path),
+                "line": line_num,
+                "code": _line_at(lines, line_num),
+                "description": description,
+            })
+        
         for node in ast.walk(tree):
-            # Check for eval/exec usage
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id in ["eval", "exec", "compile"]:
-                        line_num = node.lineno if hasattr(node, "lineno") else 0
-                        vulnerabilities.append({
-                            "type": "code_injection",
-                            "severity": "high",
-                            "file": str(file_path),
-                            "line": line_num,
-                            "code": self._get_line(content, line_num),
-                            "description": f"Use of {node.func.id}() can lead to code injection vulnerabilities",
-                        })
+            node_type = type(node)
+            if node_type is ast.Call:
+                func = node.func
+                # Check for eval/exec usage
+                if type(func) is ast.Name:
+                    if func.id in _CODE_EXEC_BUILTINS:
+                        report(
+                            "code_injection", node,
+                            f"Use of {func.id}() can lead to code injection vulnerabilities",
+                        )
+                # Check for shell and subprocess calls
+                elif type(func) is ast.Attribute and type(func.value) is ast.Name:
+                    if (func.value.id, func.attr) in _COMMAND_CALLS:
+                        report(
+                            "command_injection", node,
+                            self._get_description("command_injection"),
+                        )
+                # Check for credentials passed as keyword arguments
+                for keyword in node.keywords:
+                    if keyword.arg and _is_secret(keyword.arg, keyword.value):
+                        report("hardcoded_secret", keyword.value, _HARDCODED_SECRET_DESCRIPTION)
             
             # Check for hardcoded credentials
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        if any(keyword in target.id.lower() for keyword in ["password", "secret", "api_key", "token"]):
-                            if isinstance(node.value, (ast.Str, ast.Constant)):
-                                line_num = node.lineno if hasattr(node, "lineno") else 0
-                                vulnerabilities.append({
-                                    "type": "hardcoded_secret",
-                                    "severity": "high",
-                                    "file": str(file_path),
-                                    "line": line_num,
-                                    "code": self._get_line(content, line_num),
-                                    "description": "Hardcoded credentials detected - use environment variables or secure storage",
-                                })
+            elif node_type is ast.Assign or node_type is ast.AnnAssign:
+                targets = node.targets if node_type is ast.Assign else [node.target]
+                for target in targets:
+                    if type(target) is ast.Name:
+                        name = target.id
+                    elif type(target) is ast.Attribute:
+                        name = target.attr
+                    else:
+                        continue
+                    if _is_secret(name, node.value):
+                        report("hardcoded_secret", node, _HARDCODED_SECRET_DESCRIPTION)
         
         return vulnerabilities
 
-    def scan_repository(self, repo_path: Path, ignore_patterns: List[str] = None) -> Dict[str, Any]:
-        """Scan entire repository for security vulnerabilities."""
-        from genesis.utils import is_python_file, should_ignore_file
+    def scan_repository(
+        self, repo_path: Path, ignore_patterns: List[str] = None, collect_details: bool = True
+    ) -> Dict[str, Any]:
+        """Scan entire repository for security vulnerabilities.
+        
+        With collect_details=False only the counts are kept and
+        "vulnerabilities" is empty, so large scans don't hold every finding.
+        """
+        from genesis.utils import iter_python_files, parallel_map
         
         if ignore_patterns is None:
             ignore_patterns = []
         
-        python_files = [f for f in repo_path.rglob("*.py") 
-                       if is_python_file(f) and not should_ignore_file(f, ignore_patterns)]
+        python_files = list(iter_python_files(repo_path, ignore_patterns))
         
         all_vulnerabilities = []
-        by_type = defaultdict(list)
-        by_severity = defaultdict(list)
+        by_type = Counter()
+        by_severity = Counter()
         
-        for file_path in python_files:
-            vulns = self.scan_file(file_path)
-            all_vulnerabilities.extend(vulns)
+        # Files are independent and the scan is CPU-bound (regex + parse)
+        for vulns in parallel_map(_scan_file, python_files):
+            if collect_details:
+                all_vulnerabilities.extend(vulns)
             
             for vuln in vulns:
-                by_type[vuln["type"]].append(vuln)
-                by_severity[vuln["severity"]].append(vuln)
+                by_type[vuln["type"]] += 1
+                by_severity[vuln["severity"]] += 1
         
         return {
-            "total_vulnerabilities": len(all_vulnerabilities),
-            "by_type": {k: len(v) for k, v in by_type.items()},
-            "by_severity": {k: len(v) for k, v in by_severity.items()},
+            "total_vulnerabilities": sum(by_type.values()),
+            "by_type": dict(by_type),
+            "by_severity": dict(by_severity),
             "vulnerabilities": all_vulnerabilities,
             "files_scanned": len(python_files),
         }
@@ -169,17 +278,8 @@ class SecurityScanner:
             "sql_injection": "Potential SQL injection vulnerability - use parameterized queries",
             "command_injection": "Potential command injection vulnerability - validate and sanitize input",
             "path_traversal": "Potential path traversal vulnerability - validate file paths",
-            "hardcoded_secrets": "Hardcoded secrets detected - use environment variables",
             "insecure_random": "Insecure random number generation - use secrets module",
             "weak_crypto": "Weak cryptographic hash - use stronger algorithms (SHA-256+)",
             "code_injection": "Code injection risk - avoid eval/exec with user input",
         }
         return descriptions.get(vuln_type, "Security issue detected")
-
-    def _get_line(self, content: str, line_num: int) -> str:
-        """Get line content by line number."""
-        lines = content.split("\n")
-        if 0 < line_num <= len(lines):
-            return lines[line_num - 1].strip()
-        return ""
-
@@ -2,21 +2,38 @@
 
 import ast
 from pathlib import Path
-from typing import Dict, Any, List
-from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter, defaultdict
 from tqdm import tqdm
 
 from genesis.utils import (
-    is_python_file,
-    should_ignore_file,
-    extract_imports,
-    extract_functions_and_classes,
-    analyze_indentation,
-    analyze_naming_conventions,
-    analyze_comments,
+    iter_python_files,
+    analyze_style,
+    parallel_map,
 )
 
 
+def _analyze_file_style(file_path: Path) -> Tuple[Optional[Tuple[Dict[str, Any], ...]], Optional[str]]:
+    """Analyze one file's style, returning (analyze_style result or None if unparseable, error).
+    
+    Module-level so worker processes can run it.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            return None, None
+        
+        # Indentation, naming, comments, imports and structure in
+        # one pass over the text and one walk of the tree
+        return analyze_style(content, tree), None
+    except Exception as e:
+        return None, str(e)
+
+
 class StyleFingerprint:
     """Analyzes and stores codebase style patterns."""
 
@@ -35,7 +52,7 @@ class StyleFingerprint:
     def analyze_repository(self, repo_path: Path) -> Dict[str, Any]:
         """Analyze entire repository to build style fingerprint."""
         repo_path = Path(repo_path).resolve()
-        ignore_patterns = self.config.get("repository.ignore_patterns", [])
+        ignore_patterns = self.config.get_ignore_spec()
         
         python_files = self._collect_python_files(repo_path, ignore_patterns)
         
@@ -50,43 +67,32 @@ class StyleFingerprint:
         import_stats = defaultdict(list)
         structure_stats = {"functions": [], "classes": []}
         
-        for file_path in tqdm(python_files, desc="Analyzing files"):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                try:
-                    tree = ast.parse(content)
-                except SyntaxError:
-                    continue
-                
-                # Analyze indentation
-                indent_info = analyze_indentation(content)
-                indentation_stats.append(indent_info)
-                
-                # Analyze naming
-                naming_info = analyze_naming_conventions(tree)
-                naming_stats.append(naming_info)
-                
-                # Analyze comments
-                comment_info = analyze_comments(content)
-                comment_stats.append(comment_info)
-                
-                # Analyze imports
-                imports = extract_imports(tree)
-                for category, items in imports.items():
-                    import_stats[category].extend(items)
-                
-                # Analyze structure
-                structure = extract_functions_and_classes(tree)
-                structure_stats["functions"].extend(structure["functions"])
-                structure_stats["classes"].extend(structure["classes"])
-                
-                self.fingerprint["files_analyzed"] += 1
-                
-            except Exception as e:
-                print(f"Warning: Could not analyze {file_path}: {e}")
+        # Files are parsed and analyzed in worker processes; only the
+        # aggregation below runs here
+        results = parallel_map(_analyze_file_style, python_files)
+        for file_path, (style, error) in tqdm(
+            zip(python_files, results), total=len(python_files), desc="Analyzing files"
+        ):
+            if error is not None:
+                print(f"Warning: Could not analyze {file_path}: {error}")
+                continue
+            if style is None:
                 continue
+            
+            indent_info, naming_info, comment_info, imports, structure = style
+            indentation_stats.append(indent_info)
+            naming_stats.append(naming_info)
+            comment_stats.append(comment_info)
+            
+            # Analyze imports
+            for category, items in imports.items():
+                import_stats[category].extend(items)
+            
+            # Analyze structure
+            structure_stats["functions"].extend(structure["functions"])
+            structure_stats["classes"].extend(structure["classes"])
+            
+            self.fingerprint["files_analyzed"] += 1
         
         # Aggregate statistics
         self._aggregate_indentation(indentation_stats)
@@ -99,13 +105,8 @@ class StyleFingerprint:
 
     def _collect_python_files(self, repo_path: Path, ignore_patterns: List[str]) -> List[Path]:
         """Collect all Python files in repository."""
-        python_files = []
-        
-        for file_path in repo_path.rglob("*.py"):
-            if not should_ignore_file(file_path, ignore_patterns):
-                python_files.append(file_path)
-        
-        return python_files
+        # One os.scandir walk that prunes ignored directories
+        return list(iter_python_files(repo_path, ignore_patterns))
 
     def _aggregate_indentation(self, stats: List[Dict[str, Any]]) -> None:
         """Aggregate indentation statistics."""
@@ -116,7 +117,7 @@ class StyleFingerprint:
         spaces_count = sum(s.get("spaces_count", 0) for s in stats)
         indent_sizes = [s.get("indent_size", 4) for s in stats]
         
-        most_common_indent = max(set(indent_sizes), key=indent_sizes.count) if indent_sizes else 4
+        most_common_indent = Counter(indent_sizes).most_common(1)[0][0] if indent_sizes else 4
         
         self.fingerprint["indentation"] = {
             "uses_tabs": tabs_count > spaces_count,
@@ -132,8 +133,8 @@ class StyleFingerprint:
         function_patterns = [s.get("function_naming", "snake_case") for s in stats]
         class_patterns = [s.get("class_naming", "PascalCase") for s in stats]
         
-        most_common_function = max(set(function_patterns), key=function_patterns.count) if function_patterns else "snake_case"
-        most_common_class = max(set(class_patterns), key=class_patterns.count) if class_patterns else "PascalCase"
+        most_common_function = Counter(function_patterns).most_common(1)[0][0] if function_patterns else "snake_case"
+        most_common_class = Counter(class_patterns).most_common(1)[0][0] if class_patterns else "PascalCase"
         
         self.fingerprint["naming"] = {
             "functions": most_common_function,
@@ -149,7 +150,7 @@ class StyleFingerprint:
         docstring_styles = [s.get("docstring_style") for s in stats if s.get("docstring_style")]
         avg_comment_freq = sum(s.get("comment_frequency", 0) for s in stats) / len(stats) if stats else 0
         
-        most_common_docstring = max(set(docstring_styles), key=docstring_styles.count) if docstring_styles else "triple_double"
+        most_common_docstring = Counter(docstring_styles).most_common(1)[0][0] if docstring_styles else "triple_double"
         
         self.fingerprint["comments"] = {
             "docstring_style": most_common_docstring,
@@ -168,7 +169,6 @@ class StyleFingerprint:
 
     def _get_common_imports(self, imports: List[str]) -> List[str]:
         """Get most common third-party imports."""
-        from collections import Counter
         base_modules = [imp.split(".")[0] for imp in imports]
         counter = Counter(base_modules)
         return [module for module, _ in counter.most_common(10)]
@@ -1,16 +1,152 @@
 """Utility functions for Code Genesis."""
 
 import ast
+import os
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable, Iterator
 import hashlib
+import json
+
+# Below this many items the cost of starting worker processes outweighs
+# the parallel speedup, so parallel_map() runs in-process instead.
+PARALLEL_MIN_ITEMS = 16
+
+# First markdown code block in an LLM reply: an optional language tag line,
+# then everything up to the closing fence (or the end of an unclosed block).
+_CODE_FENCE_RE = re.compile(r"```(?:[\w+-]*[ \t]*\n)?(.*?)(?:```|\Z)", re.DOTALL)
+
+# JSON string literals (skipped whole, so braces inside them don't count) or a brace
+_JSON_BRACE_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}]', re.DOTALL)
+
+
+# Top-level modules extract_imports() files under "standard"
+_STANDARD_LIBS = frozenset({
+    "os", "sys", "json", "yaml", "pathlib", "typing", "collections",
+    "itertools", "functools", "datetime", "time", "re", "math", "random",
+    "string", "io", "csv", "xml", "html", "urllib", "http", "socket",
+    "threading", "multiprocessing", "asyncio", "logging", "unittest",
+    "doctest", "pdb", "pickle", "sqlite3", "hashlib", "base64", "uuid",
+    "ast", "subprocess", "tempfile",
+})
+
+
+# Node kinds that are, or hold, statements, and the fields in which they
+# hold them (handlers and cases hold except handlers and match cases, which
+# hold statements); see walk_statements()
+_STATEMENT_CONTAINERS = (ast.mod, ast.stmt, ast.excepthandler, ast.match_case)
+_STATEMENT_LIST_FIELDS = frozenset({"body", "orelse", "finalbody", "handlers", "cases"})
 
 
 def get_file_hash(file_path: Path) -> str:
-    """Calculate SHA256 hash of file content."""
+    """Calculate SHA256 hash of file content, reading it in chunks."""
     with open(file_path, "rb") as f:
-        return hashlib.sha256(f.read()).hexdigest()
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+
+def write_json(file_path: Path, data: Any) -> None:
+    """Write data as indented JSON, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # e.g. non-str dict keys, which the json module coerces
+            payload = None
+        if payload is not None:
+            with open(file_path, "wb") as f:
+                f.write(payload)
+            return
+    
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def read_json(file_path: Path) -> Any:
+    """Read a JSON file, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    
+    if orjson is not None:
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
+    
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def loads_json(text: str) -> Any:
+    """Parse a JSON string, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(text)
+    
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(text)
+
+
+def extract_json_object(text: str) -> str:
+    """Return the first balanced ``{...}`` span in text, or the text unchanged."""
+    start = text.find("{")
+    if start == -1:
+        return text
+    
+    depth = 0
+    for match in _JSON_BRACE_RE.finditer(text, start):
+        token = match.group(0)
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:match.end()]
+    return text
+
+
+def parallel_map(func: Callable, items: List[Any]) -> Iterable[Any]:
+    """Map a picklable function over items using a process pool.
+    
+    Results are returned in input order. Small inputs, single-CPU hosts and
+    platforms where worker processes cannot be started fall back to a
+    serial map.
+    """
+    if len(items) < PARALLEL_MIN_ITEMS:
+        return map(func, items)
+    
+    workers = os.cpu_count() or 1
+    if workers == 1:
+        return map(func, items)
+    chunksize = max(1, len(items) // (workers * 2))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items, chunksize=chunksize))
+    except (OSError, NotImplementedError):
+        return map(func, items)
+
+
+def line_offsets(lines: List[str]) -> List[int]:
+    """Return the start offset of each of the "\n"-split lines, plus the end offset + 1.
+    
+    Line n (1-based) of the text is ``text[offsets[n - 1]:offsets[n] - 1]``,
+    and ``bisect_right(offsets, pos)`` is the line number of offset pos.
+    """
+    return list(accumulate((len(line) + 1 for line in lines), initial=0))
 
 
 def is_python_file(file_path: Path) -> bool:
@@ -18,39 +154,149 @@ def is_python_file(file_path: Path) -> bool:
     return file_path.suffix == ".py"
 
 
-def should_ignore_file(file_path: Path, ignore_patterns: List[str]) -> bool:
-    """Check if file should be ignored based on patterns."""
+@lru_cache(maxsize=32)
+def _compile_ignore_spec(ignore_patterns: Tuple[str, ...]):
+    """Compile gitwildmatch ignore patterns into a reusable PathSpec."""
     from pathspec import PathSpec
     
-    spec = PathSpec.from_lines("gitwildmatch", ignore_patterns)
-    return spec.match_file(str(file_path))
+    return PathSpec.from_lines("gitwildmatch", ignore_patterns)
+
+
+def compile_ignore_spec(ignore_patterns):
+    """Return the compiled PathSpec for a list of ignore patterns, built once per distinct list.
+    
+    An already compiled PathSpec (e.g. from ``Config.get_ignore_spec()``) is
+    returned as-is, so hot loops can skip re-hashing the pattern list.
+    """
+    from pathspec import PathSpec
+    
+    if isinstance(ignore_patterns, PathSpec):
+        return ignore_patterns
+    return _compile_ignore_spec(tuple(ignore_patterns))
+
+
+_NAMED_GROUP_RE = re.compile(r"(?<!\\)\(\?P<\w+>")
+
+
+@lru_cache(maxsize=32)
+def _compile_ignore_union(regexes: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Join pattern regexes into one alternation; named groups would clash, so they are dropped."""
+    return re.compile("|".join(f"(?:{_NAMED_GROUP_RE.sub('(?:', regex)})" for regex in regexes))
+
+
+def ignore_matcher(ignore_patterns) -> Callable[[str], bool]:
+    """Return a function telling whether a path is ignored, matching all patterns in one regex.
+    
+    A file is ignored by the last pattern that matches it, so when a negated
+    pattern is present the PathSpec's own ordered check is used instead.
+    """
+    from pathspec.util import normalize_file
+    
+    spec = compile_ignore_spec(ignore_patterns)
+    patterns = [pattern for pattern in spec.patterns if pattern.include is not None]
+    if not patterns:
+        return lambda path: False
+    for pattern in patterns:
+        regex = getattr(pattern, "regex", None)
+        if not pattern.include or not isinstance(regex, re.Pattern) or regex.flags != re.UNICODE:
+            return spec.match_file
+    union = _compile_ignore_union(tuple(pattern.regex.pattern for pattern in patterns))
+    return lambda path: union.match(normalize_file(path)) is not None
+
+
+def should_ignore_file(file_path: Path, ignore_patterns: List[str]) -> bool:
+    """Check if file should be ignored based on patterns (a list or a compiled PathSpec)."""
+    return ignore_matcher(ignore_patterns)(str(file_path))
+
+
+def iter_python_files(
+    repo_path: Path, ignore_patterns: List[str], walked: Optional[List[str]] = None
+) -> Iterator[Path]:
+    """Yield the non-ignored Python files under repo_path in a single walk.
+    
+    The walk uses os.scandir directly, so file types come from the directory
+    listing rather than a stat per entry. Ignored directories are pruned
+    instead of being descended into; pruning is skipped when a negated
+    pattern could re-include something below them. Files come out in the
+    same top-down order os.walk would give. Each directory scanned is
+    appended to walked, if given.
+    """
+    spec = compile_ignore_spec(ignore_patterns)
+    can_prune = not any(pattern.include is False for pattern in spec.patterns)
+    is_ignored = ignore_matcher(spec)
+    
+    stack = [os.fspath(repo_path)]
+    while stack:
+        directory = stack.pop()
+        if walked is not None:
+            walked.append(directory)
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Like os.walk, symlinked directories are not followed
+                        if entry.is_symlink():
+                            continue
+                        if can_prune and is_ignored(entry.path + "/"):
+                            continue
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(".py") and not is_ignored(entry.path):
+                        yield Path(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
+@lru_cache(maxsize=None)
+def _statement_fields(node_type: type) -> Tuple[str, ...]:
+    """Return the fields of a node type that can hold statements, in _fields order."""
+    if not issubclass(node_type, _STATEMENT_CONTAINERS):
+        return ()
+    return tuple(field for field in node_type._fields if field in _STATEMENT_LIST_FIELDS)
+
+
+def walk_statements(tree: ast.AST) -> List[ast.AST]:
+    """Return tree and the statements in it in ast.walk() order, skipping expressions.
+    
+    Definitions and imports are statements, and statements never occur
+    inside expressions, so collecting them needs only a fraction of the
+    nodes ast.walk() would visit. Only the statement list fields are read,
+    and the list is built in place rather than yielded node by node.
+    """
+    nodes = [tree]
+    # Iterating a list while appending to it visits the appended nodes too
+    for node in nodes:
+        for field in _statement_fields(node.__class__):
+            children = getattr(node, field)
+            # e.g. Expression.body is a single expression
+            if children.__class__ is list:
+                nodes.extend(children)
+    return nodes
 
 
 def extract_imports(ast_tree: ast.AST) -> Dict[str, List[str]]:
     """Extract import statements from AST."""
     imports = {"standard": [], "third_party": [], "local": []}
     
-    standard_libs = {
-        "os", "sys", "json", "yaml", "pathlib", "typing", "collections",
-        "itertools", "functools", "datetime", "time", "re", "math", "random",
-        "string", "io", "csv", "xml", "html", "urllib", "http", "socket",
-        "threading", "multiprocessing", "asyncio", "logging", "unittest",
-        "doctest", "pdb", "pickle", "sqlite3", "hashlib", "base64", "uuid",
-        "ast", "subprocess", "tempfile", "hashlib", "pathlib",
-    }
-    
-    for node in ast.walk(ast_tree):
-        if isinstance(node, ast.Import):
+    # Exact type checks; the parser never produces subclasses
+    for node in walk_statements(ast_tree):
+        node_type = node.__class__
+        if node_type is ast.Import:
             for alias in node.names:
                 module = alias.name.split(".")[0]
-                if module in standard_libs:
+                if module in _STANDARD_LIBS:
                     imports["standard"].append(alias.name)
                 else:
                     imports["third_party"].append(alias.name)
-        elif isinstance(node, ast.ImportFrom):
+        elif node_type is ast.ImportFrom:
             if node.module:
                 module = node.module.split(".")[0]
-                if module in standard_libs:
+                if module in _STANDARD_LIBS:
                     imports["standard"].append(node.module)
                 elif not node.module.startswith("."):
                     imports["third_party"].append(node.module)
@@ -60,34 +306,51 @@ def extract_imports(ast_tree: ast.AST) -> Dict[str, List[str]]:
     return imports
 
 
+def _unparse(node: ast.AST) -> str:
+    """Unparse AST node, with fallback for older Python versions."""
+    if hasattr(ast, "unparse"):
+        return ast.unparse(node)
+    try:
+        import astunparse
+        return astunparse.unparse(node)
+    except ImportError:
+        return str(node)
+
+
+def _expr_text(node: ast.AST) -> str:
+    """Return the source text of an expression, without unparsing plain or dotted names."""
+    if node.__class__ is ast.Name:
+        return node.id
+    if node.__class__ is ast.Attribute:
+        parts = [node.attr]
+        value = node.value
+        while value.__class__ is ast.Attribute:
+            parts.append(value.attr)
+            value = value.value
+        if value.__class__ is ast.Name:
+            parts.append(value.id)
+            return ".".join(reversed(parts))
+    return _unparse(node)
+
+
 def extract_functions_and_classes(ast_tree: ast.AST) -> Dict[str, List[Dict[str, Any]]]:
     """Extract functions and classes from AST."""
     result = {"functions": [], "classes": []}
     
-    # Helper to unparse AST nodes
-    def unparse_node(node):
-        """Unparse AST node, with fallback for older Python versions."""
-        if hasattr(ast, "unparse"):
-            return ast.unparse(node)
-        try:
-            import astunparse
-            return astunparse.unparse(node)
-        except ImportError:
-            return str(node)
-    
-    for node in ast.walk(ast_tree):
-        if isinstance(node, ast.FunctionDef):
+    for node in walk_statements(ast_tree):
+        node_type = node.__class__
+        if node_type is ast.FunctionDef:
             result["functions"].append({
                 "name": node.name,
                 "args": [arg.arg for arg in node.args.args],
-                "decorators": [unparse_node(d) for d in node.decorator_list],
+                "decorators": [_expr_text(d) for d in node.decorator_list],
                 "docstring": ast.get_docstring(node),
             })
-        elif isinstance(node, ast.ClassDef):
+        elif node_type is ast.ClassDef:
             methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
             result["classes"].append({
                 "name": node.name,
-                "bases": [unparse_node(b) for b in node.bases],
+                "bases": [_expr_text(b) for b in node.bases],
                 "methods": methods,
                 "docstring": ast.get_docstring(node),
             })
@@ -95,66 +358,173 @@ def extract_functions_and_classes(ast_tree: ast.AST) -> Dict[str, List[Dict[str,
     return result
 
 
-def analyze_indentation(content: str) -> Dict[str, Any]:
-    """Analyze indentation style."""
+def parse_file_structure(
+    file_path: Path,
+) -> Tuple[Optional[str], Optional[Dict[str, List[Dict[str, Any]]]], Optional[str]]:
+    """Read and parse one file, returning (content, structure or None if unparseable, error).
+    
+    The structure is extract_functions_and_classes() of the file; this is
+    module-level so worker processes can run it.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            return None, None, None
+        
+        return content, extract_functions_and_classes(tree), None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def _scan_lines(content: str) -> Tuple[int, int, List[int], int, int]:
+    """Return (lines, tab-indented lines, space indent widths, comment lines, triple-quote lines)."""
     lines = content.split("\n")
-    spaces = 0
     tabs = 0
     indent_sizes = []
+    inline_comments = 0
+    block_comments = 0
     
     for line in lines:
-        if line.strip():
-            indent = len(line) - len(line.lstrip())
-            if indent > 0:
-                if line[0] == "\t":
+        # One lstrip per line gives both blankness and the indent width
+        body = line.lstrip()
+        if not body:
+            continue
+        if len(body) != len(line):
+            if line[0] == "\t":
+                tabs += 1
+            else:
+                indent_sizes.append(len(line) - len(body))
+        if body[0] == "#":
+            inline_comments += 1
+        elif '"""' in line or "'''" in line:
+            block_comments += 1
+    
+    return len(lines), tabs, indent_sizes, inline_comments, block_comments
+
+
+def _scan_ascii_bytes(buf, indent_sizes):
+    """_scan_lines over the bytes of ASCII text, filling indent_sizes with the indent widths.
+    
+    Plain Python so importing this module doesn't load Numba; see _ascii_line_scanner.
+    """
+    n = buf.shape[0]
+    count = 0
+    tabs = 0
+    inline_comments = 0
+    block_comments = 0
+    
+    start = 0
+    while start <= n:
+        end = start
+        while end < n and buf[end] != 10:
+            end += 1
+        # ASCII characters for which str.isspace() is true
+        body = start
+        while body < end and (buf[body] == 32 or 9 <= buf[body] <= 13 or 28 <= buf[body] <= 31):
+            body += 1
+        if body < end:
+            if body > start:
+                if buf[start] == 9:
                     tabs += 1
                 else:
-                    spaces += 1
-                    indent_sizes.append(indent)
+                    indent_sizes[count] = body - start
+                    count += 1
+            if buf[body] == 35:
+                inline_comments += 1
+            else:
+                for k in range(start, end - 2):
+                    c = buf[k]
+                    if (c == 34 or c == 39) and buf[k + 1] == c and buf[k + 2] == c:
+                        block_comments += 1
+                        break
+        start = end + 1
+    
+    return tabs, indent_sizes[:count], inline_comments, block_comments
+
+
+@lru_cache(maxsize=None)
+def _ascii_line_scanner() -> Optional[Callable]:
+    """Return _scan_ascii_bytes compiled with Numba, or None if Numba isn't installed.
+    
+    Numba is optional and slow to import, so it is loaded on the first scan.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(cache=True)(_scan_ascii_bytes)
+
+
+def _text_style(content: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return (analyze_indentation, analyze_comments) results from one pass over the lines."""
+    scan = _ascii_line_scanner() if content.isascii() else None
+    if scan is not None:
+        import numpy as np
+        
+        # Byte offsets equal character offsets only for ASCII text
+        line_count = content.count("\n") + 1
+        tabs, sizes, inline_comments, block_comments = scan(
+            np.frombuffer(content.encode("ascii"), dtype=np.uint8), np.empty(line_count, np.int64)
+        )
+        indent_sizes = sizes.tolist()
+    else:
+        line_count, tabs, indent_sizes, inline_comments, block_comments = _scan_lines(content)
     
-    if indent_sizes:
-        most_common = max(set(indent_sizes), key=indent_sizes.count)
+    # Check for docstring style
+    if '"""' in content:
+        docstring_style = "triple_double"
+    elif "'''" in content:
+        docstring_style = "triple_single"
     else:
-        most_common = 4
+        docstring_style = None
     
-    return {
+    spaces = len(indent_sizes)
+    indent_info = {
         "uses_tabs": tabs > spaces,
-        "indent_size": most_common,
+        "indent_size": Counter(indent_sizes).most_common(1)[0][0] if indent_sizes else 4,
         "spaces_count": spaces,
         "tabs_count": tabs,
     }
+    comment_info = {
+        "inline_comments": inline_comments,
+        "block_comments": block_comments,
+        "docstring_style": docstring_style,
+        "comment_frequency": inline_comments / line_count,
+    }
+    return indent_info, comment_info
+
+
+def analyze_indentation(content: str) -> Dict[str, Any]:
+    """Analyze indentation style."""
+    return _text_style(content)[0]
 
 
 def analyze_naming_conventions(ast_tree: ast.AST) -> Dict[str, Any]:
     """Analyze naming conventions."""
-    conventions = {
-        "functions": [],
-        "classes": [],
-        "variables": [],
-        "constants": [],
-    }
+    # Only definition names are reported, and definitions are statements
+    function_names = []
+    class_names = []
     
-    for node in ast.walk(ast_tree):
-        if isinstance(node, ast.FunctionDef):
-            conventions["functions"].append(node.name)
-        elif isinstance(node, ast.ClassDef):
-            conventions["classes"].append(node.name)
-        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
-            # Check if it's a constant (uppercase name)
-            if node.id.isupper():
-                conventions["constants"].append(node.id)
-            else:
-                conventions["variables"].append(node.id)
+    for node in walk_statements(ast_tree):
+        node_type = node.__class__
+        if node_type is ast.FunctionDef:
+            function_names.append(node.name)
+        elif node_type is ast.ClassDef:
+            class_names.append(node.name)
     
     # Analyze patterns
-    function_pattern = _detect_pattern(conventions["functions"])
-    class_pattern = _detect_pattern(conventions["classes"])
+    function_pattern = _detect_pattern(function_names)
+    class_pattern = _detect_pattern(class_names)
     
     return {
         "function_naming": function_pattern,
         "class_naming": class_pattern,
-        "sample_functions": conventions["functions"][:10],
-        "sample_classes": conventions["classes"][:10],
+        "sample_functions": function_names[:10],
+        "sample_classes": class_names[:10],
     }
 
 
@@ -177,29 +547,72 @@ def _detect_pattern(names: List[str]) -> str:
 
 def analyze_comments(content: str) -> Dict[str, Any]:
     """Analyze comment style."""
-    lines = content.split("\n")
-    inline_comments = 0
-    block_comments = 0
-    docstring_style = None
+    return _text_style(content)[1]
+
+
+def analyze_style(content: str, tree: ast.AST) -> Tuple[Dict[str, Any], ...]:
+    """Run every per-file style analysis in one pass over the text and one walk of the tree.
     
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith("#"):
-            if "#" in line.split('"')[0] if '"' in line else True:
-                inline_comments += 1
-        elif '"""' in line or "'''" in line:
-            block_comments += 1
+    Returns the results of analyze_indentation, analyze_naming_conventions,
+    analyze_comments, extract_imports and extract_functions_and_classes, in
+    that order; they are identical to calling each of those separately.
+    """
+    # Indentation and comments: one pass over the lines
+    indent_info, comment_info = _text_style(content)
     
-    # Check for docstring style
-    if '"""' in content:
-        docstring_style = 'triple_double'
-    elif "'''" in content:
-        docstring_style = 'triple_single'
+    # Naming, imports and structure: one walk over the statements
+    function_names = []
+    class_names = []
+    imports = {"standard": [], "third_party": [], "local": []}
+    functions = []
+    classes = []
     
-    return {
-        "inline_comments": inline_comments,
-        "block_comments": block_comments,
-        "docstring_style": docstring_style,
-        "comment_frequency": inline_comments / len(lines) if lines else 0,
+    for node in walk_statements(tree):
+        node_type = node.__class__
+        if node_type is ast.FunctionDef:
+            function_names.append(node.name)
+            functions.append({
+                "name": node.name,
+                "args": [arg.arg for arg in node.args.args],
+                "decorators": [_expr_text(d) for d in node.decorator_list],
+                "docstring": ast.get_docstring(node),
+            })
+        elif node_type is ast.ClassDef:
+            class_names.append(node.name)
+            classes.append({
+                "name": node.name,
+                "bases": [_expr_text(b) for b in node.bases],
+                "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
+                "docstring": ast.get_docstring(node),
+            })
+        elif node_type is ast.Import:
+            for alias in node.names:
+                if alias.name.split(".")[0] in _STANDARD_LIBS:
+                    imports["standard"].append(alias.name)
+                else:
+                    imports["third_party"].append(alias.name)
+        elif node_type is ast.ImportFrom:
+            if node.module:
+                if node.module.split(".")[0] in _STANDARD_LIBS:
+                    imports["standard"].append(node.module)
+                elif not node.module.startswith("."):
+                    imports["third_party"].append(node.module)
+                else:
+                    imports["local"].append(node.module)
+    
+    naming_info = {
+        "function_naming": _detect_pattern(function_names),
+        "class_naming": _detect_pattern(class_names),
+        "sample_functions": function_names[:10],
+        "sample_classes": class_names[:10],
     }
+    structure = {"functions": functions, "classes": classes}
+    return indent_info, naming_info, comment_info, imports, structure
+
 
+def strip_code_fence(text: str) -> str:
+    """Return the body of the first markdown code block, or the text unchanged."""
+    match = _CODE_FENCE_RE.search(text)
+    if match is None:
+        return text
+    return match.group(1).strip()
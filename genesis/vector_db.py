@@ -1,15 +1,122 @@
 """Vector database integration for architectural mapping."""
 
-import ast
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
-from genesis.utils import is_python_file, should_ignore_file, extract_functions_and_classes
+from genesis.utils import (
+    iter_python_files,
+    parse_file_structure,
+    parallel_map,
+)
 from genesis.config import Config
+from genesis.embedding_cache import EmbeddingCache
+
+# Optional: FAISS searches an in-memory copy of the collection with an exact
+# SIMD inner-product scan instead of a Chroma query per batch
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+def _load_embedding_model(
+    model_name: str, backend: str, quantization: Optional[str], export_dir: Path
+) -> SentenceTransformer:
+    """Load the embedding model on the torch, onnx or openvino backend.
+    
+    With the onnx backend and a quantization config (e.g. "avx512_vnni"),
+    the model is exported with int8 dynamic quantization into export_dir
+    the first time and loaded from there afterwards.
+    """
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    if backend != "onnx" or not quantization:
+        return SentenceTransformer(model_name, backend=backend)
+    
+    file_name = f"onnx/model_qint8_{quantization}.onnx"
+    if not (export_dir / file_name).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        
+        print(f"Exporting {model_name} to int8 ONNX ({quantization})...")
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save_pretrained(str(export_dir))
+        export_dynamic_quantized_onnx_model(model, quantization, str(export_dir))
+    return SentenceTransformer(str(export_dir), backend="onnx", model_kwargs={"file_name": file_name})
+
+
+def _apply_precision(model: SentenceTransformer, precision: str) -> SentenceTransformer:
+    """Cast a model on a CUDA device to fp16 or bf16 weights; otherwise leave it in fp32.
+    
+    bf16 falls back to fp16 on GPUs without bf16 support. Embeddings are
+    upcast to fp32 after pooling, so stored vectors stay fp32 either way.
+    """
+    if precision not in ("fp16", "bf16") or model.device.type != "cuda":
+        return model
+    
+    import torch
+    
+    if precision == "bf16" and torch.cuda.is_bf16_supported():
+        return model.to(dtype=torch.bfloat16)
+    return model.half()
+
+
+@lru_cache(maxsize=None)
+def _shared_embedding_model(
+    model_name: str, backend: str, quantization: Optional[str], precision: str, export_dir: Path
+) -> SentenceTransformer:
+    """Load an embedding model once per process for each distinct set of settings."""
+    print(f"Loading embedding model: {model_name}")
+    model = _load_embedding_model(model_name, backend, quantization, export_dir)
+    if backend == "torch":
+        model = _apply_precision(model, precision)
+    return model
+
+
+def _encode_documents(
+    model: SentenceTransformer, texts: List[str], batch_size: int, show_progress_bar: bool = False
+) -> np.ndarray:
+    """Embed texts like model.encode(), but tokenize them all in one fast-tokenizer call.
+    
+    As in encode(), batches are taken longest first and padded per batch,
+    and rows come back in input order. Models without a fast (Rust)
+    tokenizer go through encode() itself.
+    """
+    tokenizer = getattr(model, "tokenizer", None)
+    if not getattr(tokenizer, "is_fast", False):
+        return model.encode(
+            texts, batch_size=batch_size, show_progress_bar=show_progress_bar, convert_to_numpy=True
+        )
+    
+    import torch
+    
+    # Same preprocessing as the Transformer module's own tokenize()
+    texts = [text.strip() for text in texts]
+    if getattr(model[0], "do_lower_case", False):
+        texts = [text.lower() for text in texts]
+    features = tokenizer(texts, truncation="longest_first", max_length=model.max_seq_length)
+    order = sorted(range(len(texts)), key=lambda i: -len(features["input_ids"][i]))
+    
+    embeddings = None
+    with torch.inference_mode():
+        for start in tqdm(range(0, len(order), batch_size), desc="Batches", disable=not show_progress_bar):
+            index = order[start:start + batch_size]
+            batch = tokenizer.pad(
+                {key: [values[i] for i in index] for key, values in features.items()},
+                return_tensors="pt",
+            )
+            batch = {key: value.to(model.device) for key, value in batch.items()}
+            output = model(batch)["sentence_embedding"].float().cpu().numpy()
+            if embeddings is None:
+                embeddings = np.empty((len(texts), output.shape[1]), dtype=np.float32)
+            embeddings[index] = output
+    return embeddings
 
 
 class VectorDatabase:
@@ -22,9 +129,25 @@ class VectorDatabase:
         self.collection_name = config.get("vector_db.collection_name", "codebase_embeddings")
         self.embedding_model_name = config.get("vector_db.embedding_model", "sentence-transformers/all-MiniLM-L6-v2")
         
-        # Initialize embedding model
-        print(f"Loading embedding model: {self.embedding_model_name}")
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
+        # Initialize embedding model (shared by instances with the same settings)
+        backend = config.get("vector_db.backend", "torch")
+        self.embedding_model = _shared_embedding_model(
+            self.embedding_model_name,
+            backend,
+            config.get("vector_db.onnx_quantization"),
+            config.get("vector_db.precision", "fp32"),
+            self.persist_dir / "models" / self.embedding_model_name.replace("/", "__"),
+        )
+        cache_model_name = self.embedding_model_name
+        if backend != "torch":
+            # Other runtimes (and int8 weights) give slightly different vectors
+            cache_model_name += f"@{backend}:{config.get('vector_db.onnx_quantization') or 'fp32'}"
+        self.embedding_cache = EmbeddingCache(self.persist_dir / "query_embeddings.sqlite3", cache_model_name)
+        # Chunk embeddings by content, so re-indexing only embeds changed chunks
+        self.document_cache = EmbeddingCache(self.persist_dir / "document_embeddings.sqlite3", cache_model_name)
+        
+        # (collection count, FAISS index, documents, metadatas); see _faiss_snapshot()
+        self._faiss_snapshot_cache = None
         
         # Initialize ChromaDB
         self.client = chromadb.PersistentClient(
@@ -39,14 +162,24 @@ class VectorDatabase:
         except Exception:
             self.collection = self.client.create_collection(
                 name=self.collection_name,
-                metadata={"description": "Codebase embeddings for Code Genesis"}
+                metadata=self._collection_metadata()
             )
             print(f"Created new collection: {self.collection_name}")
 
+    def _collection_metadata(self) -> Dict[str, Any]:
+        """Return metadata (including HNSW index parameters) for a new collection."""
+        return {
+            "description": "Codebase embeddings for Code Genesis",
+            "hnsw:space": "cosine",
+            "hnsw:M": self.config.get("vector_db.hnsw_m", 24),
+            "hnsw:construction_ef": self.config.get("vector_db.hnsw_construction_ef", 128),
+            "hnsw:search_ef": self.config.get("vector_db.hnsw_search_ef", 100),
+        }
+
     def index_repository(self, repo_path: Path) -> None:
         """Index entire repository in vector database."""
         repo_path = Path(repo_path).resolve()
-        ignore_patterns = self.config.get("repository.ignore_patterns", [])
+        ignore_patterns = self.config.get_ignore_spec()
         
         python_files = self._collect_python_files(repo_path, ignore_patterns)
         
@@ -57,27 +190,30 @@ class VectorDatabase:
         print(f"Indexing {len(python_files)} Python files...")
         
         documents = []
+        embed_texts = []
         metadatas = []
         ids = []
         
-        for file_path in tqdm(python_files, desc="Indexing files"):
+        # Files are read and parsed in worker processes (the parser lives in
+        # genesis.utils, so workers don't import the embedding stack); chunks
+        # are built here
+        results = parallel_map(parse_file_structure, python_files)
+        for file_path, (content, structure, error) in tqdm(
+            zip(python_files, results), total=len(python_files), desc="Indexing files"
+        ):
+            if error is not None:
+                print(f"Warning: Could not index {file_path}: {error}")
+                continue
+            if structure is None:
+                continue
+            
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                try:
-                    tree = ast.parse(content)
-                except SyntaxError:
-                    continue
-                
-                # Extract code structure
-                structure = extract_functions_and_classes(tree)
-                
                 # Create document chunks
                 chunks = self._create_chunks(file_path, content, structure, repo_path)
                 
                 for chunk in chunks:
                     documents.append(chunk["text"])
+                    embed_texts.append(chunk.get("embed_text", chunk["text"]))
                     metadatas.append(chunk["metadata"])
                     ids.append(chunk["id"])
                 
@@ -86,30 +222,46 @@ class VectorDatabase:
                 continue
         
         if documents:
-            # Generate embeddings
-            print("Generating embeddings...")
-            embeddings = self.embedding_model.encode(documents, show_progress_bar=True)
+            # Embed one add batch at a time and write it from a background
+            # thread, so each Chroma write overlaps the next batch's encode;
+            # only two batches of embeddings are held at once. Chroma takes
+            # the float32 arrays directly, with no list-of-floats copy
+            print("Generating embeddings and adding to vector database...")
+            encode_batch_size = max(1, int(self.config.get("vector_db.encode_batch_size", 64)))
+            batch_size = max(1, int(self.config.get("vector_db.add_batch_size", 256)))
             
-            # Add to collection
-            print("Adding to vector database...")
-            self.collection.add(
-                embeddings=embeddings.tolist(),
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids,
-            )
+            def encode_missing(texts: List[str]) -> np.ndarray:
+                return _encode_documents(self.embedding_model, texts, encode_batch_size)
+            
+            pending: Optional[Future] = None
+            try:
+                with ThreadPoolExecutor(max_workers=1) as writer:
+                    for start in tqdm(range(0, len(documents), batch_size), desc="Embedding chunks"):
+                        end = start + batch_size
+                        embeddings = np.stack(self.document_cache.encode(
+                            self.embedding_model, embed_texts[start:end], encode_missing
+                        ))
+                        if pending is not None:
+                            pending.result()
+                        pending = writer.submit(
+                            self.collection.add,
+                            embeddings=embeddings,
+                            documents=documents[start:end],
+                            metadatas=metadatas[start:end],
+                            ids=ids[start:end],
+                        )
+                    if pending is not None:
+                        pending.result()
+            finally:
+                # Any write makes the FAISS copy stale, even one that keeps the count
+                self._faiss_snapshot_cache = None
             
             print(f"Successfully indexed {len(documents)} code chunks.")
 
     def _collect_python_files(self, repo_path: Path, ignore_patterns: List[str]) -> List[Path]:
         """Collect all Python files in repository."""
-        python_files = []
-        
-        for file_path in repo_path.rglob("*.py"):
-            if not should_ignore_file(file_path, ignore_patterns):
-                python_files.append(file_path)
-        
-        return python_files
+        # One os.scandir walk that prunes ignored directories
+        return list(iter_python_files(repo_path, ignore_patterns))
 
     def _create_chunks(
         self, file_path: Path, content: str, structure: Dict[str, List[Dict[str, Any]]], repo_path: Path
@@ -118,10 +270,15 @@ class VectorDatabase:
         chunks = []
         rel_path = file_path.relative_to(repo_path)
         
-        # Full file chunk
+        # Full file chunk; the whole file is stored, but only its head is
+        # embedded, since the model truncates long inputs anyway and
+        # tokenizing the rest is wasted work
+        text = f"File: {rel_path}\n\n{content}"
+        max_chars = max(1, int(self.config.get("vector_db.max_embed_chars", 2000)))
         chunks.append({
             "id": f"{rel_path}::full",
-            "text": f"File: {rel_path}\n\n{content}",
+            "text": text,
+            "embed_text": text[:max_chars],
             "metadata": {
                 "file_path": str(rel_path),
                 "type": "full_file",
@@ -168,26 +325,108 @@ class VectorDatabase:
 
     def search(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """Search for relevant code in vector database."""
-        # Generate query embedding
-        query_embedding = self.embedding_model.encode([query])[0]
+        return self.search_batch([query], n_results)[0]
+
+    def search_batch(self, queries: List[str], n_results: int = 5) -> List[List[Dict[str, Any]]]:
+        """Search for several queries at once, embedding uncached queries in one pass."""
+        if not queries:
+            return []
         
-        # Search
-        results = self.collection.query(
-            query_embeddings=[query_embedding.tolist()],
-            n_results=n_results,
-        )
+        # Generate query embeddings
+        query_embeddings = self.embedding_cache.encode(self.embedding_model, list(queries))
+        
+        if self._use_faiss():
+            return self._search_faiss(query_embeddings, n_results)
+        
+        # Search, a bounded number of queries per request
+        batch_size = max(1, int(self.config.get("vector_db.query_batch_size", 100)))
+        batch_results = []
+        for start in range(0, len(queries), batch_size):
+            results = self.collection.query(
+                query_embeddings=np.stack(query_embeddings[start:start + batch_size]),
+                n_results=n_results,
+            )
+            
+            # Format results
+            for q in range(min(batch_size, len(queries) - start)):
+                formatted_results = []
+                if results["documents"] and results["documents"][q]:
+                    for i in range(len(results["documents"][q])):
+                        formatted_results.append({
+                            "document": results["documents"][q][i],
+                            "metadata": results["metadatas"][q][i] if results["metadatas"] else {},
+                            "distance": results["distances"][q][i] if results["distances"] else None,
+                        })
+                batch_results.append(formatted_results)
+        
+        return batch_results
+
+    def _use_faiss(self) -> bool:
+        """Return True if searches should go through an in-memory FAISS index.
+        
+        FAISS is opt-in (``vector_db.search_backend: faiss``); without the
+        package installed, searches stay on Chroma.
+        """
+        backend = self.config.get("vector_db.search_backend", "chroma")
+        return faiss is not None and backend == "faiss"
+
+    def _faiss_snapshot(self):
+        """Return (count, index, documents, metadatas) for the collection, or None if empty.
+        
+        The index is rebuilt after this database writes to the collection, and
+        whenever the collection's size changes (e.g. written by another process).
+        """
+        count = self.collection.count()
+        if self._faiss_snapshot_cache is not None and self._faiss_snapshot_cache[0] == count:
+            return self._faiss_snapshot_cache
+        if count == 0:
+            return None
+        
+        data = self.collection.get(include=["embeddings", "documents", "metadatas"])
+        vectors = np.ascontiguousarray(np.asarray(data["embeddings"], dtype=np.float32))
+        # Use the collection's own metric, so distances match Chroma's
+        space = self._distance_space()
+        if space == "l2":
+            index = faiss.IndexFlatL2(vectors.shape[1])
+        else:
+            if space == "cosine":
+                # Inner products of unit vectors are cosine similarities
+                faiss.normalize_L2(vectors)
+            index = faiss.IndexFlatIP(vectors.shape[1])
+        index.add(vectors)
+        self._faiss_snapshot_cache = (count, index, data["documents"], data["metadatas"])
+        return self._faiss_snapshot_cache
+
+    def _distance_space(self) -> str:
+        """Return the collection's distance metric: "l2" (Chroma's default), "cosine" or "ip"."""
+        return (self.collection.metadata or {}).get("hnsw:space", "l2")
+
+    def _search_faiss(self, query_embeddings: List[np.ndarray], n_results: int) -> List[List[Dict[str, Any]]]:
+        """Search the FAISS copy of the collection, formatting results like Chroma's."""
+        snapshot = self._faiss_snapshot()
+        if snapshot is None:
+            return [[] for _ in query_embeddings]
+        _, index, documents, metadatas = snapshot
         
-        # Format results
-        formatted_results = []
-        if results["documents"] and results["documents"][0]:
-            for i in range(len(results["documents"][0])):
-                formatted_results.append({
-                    "document": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                    "distance": results["distances"][0][i] if results["distances"] else None,
-                })
+        space = self._distance_space()
+        queries = np.ascontiguousarray(np.stack(query_embeddings).astype(np.float32))
+        if space == "cosine":
+            faiss.normalize_L2(queries)
+        scores, indices = index.search(queries, min(n_results, index.ntotal))
         
-        return formatted_results
+        batch_results = []
+        for row_scores, row_indices in zip(scores, indices):
+            batch_results.append([
+                {
+                    "document": documents[i],
+                    "metadata": metadatas[i] if metadatas else {},
+                    # Chroma reports squared L2 as is, and 1 - similarity for cosine and ip
+                    "distance": float(score) if space == "l2" else 1.0 - float(score),
+                }
+                for score, i in zip(row_scores, row_indices)
+                if i >= 0
+            ])
+        return batch_results
 
     def clear(self) -> None:
         """Clear the vector database."""
@@ -195,8 +434,9 @@ class VectorDatabase:
             self.client.delete_collection(name=self.collection_name)
             self.collection = self.client.create_collection(
                 name=self.collection_name,
-                metadata={"description": "Codebase embeddings for Code Genesis"}
+                metadata=self._collection_metadata()
             )
+            self._faiss_snapshot_cache = None
             print(f"Cleared collection: {self.collection_name}")
         except Exception as e:
             print(f"Error clearing collection: {e}")
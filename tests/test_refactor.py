@@ -0,0 +1,68 @@
+"""Tests for extracting a block into a function without the LLM."""
+
+from genesis.refactor import _extract_locally
+
+
+def _run(source: str, start_line: int, end_line: int, call: str):
+    """Extract lines start_line..end_line into helper(), then evaluate call against the result."""
+    result = _extract_locally(source, start_line, end_line, "helper")
+    assert result is not None
+    namespace = {}
+    exec(result["extracted_function"] + result["refactored_file"], namespace)
+    return eval(call, namespace)
+
+
+def test_conditional_binding_keeps_prior_value():
+    source = (
+        "def h(flag):\n"
+        "    v = 1\n"
+        "    if flag:\n"
+        "        v = 2\n"
+        "    return v\n"
+    )
+    assert _run(source, 3, 4, "h(False)") == 1
+    assert _run(source, 3, 4, "h(True)") == 2
+
+
+def test_conditional_binding_without_prior_value_falls_back():
+    source = (
+        "def h(flag):\n"
+        "    if flag:\n"
+        "        v = 2\n"
+        "    return v\n"
+    )
+    assert _extract_locally(source, 2, 3, "helper") is None
+
+
+def test_loop_carried_binding_is_returned():
+    source = (
+        "def h(xs):\n"
+        "    prev = None\n"
+        "    pairs = []\n"
+        "    for x in xs:\n"
+        "        pairs.append((prev, x))\n"
+        "        prev = x\n"
+        "    return pairs\n"
+    )
+    assert _run(source, 6, 6, "h([1, 2, 3])") == [(None, 1), (1, 2), (2, 3)]
+
+
+def test_loop_carried_update_is_passed_and_returned():
+    source = (
+        "def h(xs):\n"
+        "    total = 0\n"
+        "    for x in xs:\n"
+        "        total += x\n"
+        "    return total\n"
+    )
+    assert _run(source, 4, 4, "h([1, 2, 3])") == 6
+
+
+def test_block_that_returns_falls_back():
+    source = (
+        "def h(flag):\n"
+        "    if flag:\n"
+        "        return 1\n"
+        "    return 0\n"
+    )
+    assert _extract_locally(source, 2, 3, "helper") is None